@@ -1,42 +1,387 @@
 #controls.py
 
 import time
+import array
 import threading
 import struct
 import socket
 import queue
+import select
 import presets
 import logging
 import os
+import re
+import random
+import itertools
+import functools
+import heapq
+import bisect
+from collections import namedtuple, deque
+
+try:
+    # numba is optioneel: als het geïnstalleerd is wordt de virtual wall rekenkern gecompileerd
+    from numba import njit
+except ImportError:
+    njit = None
 
 REPEAT_INTERVAL = 0.2  # Interval voor herhaling van commando's
 IDLE_DELAY = 0.1       # Delay voor het opnieuw versturen van idle-pakketjes
 BUFFER_SIZE = 1024
-
-movement_state = {
-    'pan':  {'active': False, 'direction': None, 'percentage': 0, 'timer': None, 'idle_timer': None},
-    'tilt': {'active': False, 'direction': None, 'percentage': 0, 'timer': None, 'idle_timer': None},
-    'roll': {'active': False, 'direction': None, 'percentage': 0, 'timer': None, 'idle_timer': None},
-    'zoom': {'active': False, 'direction': None, 'percentage': 0, 'timer': None, 'idle_timer': None}
+PACKET_QUEUE_SIZE = 64        # Max. aantal onverwerkte UDP-pakketten; oudste wordt weggegooid
+RECV_BUFFER_SIZE = 1 << 20    # SO_RCVBUF voor de UDP listener (1 MiB)
+RECV_BATCH_SIZE = 64          # Max. aantal datagrammen dat de listener per wake-up leest
+UNKNOWN_SENDER_RETRY = 60.0   # Seconden dat FDB van een onbekende afzender genegeerd wordt
+SEND_BUFFER_SIZE = 1 << 20    # SO_SNDBUF voor de verzendsocket in main (1 MiB)
+
+_SPEED_STRUCT = struct.Struct('<h')  # 16-bit little-endian signed speed-veld
+_USPEED_STRUCT = struct.Struct('<H') # 16-bit little-endian unsigned speed-veld (zoom 'in')
+_SPEED_TO_DEG = 90.0 / 2024.0        # Benadering: graden beweging per eenheid speed-waarde
+ZOOM_PERCENT_SCALE = 100.0 / 4094.0  # Absolute zoomwaarde (1-4095) -> percentage (0-100)
+
+# (base_min, span) per (as, richting == 'positive'), met span = base_max - base_min.
+# Tilt is omgekeerd ten opzichte van pan en roll.
+_SPEED_RANGES = {
+    ('pan', True): (20, 2004), ('pan', False): (-20, -2004),
+    ('tilt', True): (-20, -2004), ('tilt', False): (20, 2004),
+    ('roll', True): (20, 2004), ('roll', False): (-20, -2004),
 }
 
-# Globale variabelen voor huidige positie per camid
-current_position = {}
-last_fdb_timestamp = {}
-position_lock = threading.Lock()
+def _speed_value(as_name, direction, percentage):
+    """Zet een snelheidspercentage (1-100) om naar de 16-bit speed-waarde voor pan/tilt/roll."""
+    base_min, span = _SPEED_RANGES[(as_name, direction == 'positive')]
+    return int(base_min + (percentage - 1) * span / 99)
+
+# Vaste commandopakketten waarin alleen byte 1 (camid) varieert
+_ACTIVE_TRACK_TEMPLATE = bytes.fromhex("08000400000e0b0000")
+_RECENTER_TEMPLATE = bytes.fromhex("08000400000e0c0000")
+_POSITION_REQUEST_TEMPLATE = bytes.fromhex("08000400000e140000")
+_MOTOR_CALIB_TEMPLATE = bytes.fromhex("09000400000e0f000000")
+_GIMBAL_CALIB_TEMPLATE = bytes.fromhex("09000400000e0e000000")
+_ZOOM_PREFIX_TEMPLATE = bytes.fromhex("0A0006000000098000")  # gevolgd door 2 speed-bytes
+
+def _camid_packet(template, camid):
+    """Geeft een kopie van template terug met camid ingevuld op byte 1."""
+    buf = bytearray(template)
+    buf[1] = camid
+    return bytes(buf)
+
+_zoom_prefix_cache = {}  # camid -> zoom-prefix (bytes), zonder de 2 speed-bytes
+
+def _zoom_prefix(camid):
+    """Geeft de (gecachte) zoom-prefix voor camid terug."""
+    prefix = _zoom_prefix_cache.get(camid)
+    if prefix is None:
+        prefix = _zoom_prefix_cache[camid] = _camid_packet(_ZOOM_PREFIX_TEMPLATE, camid)
+    return prefix
+
+# FDB bericht: "FDB;<camid>;<pan>;<tilt>;<roll>;<zoom>;" - eenmalig gecompileerd en
+# direct op de ruwe bytes van de socket toegepast (geen decode/strip/split nodig).
+# Dit is alleen het snelle pad voor het gangbare formaat (gehele of decimale getallen);
+# al het andere gaat via _parse_fdb_split, die dezelfde grammatica als float() accepteert.
+_FDB_NUM = rb'(-?\d+(?:\.\d+)?)'
+_FDB_RE = re.compile(rb'\s*FDB;(-?\d+);' + _FDB_NUM + b';' + _FDB_NUM + b';' + _FDB_NUM + b';' + _FDB_NUM + rb'(?:;|\s*\Z)')
+
+@functools.lru_cache(maxsize=128)
+def _parse_fdb_bytes(msg):
+    """
+    Parse een FDB-bericht (bytes) naar een tuple (camid, pan, tilt, roll, zoom), of None.
+    Gecachet op de ruwe bytes: een stilstaande camera stuurt steeds hetzelfde bericht.
+    """
+    m = _FDB_RE.match(msg)
+    if m is None:
+        return _parse_fdb_split(msg)
+    cam, pan, tilt, roll, zoom = m.groups()
+    return int(cam), float(pan), float(tilt), float(roll), float(zoom)
+
+def _parse_fdb_split(msg):
+    """
+    Parse een FDB-bericht zoals voorheen met split(';') en float(): elke waarde die
+    float() accepteert (+2, 1e-05, nan, 12., .5, spaties rond een veld) is geldig.
+    Een niet-numeriek camid-veld geeft camid None; de posities blijven dan bruikbaar
+    voor een afzender waarvan het IP al bekend is.
+    """
+    parts = msg.strip().split(b';')
+    if len(parts) < 6 or parts[0] != b"FDB":
+        return None
+    try:
+        pan, tilt, roll, zoom = float(parts[2]), float(parts[3]), float(parts[4]), float(parts[5])
+    except ValueError:
+        return None
+    try:
+        cam = int(parts[1])
+    except ValueError:
+        cam = None
+    return cam, pan, tilt, roll, zoom
+
+def parse_fdb_values(msg):
+    """
+    Parse een FDB-bericht (str of bytes) naar (camid, pan, tilt, roll, zoom), of None.
+    Zoals _parse_fdb_bytes, maar accepteert ook een str (bv. van get_current_position).
+    """
+    if isinstance(msg, str):
+        msg = msg.encode('ascii', errors='ignore')
+    return _parse_fdb_bytes(msg)
+
+# 'generation' / 'idle_generation' worden opgehoogd om geplande herhaal- en idle-ticks
+# ongeldig te maken (in plaats van een threading.Timer te cancelen).
+class MoveState:
+    """Bewegingstoestand van één as (pan/tilt/roll/zoom)."""
+    __slots__ = ('active', 'direction', 'percentage', 'control_type', 'original_percentage',
+                 'generation', 'idle_generation')
+
+    def __init__(self):
+        self.active = False
+        self.direction = None
+        self.percentage = 0
+        self.control_type = None
+        self.original_percentage = None
+        self.generation = 0       # Ophogen maakt geplande herhalingen ongeldig
+        self.idle_generation = 0  # Ophogen maakt geplande idle-ticks ongeldig
+
+movement_state = {as_name: MoveState() for as_name in ('pan', 'tilt', 'roll', 'zoom')}
+
+# Eén langlevende scheduler-thread voor alle herhaal- en idle-ticks, zodat er niet
+# elke REPEAT_INTERVAL per actieve as een nieuwe Timer-thread wordt gestart.
+_tick_heap = []                    # heap van (deadline, volgnummer, fn, args)
+_tick_seq = itertools.count()      # Volgorde bij gelijke deadlines; functies zijn niet vergelijkbaar
+_tick_cond = threading.Condition() # Beschermt _tick_heap; wekt de scheduler bij een nieuwe eerste tick
+_ticker_thread = None
+_ticker_lock = threading.Lock()
+
+def schedule_tick(delay, fn, *args):
+    """
+    Plant fn(*args) over 'delay' seconden in op de scheduler-thread.
+    Er is geen cancel: een tick annuleren gaat door de generation-teller van de
+    betreffende as op te hogen, waarna fn de verouderde tick zelf negeert (O(1),
+    geen zoeken of herordenen in de heap).
+    """
+    global _ticker_thread
+    if _ticker_thread is None:
+        with _ticker_lock:
+            if _ticker_thread is None:
+                _ticker_thread = threading.Thread(target=_ticker_loop, name="controls-ticker", daemon=True)
+                _ticker_thread.start()
+    item = (time.monotonic() + delay, next(_tick_seq), fn, args)
+    with _tick_cond:
+        heapq.heappush(_tick_heap, item)
+        # Alleen wekken als de nieuwe tick de eerstvolgende is. Een tick die vanuit de
+        # scheduler zelf wordt ingepland (bv. repeat_command dat zichzelf herplant) wordt
+        # in de volgende ronde van de lus al gezien; wakker maken is dan overbodig.
+        if _tick_heap[0] is item and threading.current_thread() is not _ticker_thread:
+            _tick_cond.notify()
+
+def _ticker_loop():
+    """
+    Hoofdlus van de scheduler-thread: voert ingeplande ticks uit zodra hun deadline verstreken is.
+    """
+    while True:
+        with _tick_cond:
+            while True:
+                if not _tick_heap:
+                    _tick_cond.wait()
+                    continue
+                wait = _tick_heap[0][0] - time.monotonic()
+                if wait <= 0:
+                    break
+                # Nog niet aan de beurt: wachten tot de deadline of tot er een eerdere tick bijkomt
+                _tick_cond.wait(wait)
+            _, _, fn, args = heapq.heappop(_tick_heap)
+        try:
+            fn(*args)
+        except Exception as e:
+            logging.error(f"Error in scheduled tick {getattr(fn, '__name__', fn)}: {e}")
+
+# Verzenden naar de APC-R gebeurt op een aparte I/O-thread, zodat input- en scheduler-threads
+# niet blokkeren op socket-latency. De volgorde van pakketten blijft behouden (FIFO).
+_tx_queue = queue.SimpleQueue()
+_tx_thread = None
+_tx_lock = threading.Lock()
+
+def queue_apcr_command(send_apcr_command, apcr, data, as_name=None):
+    """
+    Zet een pakket in de verzendwachtrij; send_apcr_command(apcr, data) wordt op de I/O-thread uitgevoerd.
+    Met as_name wordt het pakket als bewegings-/idle-pakket voor die as gemarkeerd: loopt de
+    I/O-thread achter, dan wordt per APC-R en as alleen het nieuwste pakket verstuurd.
+    """
+    global _tx_thread
+    if _tx_thread is None:
+        with _tx_lock:
+            if _tx_thread is None:
+                _tx_thread = threading.Thread(target=_tx_loop, name="controls-tx", daemon=True)
+                _tx_thread.start()
+    _tx_queue.put((send_apcr_command, apcr, data, as_name))
+
+def _tx_loop():
+    """
+    Hoofdlus van de I/O-thread. Alles wat op het moment van ophalen in de wachtrij staat
+    wordt als één batch verwerkt:
+      - van pakketten met een as_name wordt per (APC-R, as) alleen het laatste verstuurd;
+      - van identieke pakketten zonder as_name die direct achter elkaar staan alleen de laatste.
+    De volgorde van de overgebleven pakketten blijft behouden.
+    """
+    while True:
+        batch = [_tx_queue.get()]
+        try:
+            while True:
+                batch.append(_tx_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        if len(batch) > 1:
+            # Index van het laatste pakket per (APC-R, as)
+            latest = {}
+            for i, (_, apcr, _, as_name) in enumerate(batch):
+                if as_name is not None:
+                    latest[(id(apcr), as_name)] = i
+
+        for i, item in enumerate(batch):
+            send_fn, apcr, data, as_name = item
+            if i + 1 < len(batch):
+                if as_name is not None:
+                    if latest[(id(apcr), as_name)] != i:
+                        continue
+                else:
+                    next_item = batch[i + 1]
+                    if next_item[0] is send_fn and next_item[1] is apcr and next_item[2] == data:
+                        continue
+            try:
+                send_fn(apcr, data)
+            except Exception as e:
+                logging.error("Error sending APC-R command: %s", e)
+
+# Globale variabelen voor huidige positie per camid.
+# camid is één byte in de APC-R pakketten, dus een lijst met vaste lengte geïndexeerd op
+# camid volstaat. Schrijvers vervangen alleen het element voor hun camid (atomair onder de
+# GIL) en de positie-dict zelf wordt nooit gemuteerd, dus lezers hebben geen lock nodig.
+# Bewust geen losse doubles per as (array/ctypes): dan kan een lezer pan van het nieuwe
+# en tilt van het vorige pakket zien. Eén referentie per camid is altijd consistent.
+MAX_CAMS = 256
+current_position = [None] * MAX_CAMS
+# Ontvangsttijd (time.monotonic) van de laatste positie per camid; 0.0 = nog niets ontvangen.
+# De listener leest de klok één keer per ontvangst-burst en geeft die tijd mee in de packet_queue.
+last_fdb_timestamp = array.array('d', [0.0] * MAX_CAMS)
+_WALL_CLOCK_OFFSET = time.time() - time.monotonic()
+# wait_for_current_position wacht hierop; alleen genotificeerd als er iemand wacht
+_position_cond = threading.Condition()
+_position_waiters = 0
+
+def _publish_position(camid, position, rx_time=None):
+    """
+    Publiceer een nieuwe positie voor camid. rx_time is de (monotone) ontvangsttijd;
+    zonder rx_time wordt de klok hier gelezen.
+    """
+    if not 0 <= camid < MAX_CAMS:
+        logging.debug("Ignoring position for out-of-range CamID %s", camid)
+        return
+    current_position[camid] = position
+    last_fdb_timestamp[camid] = time.monotonic() if rx_time is None else rx_time
+    if _position_waiters:
+        with _position_cond:
+            _position_cond.notify_all()
+    if camid in _active_track_camids:
+        with _active_track_cond:
+            _active_track_cond.notify_all()
+
+def get_known_position(camid):
+    """
+    Geeft de laatst ontvangen positie-dict voor camid terug, of None.
+    """
+    if type(camid) is int and 0 <= camid < MAX_CAMS:
+        return current_position[camid]
+    return None
+
+def get_last_fdb_time(camid):
+    """
+    Geeft de (wall clock) tijd van de laatst ontvangen positie voor camid terug, of None.
+    """
+    if type(camid) is int and 0 <= camid < MAX_CAMS:
+        ts = last_fdb_timestamp[camid]
+        if ts:
+            return ts + _WALL_CLOCK_OFFSET
+    return None
+
+def get_known_camids():
+    """
+    Geeft de camids terug waarvoor een positie ontvangen is.
+    """
+    return [camid for camid, pos in enumerate(current_position) if pos is not None]
 
 _udp_listener_instance = None  
-position_queue = queue.Queue()
+
+class DropOldestRing:
+    """
+    Begrensde buffer: put() blokkeert nooit en gooit bij een volle buffer het oudste item weg.
+    deque.append/popleft zijn atomair onder de GIL, dus de producent neemt geen lock en een
+    item wordt nooit aan twee consumenten gegeven. Meerdere consumenten zijn toegestaan:
+    wie moet wachten neemt eerst _get_lock, zodat er steeds één wachtende consument is
+    en de _waiting vlag klopt. Het Event wordt alleen gezet als er iemand wacht.
+    """
+    __slots__ = ('_items', '_event', '_waiting', '_get_lock')
+
+    def __init__(self, maxlen):
+        self._items = deque(maxlen=maxlen)
+        self._event = threading.Event()
+        self._waiting = False
+        self._get_lock = threading.Lock()
+
+    def put(self, item):
+        self._items.append(item)
+        if self._waiting:
+            self._event.set()
+
+    def get(self, timeout=None):
+        """Haal het oudste item op; wacht hooguit timeout seconden, anders queue.Empty."""
+        items = self._items
+        try:
+            return items.popleft()
+        except IndexError:
+            pass
+        if timeout is None:
+            self._get_lock.acquire()
+        else:
+            deadline = time.monotonic() + timeout
+            if not self._get_lock.acquire(timeout=timeout):
+                raise queue.Empty
+            timeout = max(0.0, deadline - time.monotonic())
+        try:
+            self._waiting = True
+            self._event.clear()
+            # Opnieuw kijken: de producent kan net vóór _waiting een item hebben toegevoegd
+            if not items:
+                self._event.wait(timeout)
+            try:
+                return items.popleft()
+            except IndexError:
+                # Leeg na de timeout, of een andere consument was ons voor
+                raise queue.Empty
+        finally:
+            self._waiting = False
+            self._get_lock.release()
+
+    def clear(self):
+        self._items.clear()
+
+
 last_input_time = None
+INPUT_WINDOW = 2.0  # Seconden na de laatste input waarin de virtual wall actief gevolgd wordt
+_input_cond = threading.Condition()
+_input_expiry_pending = False
 
 _active_track_monitor_thread = None
 _active_track_stop_event = None
 
+# Per as de entry-informatie van de virtual wall. De dicts blijven bestaan en worden
+# bij een reset geleegd in plaats van vervangen.
 virtual_wall_tracker = {
-    "pan": None,
-    "tilt": None
+    "pan": {},
+    "tilt": {}
 }
 
+def reset_virtual_wall_tracker():
+    """Vergeet de entry-informatie van de virtual wall voor alle assen."""
+    for tracker in virtual_wall_tracker.values():
+        tracker.clear()
+
 _debug_mode = False
 
 def set_debug_mode(mode):
@@ -57,138 +402,45 @@ def is_debug_mode():
     return _debug_mode
 
 def user_input_received():
-    global last_input_time
-    last_input_time = time.time()
-
-def check_virtual_wall_during_position_update(axis, apcr, current_pos, wall_start, wall_end):
     """
-    Wordt periodiek aangeroepen (bij positie-update) voor de geselecteerde camID 
-    zolang de laatste input binnen 2 seconden was.
+    Registreert gebruikersinput, wekt wachtende threads (predictor) en plant een
+    eenmalige tick die de virtual wall tracker reset zodra het inputvenster verloopt.
     """
-    if last_input_time is None or (time.time() - last_input_time) > 2.0:
-        # Geen actieve invoer; reset de tracker (als we buiten de zone zijn)
-        virtual_wall_tracker[axis] = None
-        return
-
-    # In dit voorbeeld nemen we aan dat we de richting van het laatst ontvangen commando 
-    # ergens al hebben opgeslagen als 'last_command_delta' (voor de betreffende as).
-    # Dit delta geeft aan in welke richting de gebruiker wilde bewegen.
-    global last_command_delta
-    if last_command_delta is None:
-        return
-
-    # Roep de update functie aan met de huidige positie en de laatst ontvangen delta
-    block, trigger_correction = update_virtual_wall_state(axis, apcr, current_pos, last_command_delta, wall_start, wall_end)
-    if block:
-        print(f"[VirtualWall Update] {axis} input wordt nog geblokkeerd op basis van actuele positie.")
-    else:
-        print(f"[VirtualWall Update] {axis} input is vrij; tracker gereset.")
-
+    global last_input_time, _input_expiry_pending
+    with _input_cond:
+        last_input_time = time.time()
+        if not _input_expiry_pending:
+            _input_expiry_pending = True
+            schedule_tick(INPUT_WINDOW, _expire_input_window)
+        _input_cond.notify_all()
 
-def angle_distance(a, b):
-    """Bereken de minimale circulaire afstand tussen hoeken a en b."""
-    diff = abs(a - b)
-    return min(diff, 360 - diff)
+def input_recently_received():
+    """Geeft True als de laatste input binnen INPUT_WINDOW seconden was."""
+    return last_input_time is not None and (time.time() - last_input_time) <= INPUT_WINDOW
 
-#def update_virtual_wall_state(axis, current_pos, command_delta, wall_start, wall_end, virtualwall_active=True, margin=0):
+def _expire_input_window():
     """
-    Bepaalt of een nieuw stuurcommando (voor de opgegeven as) in het virtual wall‑gebied gaat.
-    
-    Wanneer de as al in het muurgebied zit, wordt er alleen beweging toegestaan als
-    deze in de exit‐richting is (dus de tegenovergestelde richting van de beweging waarmee de muur werd betreden).
-    Als dat niet zo is, dan wordt een correctie-delta berekend zodat de as automatisch naar de
-    virtuele muurgrens (plus 1° buiten) beweegt.
-    
-    Retourneert een tuple: (block, trigger_correction, correction_delta)
-      - block (bool): True als het originele commando geblokkeerd moet worden.
-      - trigger_correction (bool): True als dit de eerste keer is dat er correctie nodig is.
-      - correction_delta (float): De (automatische) correctiebeweging in graden.
+    Tick-callback: reset de virtual wall tracker als er geen nieuwe input meer is.
+    Is er intussen wel input geweest, dan wordt de tick opnieuw gepland voor de resterende tijd.
     """
-    if not virtualwall_active:
-        return False, False, 0
-
-    expected_pos = current_pos + command_delta
-    use_absolute = (wall_start < 0 or wall_start >= 360 or wall_end < 0 or wall_end >= 360)
-    tracker = virtual_wall_tracker.get(axis, {})
+    global _input_expiry_pending
+    with _input_cond:
+        remaining = INPUT_WINDOW - (time.time() - last_input_time)
+        if remaining > 0:
+            schedule_tick(remaining, _expire_input_window)
+            return
+        _input_expiry_pending = False
+    # Geen actieve invoer meer; reset de tracker
+    reset_virtual_wall_tracker()
 
-    if use_absolute:
-        logging.debug(f"[VirtualWall-ABS] Axis: {axis}, current: {current_pos:.2f}°, delta: {command_delta:.2f}°, expected: {expected_pos:.2f}°")
-        logging.debug(f"[VirtualWall-ABS] Wall range (absolute): {wall_start:.2f}° - {wall_end:.2f}°; marge: {margin}°")
-        if wall_start - margin <= expected_pos <= wall_end + margin:
-            current_in_wall = (wall_start - margin) <= current_pos <= (wall_end + margin)
-            if current_in_wall:
-                if 'entry_direction' not in tracker:
-                    tracker['entry_direction'] = 1 if command_delta > 0 else -1
-                    tracker['correcting'] = False
-                    virtual_wall_tracker[axis] = tracker
-                entry_direction = tracker['entry_direction']
-                new_cmd_direction = 1 if command_delta > 0 else -1 if command_delta < 0 else 0
-                logging.debug(f"[VirtualWall-ABS] Axis {axis}: entry_direction={entry_direction}, new_cmd_direction={new_cmd_direction}")
-                # Als de gebruiker beweegt in de exit-richting, laat dat toe (geen correctie)
-                if new_cmd_direction == -entry_direction:
-                    return False, False, 0
-                else:
-                    # Bepaal de exit-target: dit is de grens die je hebt gepasseerd, plus 1° buiten.
-                    if entry_direction > 0:
-                        # Als je met een positieve beweging binnenkwam, dan was je via de 'onderste' grens binnen.
-                        allowed_exit_target = wall_start - 1
-                    else:
-                        allowed_exit_target = wall_end + 1
-                    correction_delta = (allowed_exit_target - current_pos + 540) % 360 - 180
-                    logging.info(f"[CORRECTIE-ABS] Axis {axis}: current={current_pos:.2f}°, target={allowed_exit_target:.2f}°, correction_delta={correction_delta:.2f}° (entry_direction={entry_direction})")
-                    return True, not tracker.get('correcting', False), correction_delta
-            else:
-                tracker['entry_direction'] = 1 if command_delta > 0 else -1
-                tracker['active'] = True
-                tracker['correcting'] = False
-                virtual_wall_tracker[axis] = tracker
-                return True, True, 0
-        else:
-            virtual_wall_tracker[axis] = {}
-            return False, False, 0
-    else:
-        norm_current = current_pos % 360.0
-        norm_expected = expected_pos % 360.0
-        norm_wall_start = wall_start % 360.0
-        norm_wall_end = wall_end % 360.0
-        logging.debug(f"[VirtualWall-NORM] Axis: {axis}, current (norm): {norm_current:.2f}°, delta: {command_delta:.2f}°, expected (norm): {norm_expected:.2f}°")
-        logging.debug(f"[VirtualWall-NORM] Wall range: {norm_wall_start:.2f}° - {norm_wall_end:.2f}°; marge: {margin}°")
-        if norm_wall_start <= norm_wall_end:
-            wall_contains = (norm_wall_start - margin) <= norm_expected <= (norm_wall_end + margin)
-            current_in_wall = (norm_wall_start - margin) <= norm_current <= (norm_wall_end + margin)
-        else:
-            wall_contains = (norm_expected >= (norm_wall_start - margin)) or (norm_expected <= (norm_wall_end + margin))
-            current_in_wall = (norm_current >= (norm_wall_start - margin)) or (norm_current <= (norm_wall_end + margin))
-        if wall_contains:
-            if current_in_wall:
-                if 'entry_direction' not in tracker:
-                    tracker['entry_direction'] = 1 if command_delta > 0 else -1
-                    tracker['correcting'] = False
-                    virtual_wall_tracker[axis] = tracker
-                entry_direction = tracker['entry_direction']
-                new_cmd_direction = 1 if command_delta > 0 else -1 if command_delta < 0 else 0
-                logging.debug(f"[VirtualWall-NORM] Axis {axis}: entry_direction={entry_direction}, new_cmd_direction={new_cmd_direction}")
-                if new_cmd_direction == -entry_direction:
-                    logging.debug("[VirtualWall-NORM] Commando in exit richting toegestaan.")
-                    return False, False, 0
-                else:
-                    if entry_direction > 0:
-                        allowed_exit_target = (norm_wall_start - 1) % 360
-                    else:
-                        allowed_exit_target = (norm_wall_end + 1) % 360
-                    correction_delta = (allowed_exit_target - norm_current + 540) % 360 - 180
-                    logging.info(f"[CORRECTIE-NORM] Axis {axis}: current={norm_current:.2f}°, target={allowed_exit_target:.2f}°, correction_delta={correction_delta:.2f}° (entry_direction={entry_direction})")
-                    return True, not tracker.get('correcting', False), correction_delta
-            else:
-                tracker['entry_direction'] = 1 if command_delta > 0 else -1
-                tracker['active'] = True
-                tracker['correcting'] = False
-                virtual_wall_tracker[axis] = tracker
-                return True, True, 0
-        else:
-            virtual_wall_tracker[axis] = {}
-            return False, False, 0
+def angle_distance(a, b):
+    """Bereken de minimale circulaire afstand tussen hoeken a en b."""
+    d = (a - b) % 360.0
+    return d if d <= 180.0 else 360.0 - d
 
+def _wrap180(x):
+    """Wrap een hoekverschil naar het bereik [-180, 180)."""
+    return (x + 540.0) % 360.0 - 180.0
 
 def parse_fdb_message_to_dict(msg, ip_addr=None, settings=None):
     """
@@ -197,9 +449,10 @@ def parse_fdb_message_to_dict(msg, ip_addr=None, settings=None):
     Als ip_addr en settings zijn opgegeven, wordt het juiste camID bepaald op basis van het IP adres.
     Anders wordt het camID uit het bericht gebruikt.
     """
-    parts = msg.strip().split(';')
-    if len(parts) >= 6 and parts[0] == "FDB":
+    values = parse_fdb_values(msg)
+    if values:
         try:
+            cam, pan, tilt, roll, zoom = values
             # Bepaal het juiste camID
             if ip_addr and settings:
                 # Zoek het juiste apcr op basis van IP adres
@@ -211,18 +464,20 @@ def parse_fdb_message_to_dict(msg, ip_addr=None, settings=None):
                 
                 if real_camid is None:
                     # Geen match gevonden, gebruik het camID uit het bericht
-                    real_camid = int(parts[1])
+                    real_camid = cam
             else:
                 # Geen IP of settings opgegeven, gebruik het camID uit het bericht
-                real_camid = int(parts[1])
+                real_camid = cam
+            if real_camid is None:
+                raise ValueError("invalid CamID field")
             
             # Maak position dictionary met het juiste camID
             return {
                 'camid': real_camid,
-                'pan': float(parts[2]),
-                'tilt': float(parts[3]),
-                'roll': float(parts[4]),
-                'zoom': float(parts[5])
+                'pan': pan,
+                'tilt': tilt,
+                'roll': roll,
+                'zoom': zoom
             }
         except Exception as e:
             logging.error(f"Failed to parse FDB message: {e}")
@@ -232,30 +487,24 @@ def parse_fdb_message_to_dict(msg, ip_addr=None, settings=None):
 
 def parse_fdb_message(ascii_data, apcr):
     """
-    Parse een FDB bericht en sla de positiedata op in de current_position dictionary.
+    Parse een FDB bericht en sla de positiedata op in current_position.
     We gebruiken parts[2..5] voor pan, tilt, roll, zoom.
     Het camID wordt uit de apcr parameter gehaald in plaats van uit het bericht.
     """
-    parts = ascii_data.strip().split(';')
-    if len(parts) >= 6 and parts[0] == "FDB":
+    values = parse_fdb_values(ascii_data)
+    if values:
         try:
-            # parts[2] = pan, parts[3] = tilt, parts[4] = roll, parts[5] = zoom
-            pan_val = float(parts[2])
-            tilt_val = float(parts[3])
-            roll_val = float(parts[4])
-            zoom_val = float(parts[5])
+            # camid uit het bericht wordt genegeerd
+            _, pan_val, tilt_val, roll_val, zoom_val = values
             
             # We slaan het op onder apcr["camid"], NIET het camID uit het bericht
             real_camid = apcr["camid"]
-            with position_lock:
-                current_position[real_camid] = {
-                    'pan': pan_val,
-                    'tilt': tilt_val,
-                    'roll': roll_val,
-                    'zoom': zoom_val
-                }
-                global last_fdb_timestamp
-                last_fdb_timestamp[real_camid] = time.time()
+            _publish_position(real_camid, {
+                'pan': pan_val,
+                'tilt': tilt_val,
+                'roll': roll_val,
+                'zoom': zoom_val
+            })
            
             # Update presets.py pan tracking
             try:
@@ -263,61 +512,79 @@ def parse_fdb_message(ascii_data, apcr):
                 pan_degrees = pan_val / 10.0
                 # Update alleen de pan positie in de POC tracking
                 presets.handle_feedback_pan(pan_degrees)
-                if is_debug_mode():
+                if _debug_mode:
                     print(f"[DEBUG] POC pan tracking bijgewerkt: Pan={pan_degrees:.1f}°")
             except Exception as e:
-                print(f"[ERROR] Fout bij bijwerken POC pan tracking: {e}")
+                logging.error("Fout bij bijwerken POC pan tracking: %s", e)
                 
-            if is_debug_mode():
+            if _debug_mode:
                 print(f"[DEBUG] Positiedata opgeslagen in current_position voor CamID {real_camid}: Pan: {pan_val}°, Tilt: {tilt_val}°, Roll: {roll_val}°, Zoom: {zoom_val}")
                 
             # Retourneer een nieuwe FDB string met het juiste camID
             return f"FDB;{real_camid};{pan_val};{tilt_val};{roll_val};{zoom_val};"
         except ValueError as e:
-            print(f"[ERROR] Failed to parse FDB message: {e}")
+            logging.error("Failed to parse FDB message: %s", e)
             return None
     return None
 
 
+_notify_zoom_activity = None  # Gecachte interpreter.notify_zoom_activity
+
+def _notify_zoom_noop(active):
+    pass
+
+def _get_zoom_notifier():
+    """
+    Geeft interpreter.notify_zoom_activity terug. De interpreter wordt pas bij het
+    eerste gebruik geïmporteerd (circulaire import) en daarna gecachet.
+    Zolang de interpreter (nog) niet beschikbaar is wordt een no-op teruggegeven.
+    """
+    global _notify_zoom_activity
+    if _notify_zoom_activity is None:
+        try:
+            import interpreter
+        except Exception as e:
+            logging.debug("Could not notify interpreter about zoom activity: %s", e)
+            return _notify_zoom_noop
+        notifier = getattr(interpreter, 'notify_zoom_activity', None)
+        if notifier is None:
+            return _notify_zoom_noop
+        _notify_zoom_activity = notifier
+    return _notify_zoom_activity
+
 def stop_movement(as_name, send_apcr_command, apcr):
     st = movement_state[as_name]
-    if st['active']:
+    if st.active:
         # Stuur idle-pakket voor deze as
-        idle_packet_hex = get_idle_packet(as_name, apcr['camid'])
-        if idle_packet_hex:
-            data = bytes.fromhex(idle_packet_hex)
-            logging.debug(f"[DEBUG] Sending idle packet for {as_name}: {data.hex()}")
-            send_apcr_command(apcr, data)
+        data = get_idle_packet_bytes(as_name, apcr['camid'])
+        if data:
+            if _debug_mode:
+                print(f"[DEBUG] Sending idle packet for {as_name}: {data.hex()}")
+            queue_apcr_command(send_apcr_command, apcr, data, as_name)
         else:
-            logging.debug(f"[ERROR] No idle packet found for {as_name}")
+            logging.debug("[ERROR] No idle packet found for %s", as_name)
 
-        st['active']    = False
-        st['direction'] = None
-        st['percentage'] = 0
-        st.pop('control_type', None)  # Verwijder control_type indien aanwezig
+        st.active = False
+        st.direction = None
+        st.percentage = 0
+        st.control_type = None  # Verwijder control_type
 
-        if st['timer']:
-            st['timer'].cancel()
-            st['timer'] = None
+        # Maak een eventueel geplande herhaling ongeldig
+        st.generation += 1
 
-        # Na het stoppen, start een idle-timer, zodat we nogmaals een idle-pakket kunnen sturen
+        # Na het stoppen, plan een idle-tick, zodat we nogmaals een idle-pakket kunnen sturen
         # als de as lang genoeg inactief blijft.
-        if st['idle_timer']:
-            st['idle_timer'].cancel()
-        st['idle_timer'] = threading.Timer(
-            IDLE_DELAY,
-            send_idle_if_still_inactive,
-            args=[as_name, send_apcr_command, apcr]
-        )
-        st['idle_timer'].start()
+        st.idle_generation += 1
+        schedule_tick(IDLE_DELAY, send_idle_if_still_inactive,
+                      as_name, send_apcr_command, apcr, st.idle_generation)
 
 
 def start_or_update_movement(as_name, direction, percentage, send_apcr_command, apcr, control_type='axis', axis_idx=None, settings=None):
     st = movement_state[as_name]
     changed = (
-        st['direction'] != direction or
-        st['percentage'] != percentage or
-        st.get('control_type') != control_type
+        st.direction != direction or
+        st.percentage != percentage or
+        st.control_type != control_type
     )
     
     # Als we de beweging starten of updaten, pas dan adaptive speed toe voor pan/tilt als dat nodig is
@@ -341,8 +608,9 @@ def start_or_update_movement(as_name, direction, percentage, send_apcr_command,
                     return
     
     original_percentage = percentage
+    gs = settings.get("global_settings", {}) if settings else {}
     
-    if as_name in ['pan', 'tilt', 'roll'] and settings and settings.get("global_settings", {}).get("adaptive_speed", False):
+    if as_name in ['pan', 'tilt', 'roll'] and gs.get("adaptive_speed", False):
         # Haal het huidige zoom percentage op
         zoom_percentage = get_current_zoom_percentage(apcr)
         
@@ -353,51 +621,46 @@ def start_or_update_movement(as_name, direction, percentage, send_apcr_command,
             applying_adaptive_speed = True
             
             # Log dit als debug mode aan staat
-            if is_debug_mode():
+            if _debug_mode:
                 print(f"[DEBUG] Adaptive Speed: {as_name} using speed {percentage}% " +
                       f"(determined by zoom level: {zoom_percentage:.1f}%, ignoring original speed)")
                 
             # Forceer 'changed' op true als de snelheid is aangepast
-            if st['percentage'] != percentage:
+            if st.percentage != percentage:
                 changed = True
 
-    if changed or not st['active']:
-        st['active'] = True
-        st['direction'] = direction
-        st['percentage'] = percentage  # Dit is nu mogelijk de adaptive speed waarde
-        st['control_type'] = control_type
+    if changed or not st.active:
+        # Nieuwe of gewijzigde beweging telt als input: wekt een teruggeschakelde predictor
+        user_input_received()
+        st.active = True
+        st.direction = direction
+        st.percentage = percentage  # Dit is nu mogelijk de adaptive speed waarde
+        st.control_type = control_type
         
         # Bewaar originele snelheid bij adaptive speed voor debugdoeleinden
         if applying_adaptive_speed:
-            st['original_percentage'] = original_percentage
+            st.original_percentage = original_percentage
 
         # Verstuur het initiële commando met settings
         send_movement_packet(as_name, direction, percentage, send_apcr_command, apcr, control_type, settings)
 
-        if st['timer']:
-            st['timer'].cancel()
+        # Nieuwe generatie: eerder geplande herhalingen voor deze as worden genegeerd
+        st.generation += 1
         # Voeg settings toe aan de args, zodat repeat_command(as_name, send_apcr_command, apcr, settings) wordt aangeroepen
-        st['timer'] = threading.Timer(REPEAT_INTERVAL, repeat_command, args=[as_name, send_apcr_command, apcr, settings])
-        st['timer'].start()
+        schedule_tick(REPEAT_INTERVAL, repeat_command,
+                      as_name, send_apcr_command, apcr, settings, 0, st.generation)
 
-        if st['idle_timer']:
-            st['idle_timer'].cancel()
-            st['idle_timer'] = None
+        # Een nog geplande idle-tick is niet meer nodig
+        st.idle_generation += 1
             
         # Notify interpreter about zoom activity if this is a zoom operation
         if as_name == 'zoom':
-            try:
-                # Import the interpreter module dynamically to avoid circular imports
-                import importlib
-                interpreter = importlib.import_module('interpreter')
-                if hasattr(interpreter, 'notify_zoom_activity'):
-                    interpreter.notify_zoom_activity(True)
-            except Exception as e:
-                logging.debug(f"Could not notify interpreter about zoom activity: {e}")
+            _get_zoom_notifier()(True)
 
 cumulative_delta_lock = threading.Lock()
 cumulative_delta = 0  # Houdt de cumulatieve delta in graden bij
 predicted_block = False  # Globale flag die aangeeft dat de voorspelde positie in de muur komt
+PREDICTOR_MAX_BACKOFF = 0.5  # Maximale wachttijd (s) van de predictor bij een ongewijzigde positie
 
 def virtual_wall_predictor(settings, apcr, as_name, update_interval=0.05):
     """
@@ -406,45 +669,84 @@ def virtual_wall_predictor(settings, apcr, as_name, update_interval=0.05):
     De marge wordt dynamisch bepaald op basis van het 'ptr_speed'-percentage uit de instellingen.
     """
     global predicted_block
+    # Eenmalig opzoeken; de dict zelf blijft dezelfde, dus wijzigingen worden wel gezien
+    gs = settings["global_settings"]
+    pos_key = "pan" if as_name == "pan" else "tilt"  # pan-waarde voor pan, anders tilt-waarde
+    # Definieer een basis marge (bijv. 10°); deze wordt aangepast op basis van het percentage
+    base_margin = 20.0
+
+    # Zonder nieuwe positie en zonder nieuwe input verdubbelt de wachttijd (tot
+    # PREDICTOR_MAX_BACKOFF); bij een positiewijziging of nieuwe input gaan we terug
+    # naar update_interval.
+    interval = update_interval
+    last_pos = None
+    seen_input = None  # last_input_time bij de vorige iteratie
+
+    # Willekeurige faseverschuiving, zodat de predictors van pan en tilt niet
+    # in dezelfde milliseconde wakker worden.
+    time.sleep(random.uniform(0, update_interval))
+
+    # Vaste deadline op de monotone klok, zodat de periode niet wegdrijft door
+    # de rekentijd van elke iteratie (time.sleep(update_interval) telt die erbij op).
+    next_tick = time.monotonic()
+
+    def wait_next_tick():
+        nonlocal next_tick
+        next_tick += interval
+        now = time.monotonic()
+        if next_tick < now:
+            # Te ver achter (bv. na een lange blokkade): niet inhalen, opnieuw uitlijnen
+            next_tick = now
+        delay = next_tick - now
+        if interval > update_interval:
+            # Teruggeschakeld: nieuwe input (notify in user_input_received) wekt ons direct
+            with _input_cond:
+                if last_input_time == seen_input:
+                    _input_cond.wait(delay)
+        else:
+            time.sleep(delay)
+
     while True:
-        pos_str = get_current_position(apcr)
-        if pos_str:
-            try:
-                parts = pos_str.strip().split(';')
-                if len(parts) >= 6:
-                    # Gebruik de pan-waarde voor pan, anders tilt-waarde
-                    current_pos = float(parts[2]) if as_name == "pan" else float(parts[3])
-                else:
-                    time.sleep(update_interval)
-                    continue
-            except Exception as e:
-                print(f"[ERROR] Parsing current position in predictor: {e}")
-                time.sleep(update_interval)
+        # Zonder recente input is er niets te voorspellen: blokkeer op de conditie
+        # in plaats van op 20 Hz te blijven pollen.
+        with _input_cond:
+            if not input_recently_received():
+                _input_cond.wait(timeout=update_interval * 10)
+                next_tick = time.monotonic()
+                interval = update_interval
                 continue
+            new_input = last_input_time != seen_input
+            seen_input = last_input_time
+        if new_input:
+            interval = update_interval
+            next_tick = time.monotonic()
+
+        position = get_known_position(apcr.get('camid'))
+        if position is None:
+            wait_next_tick()
+            continue
+        current_pos = position[pos_key]
+
+        # Exponentiële backoff zolang de positie niet verandert en er geen nieuwe input is
+        if current_pos != last_pos or new_input:
+            interval = update_interval
+            last_pos = current_pos
+        else:
+            interval = min(interval * 2, PREDICTOR_MAX_BACKOFF)
 
         # Haal het snelheidpercentage op uit de settings (voor pan/tilt)
-        speed_percentage = settings["global_settings"].get("ptr_speed", 100)
-        # Definieer een basis marge (bijv. 10°) en pas deze aan op basis van het percentage:
-        base_margin = 20.0
+        speed_percentage = gs.get("ptr_speed", 100)
         predictor_margin = base_margin * (speed_percentage / 100.0)
         
         # Bereken de cumulatieve delta en de voorspelde positie
         delta = get_cumulative_delta()
         predicted_pos = current_pos + delta
 
-        # Haal de muurgrenzen op:
-        if as_name == "pan":
-            wall_start = settings["global_settings"].get("virtualwallstart_pan")
-            wall_end = settings["global_settings"].get("virtualwallend_pan")
-        else:
-            wall_start = settings["global_settings"].get("virtualwallstart_tilt")
-            wall_end = settings["global_settings"].get("virtualwallend_tilt")
-        
         # Controleer met de update-functie of de voorspelde positie binnen de muur (met de extra marge) komt.
-        # Hiervoor voegen we een extra margeparameter toe aan update_virtual_wall_state.
-        block, _ = update_virtual_wall_state(
-            as_name, predicted_pos, 0, wall_start, wall_end, apcr,
-            virtualwall_active=settings["global_settings"].get("virtualwall", True),
+        # De muurgrenzen zelf haalt update_virtual_wall_state (gecachet) uit de camera-instellingen.
+        block, _, _ = update_virtual_wall_state(
+            as_name, predicted_pos, 0, apcr,
+            virtualwall_active=gs.get("virtualwall", True),
             margin=predictor_margin
         )
         
@@ -457,7 +759,118 @@ def virtual_wall_predictor(settings, apcr, as_name, update_interval=0.05):
                 print(f"[Predictor] Predicted position {predicted_pos:.2f}° is outside the wall (with margin {predictor_margin:.2f}°). Clearing predicted_block.")
             predicted_block = False
 
-        time.sleep(update_interval)
+        wait_next_tick()
+
+# Voorberekende muurgrenzen per (start, end, marge). lo/hi bevatten de marge al;
+# in genormaliseerde modus zijn lo/hi de genormaliseerde onder- en bovengrens.
+# exit_pos/exit_neg zijn de exit targets (1° buiten de muur) bij een entry_direction > 0 resp. < 0.
+WallSpec = namedtuple("WallSpec", ["wall_start", "wall_end", "lo", "hi", "flipped", "absolute",
+                                   "exit_pos", "exit_neg", "mid"])
+_wall_spec_cache = {}
+_WALL_KEYS = {
+    "pan": ("virtualwallstart_pan", "virtualwallend_pan"),
+    "tilt": ("virtualwallstart_tilt", "virtualwallend_tilt"),
+}
+
+def invalidate_wall_spec_cache():
+    """
+    Leegt de WallSpec cache. Wordt aangeroepen wanneer de settings worden opgeslagen,
+    zodat specs van oude virtual wall grenzen niet blijven staan.
+    """
+    _wall_spec_cache.clear()
+
+def _get_wall_spec(axis, apcr, margin=0):
+    """
+    Geeft de (gecachte) WallSpec voor de gegeven as en camera, of None als de
+    camera geen virtual wall instellingen heeft voor deze as.
+    De cache is gesleuteld op de muurwaarden zelf, zodat vervangen of gewijzigde
+    apcr dicts nooit een spec van een andere camera opleveren.
+    """
+    start_key, end_key = _WALL_KEYS[axis]
+    wall_start = apcr.get(start_key)
+    wall_end = apcr.get(end_key)
+    if wall_start is None or wall_end is None:
+        return None
+
+    key = (wall_start, wall_end, margin)
+    try:
+        return _wall_spec_cache[key]
+    except KeyError:
+        pass
+
+    # Bepaal of we in absolute modus werken (als een grens buiten [0,360) valt)
+    use_absolute = (wall_start < 0 or wall_start >= 360 or wall_end < 0 or wall_end >= 360)
+    if use_absolute:
+        flipped = wall_start > wall_end
+        # Bij omgedraaide grenzen verlaten we via wall_end bij entry_direction > 0,
+        # anders via wall_start; in het normale geval andersom.
+        if flipped:
+            exit_pos, exit_neg = wall_end + 1.0, wall_start - 1.0
+        else:
+            exit_pos, exit_neg = wall_start - 1.0, wall_end + 1.0
+        spec = WallSpec(float(wall_start), float(wall_end),
+                        float(wall_start - margin), float(wall_end + margin),
+                        flipped, True, float(exit_pos), float(exit_neg),
+                        (wall_start + wall_end) / 2)
+    else:
+        # Genormaliseerde hoeken: zelfde grenzen als inWall()
+        norm_start = norm360(wall_start)
+        norm_end = norm360(wall_end)
+        spec = WallSpec(float(wall_start), float(wall_end),
+                        min(norm_start, norm_end), max(norm_start, norm_end),
+                        False, False, (norm_start - 1.0) % 360.0, (norm_end + 1.0) % 360.0,
+                        (wall_start + wall_end) / 2)
+
+    _wall_spec_cache[key] = spec
+    return spec
+
+# Uitkomsten van _wall_decision
+_WALL_OUTSIDE = 0   # huidige en verwachte positie buiten de muur
+_WALL_ENTERING = 1  # commando gaat de muur in: blokkeren
+_WALL_EXIT = 2      # in de muur, commando in exit richting: toestaan
+_WALL_BLOCKED = 3   # in de muur, verkeerde richting: blokkeren en corrigeren
+
+def _wall_decision(current_pos, command_delta, lo, hi, flipped, exit_pos, exit_neg, entry_direction):
+    """
+    Pure rekenkern van update_virtual_wall_state: alleen getallen erin en eruit,
+    geen dicts of logging, zodat numba hem kan compileren.
+
+    entry_direction is 0 als er voor deze as nog geen entry geregistreerd is.
+
+    Returns:
+        tuple: (uitkomst, entry_direction, correction_delta)
+    """
+    expected_pos = current_pos + command_delta
+
+    # Bij omgedraaide grenzen (wall_start > wall_end) ligt de muur OFWEL >= lo OFWEL <= hi.
+    if flipped:
+        current_in_wall = current_pos >= lo or current_pos <= hi
+        expected_in_wall = expected_pos >= lo or expected_pos <= hi
+    else:
+        current_in_wall = lo <= current_pos <= hi
+        expected_in_wall = lo <= expected_pos <= hi
+
+    if not current_in_wall:
+        if not expected_in_wall:
+            return _WALL_OUTSIDE, 0, 0.0
+        return _WALL_ENTERING, (1 if command_delta > 0 else -1), 0.0
+
+    # Al in de muur zonder entry: command_delta geeft aan aan welke kant we zitten
+    if entry_direction == 0:
+        entry_direction = 1 if command_delta > 0 else -1
+
+    # Alleen de richting tegengesteld aan de entry direction is toegestaan
+    new_cmd_direction = 1 if command_delta > 0 else -1 if command_delta < 0 else 0
+    if new_cmd_direction == -entry_direction:
+        return _WALL_EXIT, entry_direction, 0.0
+
+    # De exit targets zijn per WallSpec voorberekend
+    allowed_exit_target = exit_pos if entry_direction > 0 else exit_neg
+
+    return _WALL_BLOCKED, entry_direction, (allowed_exit_target - current_pos + 540.0) % 360.0 - 180.0
+
+if njit is not None:
+    _wall_decision = njit(cache=True)(_wall_decision)
 
 def update_virtual_wall_state(axis, current_pos, command_delta, apcr, virtualwall_active=True, margin=0):
     """
@@ -477,128 +890,58 @@ def update_virtual_wall_state(axis, current_pos, command_delta, apcr, virtualwal
     # Als virtual wall uit staat, doe niets.
     if not virtualwall_active:
         # Reset de tracker als we buiten het gebied gaan
-        virtual_wall_tracker[axis] = {}
+        virtual_wall_tracker[axis].clear()
         return False, False, 0
     
-    # Haal de wall instellingen van de specifieke camera op
-    if axis == "pan":
-        wall_start = apcr.get("virtualwallstart_pan")
-        wall_end = apcr.get("virtualwallend_pan")
-    else:  # tilt
-        wall_start = apcr.get("virtualwallstart_tilt")
-        wall_end = apcr.get("virtualwallend_tilt")
+    # Haal de (gecachte) wall instellingen van de specifieke camera op
+    spec = _get_wall_spec(axis, apcr, margin)
     
     # Als deze camera geen virtual wall instellingen heeft, doe niets
-    if wall_start is None or wall_end is None:
-        virtual_wall_tracker[axis] = {}
+    if spec is None:
+        virtual_wall_tracker[axis].clear()
         return False, False, 0
 
-    expected_pos = current_pos + command_delta
-    
-    # Bepaal of we in absolute modus werken (als een grens buiten [0,360) valt)
-    use_absolute = (wall_start < 0 or wall_start >= 360 or wall_end < 0 or wall_end >= 360)
-    
-    # Als we absolute waarden gebruiken, dan is de correcte vergelijking anders
-    # afhankelijk van of wall_start > wall_end of wall_start < wall_end
-    wall_boundaries_flipped = wall_start > wall_end
-    
-    # Haal de huidige tracker op voor deze as (of initialiseer deze)
-    tracker = virtual_wall_tracker.get(axis, {})
-    
+    wall_start, wall_end, lo, hi, wall_boundaries_flipped, use_absolute, exit_pos, exit_neg, _ = spec
+
+    # Haal de huidige tracker op voor deze as (wordt ter plekke bijgewerkt)
+    tracker = virtual_wall_tracker[axis]
+
     # Debug output
-    print(f"[DEBUG-WALL-DETAIL] current_pos={current_pos}°, expected_pos={expected_pos}°")
-    print(f"[DEBUG-WALL-DETAIL] wall_start={wall_start}°, wall_end={wall_end}°, flipped={wall_boundaries_flipped}")
-    print(f"[DEBUG-WALL-DETAIL] use_absolute={use_absolute}, margin={margin}°")
-
-    # Functie om te bepalen of een positie binnen de muur ligt:
-    def pos_in_wall(pos):
-        if use_absolute:
-            if wall_boundaries_flipped:
-                # Als wall_start > wall_end, dan moet de positie OFWEL >= wall_start OFWEL <= wall_end zijn
-                return (pos >= (wall_start - margin)) or (pos <= (wall_end + margin))
-            else:
-                # Anders gebruiken we de normale inclusieve vergelijking
-                return (wall_start - margin) <= pos <= (wall_end + margin)
-        else:
-            # Voor genormaliseerde hoeken, gebruik inWall helper functie
-            return inWall(pos, wall_start, wall_end)
-    
-    # Check of huidige positie en verwachte positie in de muur zijn
-    current_in_wall = pos_in_wall(current_pos)
-    expected_in_wall = pos_in_wall(expected_pos)
-    
-    print(f"[DEBUG-WALL-DETAIL] current_in_wall={current_in_wall}, expected_in_wall={expected_in_wall}")
-    
+    if _debug_mode:
+        print(f"[DEBUG-WALL-DETAIL] current_pos={current_pos}°, expected_pos={current_pos + command_delta}°")
+        print(f"[DEBUG-WALL-DETAIL] wall_start={wall_start}°, wall_end={wall_end}°, flipped={wall_boundaries_flipped}")
+        print(f"[DEBUG-WALL-DETAIL] use_absolute={use_absolute}, margin={margin}°")
+
+    outcome, entry_direction, correction_delta = _wall_decision(
+        current_pos, command_delta, lo, hi, wall_boundaries_flipped,
+        exit_pos, exit_neg, tracker.get("entry_direction", 0))
+
     # Reset de tracker als we buiten het muurgebied zitten
-    if not current_in_wall and not expected_in_wall:
-        virtual_wall_tracker[axis] = {}
+    if outcome == _WALL_OUTSIDE:
+        virtual_wall_tracker[axis].clear()
         return False, False, 0
-    
-    # Als we nog buiten waren en nu met dit commando de muur in gaan:
-    if not current_in_wall and expected_in_wall:
-        # Registreer entry direction
-        entry_direction = 1 if command_delta > 0 else -1
+
+    # Registreer de entry direction als we de muur in gaan, of als we al in de muur
+    # zitten zonder geregistreerde entry (dan bepaalt command_delta de kant)
+    if outcome == _WALL_ENTERING or "entry_direction" not in tracker:
         tracker["entry_direction"] = entry_direction
         tracker["entry_position"] = current_pos
-        virtual_wall_tracker[axis] = tracker
-        print(f"[DEBUG-WALL-DETAIL] Beweging geblokkeerd: poging om muur binnen te gaan")
+        if _debug_mode:
+            print(f"[DEBUG-WALL-DETAIL] Registreer entry_direction={entry_direction} voor as in muur")
+
+    if outcome == _WALL_ENTERING:
+        if _debug_mode:
+            print("[DEBUG-WALL-DETAIL] Beweging geblokkeerd: poging om muur binnen te gaan")
         return True, True, 0
-        
-    # Als er nog geen entry is geregistreerd, registreer die nu
-    if current_in_wall and "entry_direction" not in tracker:
-        # Als we al in de muur zijn, moeten we bepalen aan welke kant we zijn
-        # Gebruiken we command_delta als indicatie
-        entry_direction = 1 if command_delta > 0 else -1
-        tracker["entry_direction"] = entry_direction
-        tracker["entry_position"] = current_pos
-        virtual_wall_tracker[axis] = tracker
-        print(f"[DEBUG-WALL-DETAIL] Registreer entry_direction={entry_direction} voor as in muur")
 
-    # Bepaal welke richting toegestaan is (opposite van entry direction)
-    entry_direction = tracker.get("entry_direction", 0)
-    allowed_exit_direction = -entry_direction  # de enige toegestane beweging als we in de muur zitten
-    
-    # Bepaal de richting van het huidige commando
-    new_cmd_direction = 1 if command_delta > 0 else -1 if command_delta < 0 else 0
-    
-    # Als het commando in de exit-richting ligt, dan mag dat zonder correctie:
-    if new_cmd_direction == allowed_exit_direction:
-        print(f"[DEBUG-WALL-DETAIL] Beweging toegestaan: in exit richting ({new_cmd_direction})")
+    if outcome == _WALL_EXIT:
+        if _debug_mode:
+            print(f"[DEBUG-WALL-DETAIL] Beweging toegestaan: in exit richting ({-entry_direction})")
         return False, False, 0
-    
-    # Anders, bepaal de gewenste exit target
-    # In absolute modus:
-    if use_absolute:
-        if wall_boundaries_flipped:
-            # Als wall_start > wall_end,
-            # Dan verlaten we via wall_start als entry_direction < 0,
-            # en via wall_end als entry_direction > 0
-            if entry_direction > 0:
-                allowed_exit_target = wall_end + 1  # 1° voorbij wall_end
-            else:
-                allowed_exit_target = wall_start - 1  # 1° voor wall_start
-        else:
-            # Als wall_start < wall_end (normaal geval)
-            if entry_direction > 0:
-                allowed_exit_target = wall_start - 1
-            else:
-                allowed_exit_target = wall_end + 1
-    else:
-        # In genormaliseerde modus
-        norm_current = norm360(current_pos)
-        norm_wall_start = norm360(wall_start)
-        norm_wall_end = norm360(wall_end)
-        
-        if entry_direction > 0:
-            allowed_exit_target = (norm_wall_start - 1) % 360
-        else:
-            allowed_exit_target = (norm_wall_end + 1) % 360
-    
-    # Bereken correctie delta
-    correction_delta = (allowed_exit_target - current_pos + 540) % 360 - 180
-    
-    print(f"[DEBUG-WALL-DETAIL] Beweging geblokkeerd: niet in exit richting. correction_delta={correction_delta}")
-    
+
+    if _debug_mode:
+        print(f"[DEBUG-WALL-DETAIL] Beweging geblokkeerd: niet in exit richting. correction_delta={correction_delta}")
+
     # Geef nu aan dat het commando geblokkeerd moet worden en de correctie moet plaatsvinden.
     return True, True, correction_delta
 
@@ -606,6 +949,50 @@ def update_virtual_wall_state(axis, current_pos, command_delta, apcr, virtualwal
 _active_track_monitor_thread = None
 _active_track_stop_event = None
 
+# De monitor wordt wakker gemaakt zodra er een nieuwe positie binnenkomt voor een camera
+# met active track aan, of wanneer de active track instellingen wijzigen.
+_active_track_cond = threading.Condition()
+_active_track_camids = frozenset()
+_active_track_index = ()            # ActiveTrackCam per camera met active track en pan-muur
+_active_track_wall_enabled = False  # virtualwall of virtualwallpreset aan
+ACTIVE_TRACK_CHECK_INTERVAL = 0.5   # Minimale tijd (s) tussen twee checks
+ACTIVE_TRACK_IDLE_TIMEOUT = 5.0     # Vangnet: check ook zonder nieuwe posities na deze tijd
+PAN_TENTHS = 3600                   # Volle cirkel in tienden van graden
+
+# Voorberekende pan-muur per camera; FDB waarden en muurgrenzen zijn in tienden van graden,
+# wstart_norm/wend_norm zijn gehele tienden van graden in het bereik 0-3599, net als de
+# pan-waarde uit FDB, zodat de monitor exact met integers kan vergelijken.
+# wall_span is de lengte van de muur vanaf wstart_norm, met de klok mee (ook over 0/360 heen).
+ActiveTrackCam = namedtuple("ActiveTrackCam", ["camid", "apcr", "wstart_norm", "wend_norm", "wall_span", "crosses_zero"])
+
+def refresh_active_track_camids(settings):
+    """
+    Bouw de active track index opnieuw op vanuit de settings en wek de monitor.
+    Aanroepen nadat 'active_track', de virtual wall grenzen of de virtualwall
+    instellingen zijn gewijzigd (gebeurt o.a. bij save_settings).
+    """
+    global _active_track_camids, _active_track_index, _active_track_wall_enabled
+    gs = settings.get("global_settings", {}) or {}
+    index = []
+    for apcr in settings.get("apcrs", []):
+        if not apcr.get('active_track', False):
+            continue
+        wstart_pan = apcr.get("virtualwallstart_pan")
+        wend_pan = apcr.get("virtualwallend_pan")
+        if wstart_pan is None or wend_pan is None:
+            logging.debug("Camera %s heeft geen virtual wall pan instellingen, skipping check", apcr.get('name'))
+            continue
+        wstart_norm = round(wstart_pan) % PAN_TENTHS
+        wend_norm = round(wend_pan) % PAN_TENTHS
+        wall_span = (wend_norm - wstart_norm) % PAN_TENTHS
+        index.append(ActiveTrackCam(apcr.get('camid'), apcr, wstart_norm, wend_norm, wall_span, wstart_norm > wend_norm))
+
+    _active_track_index = tuple(index)
+    _active_track_wall_enabled = bool(gs.get("virtualwall", False) or gs.get("virtualwallpreset", False))
+    _active_track_camids = frozenset(cam.camid for cam in index)
+    with _active_track_cond:
+        _active_track_cond.notify_all()
+
 def start_active_track_monitor(settings, send_apcr_command_func, save_settings_func):
     """
     Start een thread die active track posities monitort voor alle camera's.
@@ -616,6 +1003,7 @@ def start_active_track_monitor(settings, send_apcr_command_func, save_settings_f
     stop_active_track_monitor()
     
     # Start een nieuwe monitor thread
+    refresh_active_track_camids(settings)
     _active_track_stop_event = threading.Event()
     _active_track_monitor_thread = threading.Thread(
         target=active_track_position_monitor,
@@ -633,6 +1021,8 @@ def stop_active_track_monitor():
     
     if _active_track_stop_event is not None:
         _active_track_stop_event.set()
+        with _active_track_cond:
+            _active_track_cond.notify_all()
     
     if _active_track_monitor_thread is not None and _active_track_monitor_thread.is_alive():
         _active_track_monitor_thread.join(timeout=1.0)
@@ -646,105 +1036,66 @@ def active_track_position_monitor(settings, send_apcr_command_func, save_setting
     Monitort alle camera's met active track ingeschakeld en controleert of ze niet
     in de virtual wall terechtkomen.
     """
-    # Check frequentie - niet te vaak om CPU en netwerk belasting te beperken
-    check_interval = 0.5  # seconden
-    
+    # Geen polling: de thread slaapt tot er een nieuwe positie is voor een camera met
+    # active track (zie _publish_position) of tot de instellingen wijzigen.
+    # Daarna wordt minstens ACTIVE_TRACK_CHECK_INTERVAL gewacht om de CPU belasting te beperken.
+    last_checked = {}  # camid -> laatst gecontroleerde positie-dict
+    index = None
     while not stop_event.is_set():
+        with _active_track_cond:
+            _active_track_cond.wait(timeout=ACTIVE_TRACK_IDLE_TIMEOUT)
+        if stop_event.is_set():
+            break
+
         try:
-            # Controleer of virtual wall is ingeschakeld
-            gs = settings.get("global_settings", {})
-            virtual_wall_enabled = gs.get("virtualwall", False) or gs.get("virtualwallpreset", False)
-            
-            if not virtual_wall_enabled:
-                time.sleep(check_interval)
+            if not _active_track_wall_enabled or not _active_track_index:
                 continue
+
+            # Na een herbouw van de index (gewijzigde grenzen) alles opnieuw controleren
+            if index is not _active_track_index:
+                index = _active_track_index
+                last_checked.clear()
+
+            debug = _debug_mode
             
-            # Controleer alle APC-Rs met active track ingeschakeld
-            for apcr in settings.get("apcrs", []):
-                camid = apcr.get('camid')
-                
-                # Skip als active track niet ingeschakeld is
+            # Controleer alle APC-Rs met active track ingeschakeld (en een pan-muur)
+            for camid, apcr, wstart_norm, wend_norm, wall_span, crosses_zero in index:
+                # Kan intussen elders zijn uitgezet
                 if not apcr.get('active_track', False):
                     continue
                 
-                # Haal de positie op - eerst uit current_position
-                position_data = None
-                with position_lock:
-                    if camid in current_position:
-                        position_data = current_position[camid].copy()
-                
-                # Als we geen data hebben in current_position, probeer dan een opvragen
+                # Alleen gepushte FDB posities gebruiken; zonder positie valt er niets te checken
+                position_data = get_known_position(camid)
                 if position_data is None:
-                    pos_str = get_current_position(apcr)
-                    if not pos_str:
-                        continue
-                    
-                    # Parse de positie
-                    parts = pos_str.strip().split(';')
-                    if len(parts) < 6:
-                        continue
-                    
-                    position_data = {
-                        'pan': float(parts[2]),
-                        'tilt': float(parts[3]),
-                        'roll': float(parts[4]),
-                        'zoom': float(parts[5])
-                    }
-                
-                # Haal de virtual wall instellingen op voor deze specifieke camera
-                wstart_pan = apcr.get("virtualwallstart_pan")
-                wend_pan = apcr.get("virtualwallend_pan")
-                
-                # Skip als geen virtual wall instellingen aanwezig zijn voor deze camera
-                if wstart_pan is None or wend_pan is None:
-                    if is_debug_mode():
-                        logging.debug(f"Camera {apcr['name']} heeft geen virtual wall pan instellingen, skipping check")
                     continue
+
+                # Positie-dicts worden nooit gemuteerd; hetzelfde object is al gecontroleerd
+                if last_checked.get(camid) is position_data:
+                    continue
+                last_checked[camid] = position_data
                 
-                # Haal de pan positie op
-                pan_raw = position_data.get('pan', 0)
-                
-                # Bereid de waarden voor op een consistente manier
-                # Het is belangrijk te weten dat FDB waarden ALTIJD in tienden van graden zijn
-                # en de virtual wall grenzen in settings.json ook
-                pan_deg = pan_raw / 10.0  # Altijd delen door 10 omdat FDB waarden in tienden zijn
-                wstart_deg = wstart_pan / 10.0  # Altijd delen door 10
-                wend_deg = wend_pan / 10.0  # Altijd delen door 10
-                
-                # Normaliseer naar 0-360 bereik
-                pan_norm = (pan_deg + 360) % 360
-                wstart_norm = (wstart_deg + 360) % 360
-                wend_norm = (wend_deg + 360) % 360
-                
-                if is_debug_mode():
-                    logging.debug(f"Active track check voor {apcr['name']}:")
-                    logging.debug(f"  Raw waarden: pos={pan_raw}, wstart={wstart_pan}, wend={wend_pan}")
-                    logging.debug(f"  In graden: pos={pan_deg:.1f}°, wstart={wstart_deg:.1f}°, wend={wend_deg:.1f}°")
-                    logging.debug(f"  Genormaliseerd: pos={pan_norm:.1f}°, wstart={wstart_norm:.1f}°, wend={wend_norm:.1f}°")
-                
-                # Bepaal of de positie binnen de muur valt
-                in_wall = False
+                # FDB waarden zijn ALTIJD in tienden van graden; normaliseer naar 0-3599
+                pan_norm = round(position_data['pan']) % PAN_TENTHS
                 
-                # Scenario 1: De muur kruist niet de 0/360 grens
-                if wstart_norm <= wend_norm:
-                    in_wall = wstart_norm <= pan_norm <= wend_norm
-                    if is_debug_mode():
-                        logging.debug(f"Virtual wall kruist NIET de 0/360 grens. In wall? {in_wall}")
-                # Scenario 2: De muur kruist de 0/360 grens
-                else:
-                    in_wall = pan_norm >= wstart_norm or pan_norm <= wend_norm
-                    if is_debug_mode():
-                        logging.debug(f"Virtual wall kruist de 0/360 grens. In wall? {in_wall}")
+                # Bepaal of de positie binnen de muur valt: afstand vanaf de muurstart,
+                # modulo de cirkel, werkt ook als de muur de 0/360 grens kruist
+                in_wall = (pan_norm - wstart_norm) % PAN_TENTHS <= wall_span
+
+                if debug:
+                    logging.debug("Active track check voor %s: pos=%.1f°, wall=%.1f°-%.1f°, kruist 0/360: %s, in wall? %s",
+                                  apcr['name'], pan_norm / 10.0, wstart_norm / 10.0, wend_norm / 10.0, crosses_zero, in_wall)
                 
                 if in_wall:
                     # Camera is in de muur - schakel active track uit
-                    logging.warning(f"Camera {apcr['name']} is in virtual wall, positie: {pan_deg:.1f}° (genormaliseerd: {pan_norm:.1f}°)")
+                    pan_deg = position_data['pan'] / 10.0
+                    logging.warning(f"Camera {apcr['name']} is in virtual wall, positie: {pan_deg:.1f}° (genormaliseerd: {pan_norm / 10.0:.1f}°)")
                     
                     # Schakel active track uit
                     apcr['active_track'] = False
+                    refresh_active_track_camids(settings)
                     
                     # Stuur active track commando
-                    data = bytes.fromhex("08" + f"{camid:02x}" + "0400000e0b0000")
+                    data = _camid_packet(_ACTIVE_TRACK_TEMPLATE, camid)
                     send_apcr_command_func(apcr, data)
                     
                     # Sla instellingen op
@@ -756,20 +1107,25 @@ def active_track_position_monitor(settings, send_apcr_command_func, save_setting
         except Exception as e:
             logging.error(f"Fout in active track monitor: {e}")
             
-        time.sleep(check_interval)
+        stop_event.wait(ACTIVE_TRACK_CHECK_INTERVAL)
 
 
-def repeat_command(as_name, send_apcr_command, apcr, settings, cumulative_delta=0):
+def repeat_command(as_name, send_apcr_command, apcr, settings, cumulative_delta=0, generation=None):
+    st = movement_state[as_name]
+    # Verouderde tick (beweging is intussen gestopt of opnieuw gestart): negeren
+    if generation is not None and generation != st.generation:
+        return
+
     # Zorg dat we de last_input_time updaten:
     user_input_received()
     
-    st = movement_state[as_name]
-    if st['active']:
+    if st.active:
         # Voor pan/tilt/roll, pas adaptive speed toe als dat is ingeschakeld
         applying_adaptive_speed = False
-        current_percentage = st['percentage']
+        current_percentage = st.percentage
         
-        if as_name in ['pan', 'tilt', 'roll'] and settings and settings.get("global_settings", {}).get("adaptive_speed", False):
+        gs = settings.get("global_settings", {}) if settings else {}
+        if as_name in ['pan', 'tilt', 'roll'] and gs.get("adaptive_speed", False):
             # Haal het huidige zoom percentage op
             zoom_percentage = get_current_zoom_percentage(apcr)
             
@@ -777,24 +1133,20 @@ def repeat_command(as_name, send_apcr_command, apcr, settings, cumulative_delta=
                 # Bereken de ABSOLUTE PTR-speed op basis van het zoom percentage
                 # Het kan zijn dat de huidige percentage al een adaptive waarde is,
                 # maar we berekenen het opnieuw om up-to-date te blijven met de zoom
-                original_percentage = st.get('original_percentage', current_percentage)
+                original_percentage = st.original_percentage if st.original_percentage is not None else current_percentage
                 current_percentage = calculate_adaptive_speed(zoom_percentage, original_percentage, settings, apcr)  # Pass apcr parameter
                 applying_adaptive_speed = True
                 
                 # Log dit als debug mode aan staat
-                if is_debug_mode() and current_percentage != st['percentage']:
+                if _debug_mode and current_percentage != st.percentage:
                     print(f"[DEBUG] Adaptive Speed (repeat): {as_name} using new speed: {current_percentage}% " +
                           f"(zoom level: {zoom_percentage:.1f}%)")
         
         # Bereken de delta voor dit herhalingscommando
         if as_name in ['pan', 'tilt']:
-            if as_name == 'pan':
-                base_min, base_max = (20, 2024) if st['direction'] == 'positive' else (-20, -2024)
-            else:
-                base_min, base_max = (-20, -2024) if st['direction'] == 'positive' else (20, 2024)
             # Gebruik current_percentage (mogelijk aangepast door adaptive speed)
-            speed_val = int(base_min + (current_percentage - 1) * (base_max - base_min) / 99)
-            command_delta = (speed_val / 2024.0) * 90.0
+            speed_val = _speed_value(as_name, st.direction, current_percentage)
+            command_delta = speed_val * _SPEED_TO_DEG
         else:
             command_delta = 0
 
@@ -802,16 +1154,17 @@ def repeat_command(as_name, send_apcr_command, apcr, settings, cumulative_delta=
         update_cumulative_delta(command_delta)
         # Check de globale voorspelling:
         if predicted_block:
-            print(f"[repeat_command] Predicted block actief: verdere herhalingen gestopt.")
+            # Eén keer per vastgehouden beweging: de herhaling stopt hier
+            logging.info("[repeat_command] Predicted block actief: verdere herhalingen gestopt.")
             return  # Stop de herhaling
 
         # Anders, stuur het commando door met mogelijk aangepaste snelheid
-        if current_percentage != st['percentage']:
-            st['percentage'] = current_percentage  # Update de opgeslagen percentage
+        if current_percentage != st.percentage:
+            st.percentage = current_percentage  # Update de opgeslagen percentage
             
-        send_movement_packet(as_name, st['direction'], current_percentage, send_apcr_command, apcr, st.get('control_type', 'axis'), settings)
-        st['timer'] = threading.Timer(REPEAT_INTERVAL, repeat_command, args=[as_name, send_apcr_command, apcr, settings, get_cumulative_delta()])
-        st['timer'].start()
+        send_movement_packet(as_name, st.direction, current_percentage, send_apcr_command, apcr, st.control_type or 'axis', settings)
+        schedule_tick(REPEAT_INTERVAL, repeat_command,
+                      as_name, send_apcr_command, apcr, settings, get_cumulative_delta(), generation)
 
 
 def check_virtual_wall(axis, current, delta, wall_start, wall_end):
@@ -843,7 +1196,7 @@ def check_virtual_wall(axis, current, delta, wall_start, wall_end):
                 # Correctie: beweeg naar 1° buiten de hogere grens
                 target = (upper + 1) % 360.0
             # Bepaal de benodigde delta (rekening houdend met wrapping)
-            corrected_delta = (target - current + 540) % 360 - 180
+            corrected_delta = _wrap180(target - current)
             return corrected_delta, True
         else:
             # Als we nog buiten de muur zitten: negeer de beweging (return 0)
@@ -852,9 +1205,21 @@ def check_virtual_wall(axis, current, delta, wall_start, wall_end):
         return delta, False
 
 
+# Base-pakketten per as en richting, zonder camid: 0A <camid> + <rest>
+_BASE_PACKET_TAILS = {
+    ('pan', True):   bytes.fromhex("0600000E0680001400"),   # pan right 1%
+    ('pan', False):  bytes.fromhex("0600000E068000ECFF"),   # pan left 1%
+    ('tilt', True):  bytes.fromhex("0600000E0780001400"),   # tilt down 1%
+    ('tilt', False): bytes.fromhex("0600000E078000ECFF"),   # tilt up 1%
+    ('roll', True):  bytes.fromhex("0600000E0880001400"),   # roll right 1%
+    ('roll', False): bytes.fromhex("0600000E088000ECFF"),   # roll left 1%
+}
+_base_packet_cache = {}  # (as_name, direction, camid) -> base-pakket als bytes
+
 def get_base_packet(as_name, direction, camid):
     """
     Geeft het basis '1%' movement-pakket terug als bytes, met dynamische camid in de 2e byte.
+    De pakketten worden per (as, richting, camid) één keer opgebouwd en daarna gecachet.
 
     Let op: de laatste 2 speed-bytes worden later vervangen door de actuele speed-waarde.
     """
@@ -865,27 +1230,39 @@ def get_base_packet(as_name, direction, camid):
     #   0A <camid> 06 00000E07 80 00 EC FF  (tilt up 1%)
     #   0A <camid> 06 00000E08 80 00 14 00  (roll right 1%)
     #   0A <camid> 06 00000E08 80 00 EC FF  (roll left 1%)
-    cam_hex = f"{camid:02x}"
-
-    if as_name == 'pan':
-        if direction == 'positive':  # right
-            return bytes.fromhex(f"0A{cam_hex}0600000E0680001400")
-        else:  # left
-            return bytes.fromhex(f"0A{cam_hex}0600000E068000ECFF")
-
-    elif as_name == 'tilt':
-        if direction == 'positive':  # tilt down
-            return bytes.fromhex(f"0A{cam_hex}0600000E0780001400")
-        else:  # tilt up
-            return bytes.fromhex(f"0A{cam_hex}0600000E078000ECFF")
+    key = (as_name, direction, camid)
+    try:
+        return _base_packet_cache[key]
+    except KeyError:
+        pass
+    tail = _BASE_PACKET_TAILS.get((as_name, direction == 'positive'))
+    packet = bytes((0x0A, camid)) + tail if tail is not None else None
+    _base_packet_cache[key] = packet
+    return packet
 
-    elif as_name == 'roll':
-        if direction == 'positive':  # roll right
-            return bytes.fromhex(f"0A{cam_hex}0600000E0880001400")
-        else:  # roll left
-            return bytes.fromhex(f"0A{cam_hex}0600000E088000ECFF")
+_movement_packet_cache = {}  # (as_name, direction, camid, speed_val) -> volledig bewegingspakket
 
-    return None
+def get_movement_packet_bytes(as_name, direction, camid, speed_val):
+    """
+    Geeft het volledige bewegingspakket (base-pakket met speed_val in de laatste 2 bytes)
+    terug als bytes. Er zijn per as/richting maar ~100 mogelijke snelheden, dus elk
+    pakket wordt één keer opgebouwd (pack_into op een kopie van het base-pakket) en
+    daarna gecachet. Het resultaat is onveranderlijk en mag dus gewoon in de
+    verzendwachtrij blijven staan.
+    """
+    key = (as_name, direction, camid, speed_val)
+    try:
+        return _movement_packet_cache[key]
+    except KeyError:
+        pass
+    base_packet = get_base_packet(as_name, direction, camid)
+    if base_packet is None:
+        return None
+    buf = bytearray(base_packet)
+    _SPEED_STRUCT.pack_into(buf, len(buf) - 2, speed_val)
+    data = bytes(buf)
+    _movement_packet_cache[key] = data
+    return data
 
 def get_idle_packet(as_name, camid):
     """
@@ -908,88 +1285,125 @@ def get_idle_packet(as_name, camid):
     return None
 
 
+_idle_packet_cache = {}  # (as_name, camid) -> idle-pakket als bytes
 
-def zoom_speed_increase(apcr, settings, save_settings_func):
-    # Disable adaptive speed if enabled
-    if settings["global_settings"].get("adaptive_speed", False):
-        settings["global_settings"]["adaptive_speed"] = False
-        print("Adaptive speed disabled by zoom speed increase")
-    
-    # Increase zoom speed
-    current = settings["global_settings"].get('zoom_speed', 100)
-    if current < 100:
-        settings["global_settings"]['zoom_speed'] = current + 1
-    save_settings_func(settings)
-    print(f"Zoom speed is now {settings['global_settings']['zoom_speed']}")
+_position_request_cache = {}  # camid -> positie-aanvraag (bytes)
 
-def zoom_speed_decrease(apcr, settings, save_settings_func):
-    # Disable adaptive speed if enabled
-    if settings["global_settings"].get("adaptive_speed", False):
-        settings["global_settings"]["adaptive_speed"] = False
-        print("Adaptive speed disabled by zoom speed decrease")
-    
-    # Decrease zoom speed
-    current = settings["global_settings"].get('zoom_speed', 100)
-    if current > 1:
-        settings["global_settings"]['zoom_speed'] = current - 1
-    save_settings_func(settings)
-    print(f"Zoom speed is now {settings['global_settings']['zoom_speed']}")
+def get_position_request_packet(camid):
+    """
+    Geeft het (gecachte) positie-aanvraagpakket voor camid terug als bytes.
+    Wordt periodiek per APC-R verstuurd, dus alleen de eerste keer per camid opgebouwd.
+    """
+    data = _position_request_cache.get(camid)
+    if data is None:
+        data = _position_request_cache[camid] = _camid_packet(_POSITION_REQUEST_TEMPLATE, camid)
+    return data
 
-def ptr_speed_increase(apcr, settings, save_settings_func):
-    # Get the effective PTR speed if adaptive speed is enabled
-    effective_speed = settings["global_settings"].get('ptr_speed', 100)
-    if settings["global_settings"].get("adaptive_speed", False):
-        # Try to calculate the effective speed
+def get_idle_packet_bytes(as_name, camid):
+    """
+    Zoals get_idle_packet, maar geeft het (gecachte) pakket direct als bytes terug.
+    Idle-pakketten hangen alleen af van as en camid, dus de hex hoeft maar één keer
+    geparsed te worden.
+    """
+    key = (as_name, camid)
+    try:
+        return _idle_packet_cache[key]
+    except KeyError:
+        pass
+    idle_packet_hex = get_idle_packet(as_name, camid)
+    data = bytes.fromhex(idle_packet_hex) if idle_packet_hex else None
+    _idle_packet_cache[key] = data
+    return data
+
+
+
+# Speed hotkeys kunnen met auto-repeat tientallen keren per seconde komen; in plaats van
+# elke keer settings.json te schrijven wordt er hooguit eens per SETTINGS_SAVE_DELAY opgeslagen.
+SETTINGS_SAVE_DELAY = 0.25
+_pending_saves = {}  # save_settings_func -> settings die nog weggeschreven moeten worden
+_pending_save_lock = threading.Lock()
+_pending_save_event = threading.Event()
+_settings_saver_thread = None
+
+def request_settings_save(settings, save_settings_func):
+    """
+    Plan het opslaan van de settings in. Meerdere aanvragen binnen SETTINGS_SAVE_DELAY
+    worden per save_settings_func samengevoegd tot één save_settings_func(settings) aanroep.
+    Het wegschrijven gebeurt op een eigen saver thread, niet op de controls ticker.
+    """
+    global _settings_saver_thread
+    with _pending_save_lock:
+        _pending_saves[save_settings_func] = settings
+        if _settings_saver_thread is None:
+            _settings_saver_thread = threading.Thread(target=_settings_saver_loop,
+                                                      name="SettingsSaver", daemon=True)
+            _settings_saver_thread.start()
+    _pending_save_event.set()
+
+def _settings_saver_loop():
+    while True:
+        _pending_save_event.wait()
+        time.sleep(SETTINGS_SAVE_DELAY)
+        _pending_save_event.clear()
+        flush_settings_save()
+
+def flush_settings_save():
+    """
+    Schrijf alle ingeplande settings-saves direct weg. main registreert dit ook voor afsluiten.
+    """
+    with _pending_save_lock:
+        pending = list(_pending_saves.items())
+        _pending_saves.clear()
+    for save_settings_func, settings in pending:
         try:
-            zoom_percentage = get_current_zoom_percentage(apcr)
-            if zoom_percentage is not None:
-                effective_speed = calculate_adaptive_speed(zoom_percentage, effective_speed, settings)
-                # Round to nearest integer to avoid small decimals
-                effective_speed = round(effective_speed)
+            save_settings_func(settings)
         except Exception as e:
-            logging.error(f"Error calculating effective speed: {e}")
-        
-        # Disable adaptive speed
-        settings["global_settings"]["adaptive_speed"] = False
-        print("Adaptive speed disabled by PTR speed increase")
-        
-        # Set PTR speed to the effective speed
-        settings["global_settings"]['ptr_speed'] = effective_speed
-    
-    # Increase PTR speed
-    current = settings["global_settings"].get('ptr_speed', 100)
-    if current < 100:
-        settings["global_settings"]['ptr_speed'] = current + 1
-    save_settings_func(settings)
-    print(f"PTR speed is now {settings['global_settings']['ptr_speed']}")
+            logging.error(f"Error saving settings: {e}")
+
+def _disable_adaptive_speed(apcr, settings, reason):
+    """
+    Schakel adaptive speed uit en geef de op dat moment effectieve PTR speed terug
+    (afgerond), zodat de gebruiker niet plotseling een andere snelheid krijgt.
+    """
+    gs = settings["global_settings"]
+    effective_speed = gs.get('ptr_speed', 100)
+    try:
+        zoom_percentage = get_current_zoom_percentage(apcr)
+        if zoom_percentage is not None:
+            # Round to nearest integer to avoid small decimals
+            effective_speed = round(calculate_adaptive_speed(zoom_percentage, effective_speed, settings))
+    except Exception as e:
+        logging.error(f"Error calculating effective speed: {e}")
+
+    gs["adaptive_speed"] = False
+    print(f"Adaptive speed disabled by {reason}")
+    return effective_speed
+
+def _step_speed(settings, key, delta, save_settings_func, label):
+    """
+    Verhoog/verlaag een snelheid in de global_settings met delta, begrensd op 1..100.
+    """
+    gs = settings["global_settings"]
+    gs[key] = max(1, min(100, gs.get(key, 100) + delta))
+    request_settings_save(settings, save_settings_func)
+    print(f"{label} speed is now {gs[key]}")
+
+def ptr_speed_increase(apcr, settings, save_settings_func):
+    if settings["global_settings"].get("adaptive_speed", False):
+        settings["global_settings"]['ptr_speed'] = _disable_adaptive_speed(apcr, settings, "PTR speed increase")
+    _step_speed(settings, 'ptr_speed', 1, save_settings_func, "PTR")
 
 def ptr_speed_decrease(apcr, settings, save_settings_func):
-    # Get the effective PTR speed if adaptive speed is enabled
-    effective_speed = settings["global_settings"].get('ptr_speed', 100)
     if settings["global_settings"].get("adaptive_speed", False):
-        # Try to calculate the effective speed
-        try:
-            zoom_percentage = get_current_zoom_percentage(apcr)
-            if zoom_percentage is not None:
-                effective_speed = calculate_adaptive_speed(zoom_percentage, effective_speed, settings)
-                # Round to nearest integer to avoid small decimals
-                effective_speed = round(effective_speed)
-        except Exception as e:
-            logging.error(f"Error calculating effective speed: {e}")
-        
-        # Disable adaptive speed
-        settings["global_settings"]["adaptive_speed"] = False
-        print("Adaptive speed disabled by PTR speed decrease")
-        
-        # Set PTR speed to the effective speed
-        settings["global_settings"]['ptr_speed'] = effective_speed
-    
-    # Decrease PTR speed
-    current = settings["global_settings"].get('ptr_speed', 100)
-    if current > 1:
-        settings["global_settings"]['ptr_speed'] = current - 1
-    save_settings_func(settings)
-    print(f"PTR speed is now {settings['global_settings']['ptr_speed']}")
+        settings["global_settings"]['ptr_speed'] = _disable_adaptive_speed(apcr, settings, "PTR speed decrease")
+    _step_speed(settings, 'ptr_speed', -1, save_settings_func, "PTR")
+
+def zoom_speed_increase(apcr, settings, save_settings_func):
+    # Zoom speed laat adaptive speed (dat alleen PTR beïnvloedt) ongemoeid
+    _step_speed(settings, 'zoom_speed', 1, save_settings_func, "Zoom")
+
+def zoom_speed_decrease(apcr, settings, save_settings_func):
+    _step_speed(settings, 'zoom_speed', -1, save_settings_func, "Zoom")
 
 def toggle_active_track(apcr, settings, save_settings_func, send_apcr_command_func):
     """
@@ -998,9 +1412,10 @@ def toggle_active_track(apcr, settings, save_settings_func, send_apcr_command_fu
     sla de gewijzigde settings op en print de status naar de console.
     """
     camid = apcr.get('camid', 1)
-    data = bytes.fromhex("08" + f"{camid:02x}" + "0400000e0b0000")
+    data = _camid_packet(_ACTIVE_TRACK_TEMPLATE, camid)
     new_status = not apcr.get('active_track', False)
     apcr['active_track'] = new_status
+    refresh_active_track_camids(settings)
     
     if new_status:
         print("Active track ON")
@@ -1030,146 +1445,97 @@ def send_recenter(apcr, send_apcr_command_func):
     Recenter command (with dynamic camid).
     """
     try:
-        camid = int(apcr['camid']) if 'camid' in apcr else 1
-        data = bytes.fromhex("08" + f"{camid:02x}" + "0400000e0c0000")
+        data = _camid_packet(_RECENTER_TEMPLATE, apcr.get('camid', 1))
         print("[DEBUG] Recenter data to send:", data.hex())
         send_apcr_command_func(apcr, data)
         print("Recenter command sent.")
     except Exception as e:
         print(f"[ERROR] Failed to recenter: {e}")
 
+# Stappen van de elastische speed-shortcuts, van hoog naar laag
+SPEED_STEPS = (100, 75, 50, 25, 5, 1)
+_SPEED_STEPS_ASC = SPEED_STEPS[::-1]
+
+def _closest_speed_step(speed):
+    """
+    Index in SPEED_STEPS van de stap die het dichtst bij speed ligt
+    (bij gelijke afstand de hoogste stap).
+    """
+    last = len(_SPEED_STEPS_ASC) - 1
+    i = bisect.bisect_left(_SPEED_STEPS_ASC, speed)
+    if i > last:
+        i = last
+    elif i > 0 and speed - _SPEED_STEPS_ASC[i - 1] < _SPEED_STEPS_ASC[i] - speed:
+        i -= 1
+    return last - i
+
+def _elastic_speed_step(gs, speed_key, direction_key):
+    """
+    Zet gs[speed_key] een stap verder in SPEED_STEPS in de richting van gs[direction_key]
+    ("down" of "up") en keer de richting om aan het eind van de reeks.
+    """
+    idx = _closest_speed_step(gs.get(speed_key, 100))
+    if gs.get(direction_key, "down") == "down":
+        if idx < len(SPEED_STEPS) - 1:
+            idx += 1
+        else:
+            idx -= 1
+            gs[direction_key] = "up"
+    else:
+        if idx > 0:
+            idx -= 1
+        else:
+            idx += 1
+            gs[direction_key] = "down"
+    gs[speed_key] = SPEED_STEPS[idx]
+    return SPEED_STEPS[idx]
+
 def handle_pan_tilt_speed_shortcut(apcr, settings, save_settings_func):
     """
     Elastische shortcut voor ptr_speed: 100 -> 75 -> 50 -> 25 -> 5 -> 1 en weer omhoog.
     Als adaptive speed actief is, wordt direct de dichtstbijzijnde stap gekozen
     en wordt adaptive speed uitgeschakeld.
     """
-    speed_steps = [100, 75, 50, 25, 5, 1]
-    current_direction = settings["global_settings"].get("ptr_speed_direction", "down")
-    
-    # Get the current effective speed
-    effective_speed = settings["global_settings"].get('ptr_speed', 100)
+    gs = settings["global_settings"]
     
-    if settings["global_settings"].get("adaptive_speed", False):
-        # Try to calculate the effective speed
-        try:
-            zoom_percentage = get_current_zoom_percentage(apcr)
-            if zoom_percentage is not None:
-                effective_speed = calculate_adaptive_speed(zoom_percentage, effective_speed, settings)
-                # Round to nearest integer to avoid small decimals
-                effective_speed = round(effective_speed)
-        except Exception as e:
-            logging.error(f"Error calculating effective speed: {e}")
-        
-        # Disable adaptive speed
-        settings["global_settings"]["adaptive_speed"] = False
-        print("Adaptive speed disabled by PTR speed shortcut")
-        
-        # Find the closest step to the current effective speed
-        closest_speed = min(speed_steps, key=lambda x: abs(x - effective_speed))
+    if gs.get("adaptive_speed", False):
+        effective_speed = _disable_adaptive_speed(apcr, settings, "PTR speed shortcut")
         
         # Set PTR speed directly to the closest step
-        settings["global_settings"]['ptr_speed'] = closest_speed
+        current_idx = _closest_speed_step(effective_speed)
+        closest_speed = SPEED_STEPS[current_idx]
+        gs['ptr_speed'] = closest_speed
         print(f"[DEBUG] PTR speed set directly to closest step: {closest_speed}% (from adaptive {effective_speed}%)")
         
         # Also update the direction for the next shortcut press
-        current_idx = speed_steps.index(closest_speed)
         if current_idx == 0:  # At max speed, direction should be down
-            settings["global_settings"]["ptr_speed_direction"] = "down"
-        elif current_idx == len(speed_steps) - 1:  # At min speed, direction should be up
-            settings["global_settings"]["ptr_speed_direction"] = "up"
-        else:
-            # Keep the current direction
-            pass
+            gs["ptr_speed_direction"] = "down"
+        elif current_idx == len(SPEED_STEPS) - 1:  # At min speed, direction should be up
+            gs["ptr_speed_direction"] = "up"
             
     else:
         # If adaptive speed is not active, use the normal elastic shortcut behavior
-        current_speed = settings["global_settings"].get("ptr_speed", 100)
-        if current_speed not in speed_steps:
-            current_speed = min(speed_steps, key=lambda x: abs(x - current_speed))
-        
-        idx = speed_steps.index(current_speed)
-        
-        if current_direction == "down":
-            if idx < len(speed_steps) - 1:
-                next_speed = speed_steps[idx + 1]
-            else:
-                next_speed = speed_steps[idx - 1]
-                settings["global_settings"]["ptr_speed_direction"] = "up"
-        else:
-            if idx > 0:
-                next_speed = speed_steps[idx - 1]
-            else:
-                next_speed = speed_steps[idx + 1]
-                settings["global_settings"]["ptr_speed_direction"] = "down"
-        
-        settings["global_settings"]['ptr_speed'] = next_speed
-        print(f"[DEBUG] PTR speed set to {next_speed} and direction to {settings['global_settings'].get('ptr_speed_direction')}")
+        next_speed = _elastic_speed_step(gs, 'ptr_speed', "ptr_speed_direction")
+        print(f"[DEBUG] PTR speed set to {next_speed} and direction to {gs.get('ptr_speed_direction')}")
     
-    save_settings_func(settings)
-
-# Gecorrigeerde functies in controls.py
-
-def zoom_speed_increase(apcr, settings, save_settings_func):
-    # Verwijderd: code om adaptive speed uit te schakelen
-    
-    # Increase zoom speed
-    current = settings["global_settings"].get('zoom_speed', 100)
-    if current < 100:
-        settings["global_settings"]['zoom_speed'] = current + 1
-    save_settings_func(settings)
-    print(f"Zoom speed is now {settings['global_settings']['zoom_speed']}")
-
-def zoom_speed_decrease(apcr, settings, save_settings_func):
-    # Verwijderd: code om adaptive speed uit te schakelen
-    
-    # Decrease zoom speed
-    current = settings["global_settings"].get('zoom_speed', 100)
-    if current > 1:
-        settings["global_settings"]['zoom_speed'] = current - 1
-    save_settings_func(settings)
-    print(f"Zoom speed is now {settings['global_settings']['zoom_speed']}")
+    request_settings_save(settings, save_settings_func)
 
 def handle_zoom_speed_shortcut(apcr, settings, save_settings_func):
     """
     Elastische shortcut voor zoom_speed: 100 -> 75 -> 50 -> 25 -> 5 -> 1 en weer omhoog.
     """
-    # Verwijderd: code om adaptive speed uit te schakelen
-    
-    # Zoom speed shortcut logic
-    current_speed = settings["global_settings"].get("zoom_speed", 100)
-    speed_steps = [100, 75, 50, 25, 5, 1]
-    current_direction = settings["global_settings"].get("zoom_speed_direction", "down")
-
-    if current_speed not in speed_steps:
-        current_speed = min(speed_steps, key=lambda x: abs(x - current_speed))
-
-    if current_direction == "down":
-        idx = speed_steps.index(current_speed)
-        if idx < len(speed_steps) - 1:
-            next_speed = speed_steps[idx + 1]
-        else:
-            next_speed = speed_steps[idx - 1]
-            settings["global_settings"]["zoom_speed_direction"] = "up"
-    else:
-        idx = speed_steps.index(current_speed)
-        if idx > 0:
-            next_speed = speed_steps[idx - 1]
-        else:
-            next_speed = speed_steps[idx + 1]
-            settings["global_settings"]["zoom_speed_direction"] = "down"
-
-    settings["global_settings"]['zoom_speed'] = next_speed
-    save_settings_func(settings)
-    print(f"[DEBUG] Zoom speed set to {next_speed} and direction to {settings['global_settings'].get('zoom_speed_direction')}")
+    gs = settings["global_settings"]
+    next_speed = _elastic_speed_step(gs, 'zoom_speed', "zoom_speed_direction")
+    request_settings_save(settings, save_settings_func)
+    print(f"[DEBUG] Zoom speed set to {next_speed} and direction to {gs.get('zoom_speed_direction')}")
 
 
 class UDPListener(threading.Thread):
     """
-    Central UDP listener class that receives FDB messages and places them in the position_queue.
+    Central UDP listener class that receives FDB messages and publishes the positions per camid.
     This class also handles automatic recovery after errors.
     """
-    def __init__(self, ip="0.0.0.0", port=11582, timeout=1.0, settings=None):
+    def __init__(self, ip="0.0.0.0", port=11582, timeout=1.0, settings=None, save_settings_func=None):
         super().__init__(daemon=True)
         self.ip = ip
         self.port = port
@@ -1181,10 +1547,23 @@ class UDPListener(threading.Thread):
         self.max_error_delay = 30.0  # Maximum wait time between recovery attempts
         self.current_error_delay = self.error_delay
         self.settings = settings  # Add settings for camID lookup
+        self._save_settings = save_settings_func  # Used for auto-updated device settings
+        self.recv_buffer_size = (settings or {}).get("listener_recv_buffer", RECV_BUFFER_SIZE)
+        self.thread = None
+        self.process_thread = None
+        # Raw (data, addr) packets between the socket reader and the processing thread
+        self.packet_queue = DropOldestRing(PACKET_QUEUE_SIZE)
+        # Reused receive buffer: recvfrom_into avoids allocating (and shrinking) a
+        # BUFFER_SIZE bytes object per datagram
+        self._rxbuf = bytearray(BUFFER_SIZE)
+        self._rxmv = memoryview(self._rxbuf)
         self._initialize_socket()
         
         # Create a mapping from IP address to camid for quicker lookups
         self.ip_to_camid_map = {}
+        self.name_to_index = {}
+        self._known_camids = frozenset()  # camids of all configured APC-Rs
+        self._unknown_senders = {}        # ip -> time.monotonic() when its FDB camid turned out unknown
         self._update_ip_camid_map()
 
     def _update_ip_camid_map(self):
@@ -1192,14 +1571,80 @@ class UDPListener(threading.Thread):
         Update the mapping from IP addresses to camids based on current settings.
         This helps with quick lookups when receiving FDB messages.
         """
-        self.ip_to_camid_map = {}
+        # Build the new map aside and swap it in with a single assignment, so readers
+        # never see a half-filled map and need no lock
+        new_map = {}
         if self.settings:
             for apcr in self.settings.get("apcrs", []):
                 if "ip" in apcr and "camid" in apcr:
-                    self.ip_to_camid_map[apcr["ip"]] = apcr["camid"]
-            
-            if is_debug_mode():
-                print(f"[DEBUG] Updated IP-to-CamID map: {self.ip_to_camid_map}")
+                    new_map[apcr["ip"]] = apcr["camid"]
+        self.ip_to_camid_map = new_map
+        self._refresh_known_camids()
+        self._rebuild_name_index()
+        self.forget_unknown_senders()
+
+        if self.settings and _debug_mode:
+            print(f"[DEBUG] Updated IP-to-CamID map: {new_map}")
+
+    def _refresh_known_camids(self):
+        """Rebuild the set of camids of all configured APC-Rs (with or without a known IP)."""
+        apcrs = self.settings.get("apcrs", []) if self.settings else []
+        known_camids = frozenset(apcr["camid"] for apcr in apcrs if "camid" in apcr)
+        if known_camids != self._known_camids:
+            # A sender may have been ignored for a camid that is configured now
+            self.forget_unknown_senders()
+        self._known_camids = known_camids
+
+    def forget_unknown_senders(self):
+        """
+        Stop ignoring senders whose camid was unknown. Called when the IP map or the
+        configured APC-Rs change (also from main after the settings are saved).
+        """
+        self._unknown_senders = {}
+
+    def _rebuild_name_index(self):
+        """
+        Rebuild the APC-R name -> index (in settings["apcrs"]) map used to match
+        status responses. The first APC-R with a given name wins, like the linear scan did.
+        """
+        name_to_index = {}
+        if self.settings:
+            for i, apcr in enumerate(self.settings.get("apcrs", [])):
+                name_to_index.setdefault(apcr.get("name"), i)
+        self.name_to_index = name_to_index
+
+    def _find_apcr_index(self, name):
+        """
+        Index of the APC-R called 'name' in settings["apcrs"], or None.
+        The settings list can change underneath us (new or removed APC-Rs), so a hit
+        is verified and a miss or stale entry triggers one rebuild of the map.
+        """
+        apcrs = self.settings.get("apcrs", [])
+        idx = self.name_to_index.get(name)
+        if idx is not None and idx < len(apcrs) and apcrs[idx].get("name") == name:
+            return idx
+        self._rebuild_name_index()
+        return self.name_to_index.get(name)
+
+    def _remember_unknown_sender(self, ip, now):
+        """Ignore FDB from ip for UNKNOWN_SENDER_RETRY seconds; expired entries are pruned here."""
+        unknown = {sender: t for sender, t in self._unknown_senders.items()
+                   if now - t < UNKNOWN_SENDER_RETRY}
+        unknown[ip] = now
+        self._unknown_senders = unknown
+
+    def _learn_ip_camid(self, ip, camid):
+        """
+        Add or change one IP-to-CamID mapping (copy-on-write).
+        The map is only ever replaced, never mutated in place, so any thread holding
+        a reference to it keeps a consistent snapshot.
+        """
+        if self.ip_to_camid_map.get(ip) == camid:
+            return
+        new_map = dict(self.ip_to_camid_map)
+        new_map[ip] = camid
+        self.ip_to_camid_map = new_map
+        self._unknown_senders.pop(ip, None)
 
     def _initialize_socket(self):
         """
@@ -1214,8 +1659,20 @@ class UDPListener(threading.Thread):
                 
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                # Larger kernel receive buffer so bursts survive a short stall of the reader
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.recv_buffer_size)
+                # The OS may silently clamp the value (e.g. net.core.rmem_max on Linux)
+                actual = self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+                if actual < self.recv_buffer_size:
+                    logging.warning(f"UDP receive buffer is {actual} bytes (requested {self.recv_buffer_size})")
+                else:
+                    logging.debug("UDP receive buffer is %s bytes", actual)
+            except OSError:
+                logging.warning("Could not increase UDP receive buffer size")
             self.socket.bind((self.ip, self.port))
-            self.socket.settimeout(self.timeout)
+            # Non-blocking: _listen_loop waits with select() and then drains all queued datagrams
+            self.socket.setblocking(False)
             logging.info(f"UDP Listener initialized on {self.ip}:{self.port}")
             return True
         except Exception as e:
@@ -1240,21 +1697,19 @@ class UDPListener(threading.Thread):
             return False
             
         try:
-            # Decode the response
-            resp_str = data.decode(errors='ignore')
-            
-            # Check if this is a status response (contains '|' separators)
-            if '|' not in resp_str:
+            # Check if this is a status response (contains '|' separators).
+            # Split the raw bytes; only the device name needs decoding.
+            if b'|' not in data:
                 return False
                 
-            parts = resp_str.split('|')
+            parts = data.split(b'|')
             if len(parts) < 8:
                 return False
                 
             # Extract device information
-            device_name = parts[0].strip()
+            device_name = parts[0].decode(errors='ignore').strip()
             try:
-                device_camid = int(parts[-2])  # CamID is second-to-last field
+                device_camid = int(parts[-2])  # CamID is second-to-last field (int() accepts bytes)
             except (ValueError, IndexError):
                 return False
                 
@@ -1262,13 +1717,9 @@ class UDPListener(threading.Thread):
             
             # Check if we have this device in our settings (by name)
             matching_apcr = None
-            matching_index = None
-            
-            for i, apcr in enumerate(self.settings.get("apcrs", [])):
-                if apcr.get("name") == device_name:
-                    matching_apcr = apcr
-                    matching_index = i
-                    break
+            matching_index = self._find_apcr_index(device_name)
+            if matching_index is not None:
+                matching_apcr = self.settings["apcrs"][matching_index]
                     
             if matching_apcr:
                 # Check if IP or CamID has changed
@@ -1288,11 +1739,13 @@ class UDPListener(threading.Thread):
                     logging.info(f"Auto-updated APC-R '{device_name}' CamID: {old_camid} -> {device_camid}")
                     
                 if changes_detected:
-                    # Save the updated settings
+                    # Save the updated settings (coalesced, a burst of updates gives one write)
                     try:
-                        from main import save_settings
-                        save_settings(self.settings)
-                        logging.info(f"Successfully saved auto-updated settings for APC-R '{device_name}'")
+                        if self._save_settings is None:
+                            from main import save_settings
+                            self._save_settings = save_settings
+                        request_settings_save(self.settings, self._save_settings)
+                        logging.info(f"Scheduled save of auto-updated settings for APC-R '{device_name}'")
                         print(f"[AUTO-UPDATE] APC-R '{device_name}' settings were automatically updated.")
                         return True
                     except Exception as e:
@@ -1300,7 +1753,7 @@ class UDPListener(threading.Thread):
             
             # Also update the ip_to_camid_map to ensure correct camID mapping
             if device_name and sender_ip and device_camid:
-                self.ip_to_camid_map[sender_ip] = device_camid
+                self._learn_ip_camid(sender_ip, device_camid)
                         
             return False
                 
@@ -1320,6 +1773,8 @@ class UDPListener(threading.Thread):
         self.running = True
         self.thread = threading.Thread(target=self._listen_loop, daemon=True)
         self.thread.start()
+        self.process_thread = threading.Thread(target=self._process_loop, daemon=True)
+        self.process_thread.start()
         logging.info("UDP Listener started")
         return True
 
@@ -1331,6 +1786,8 @@ class UDPListener(threading.Thread):
         self.stop_event.set()
         if self.thread:
             self.thread.join(timeout=2.0)
+        if self.process_thread:
+            self.process_thread.join(timeout=2.0)
         if self.socket:
             try:
                 self.socket.close()
@@ -1338,126 +1795,168 @@ class UDPListener(threading.Thread):
                 pass
         logging.info("UDP Listener stopped")
 
+    def _process_loop(self):
+        """
+        Consumer loop: takes raw packets from packet_queue and processes them,
+        so that slow processing never stalls the socket reads in _listen_loop.
+        """
+        while self.running and not self.stop_event.is_set():
+            try:
+                data, addr, rx_time = self.packet_queue.get(timeout=self.timeout)
+            except queue.Empty:
+                continue
+            try:
+                self._process_packet(data, addr, rx_time)
+            except Exception as e:
+                logging.error(f"Error processing UDP packet: {e}")
+
+        logging.info("UDP process_loop terminated")
+
+    def _process_packet(self, data, addr, rx_time=None):
+        """
+        Process a single received UDP packet (device status response or FDB message).
+        Now includes automatic settings update when device configuration changes.
+        rx_time is the monotonic receive time of the burst the packet arrived in.
+        """
+        # Debug output for received packets
+        if _debug_mode:
+            print(f"[DEBUG] Received packet from {addr}: {data.hex()}")
+
+        # Check if this is potentially a status response (format: NAME|NAME|ETH|...)
+        # Status responses come from port 2390; the int compare goes before the byte scan
+        if addr[1] == 2390 and b'|' in data:
+            # Try to process as device status response
+            self._process_device_status_response(data, addr)
+
+        # Process the message if it's a valid FDB message
+        if data.startswith(b"FDB;"):
+            self._process_fdb(data, addr, rx_time)
+
+    def _process_fdb(self, data, addr, rx_time=None):
+        """
+        Process an FDB position message: resolve the camid of the sender and publish the position.
+        """
+        fdb_values = _parse_fdb_bytes(data)
+
+        # Make sure our IP-to-CamID map is up-to-date
+        if not self.ip_to_camid_map:
+            self._update_ip_camid_map()
+
+        # Get the sender's IP address
+        sender_ip = addr[0]
+
+        # Look up the camid based on IP address (one snapshot of the map, no lock needed)
+        real_camid = self.ip_to_camid_map.get(sender_ip)
+        if real_camid is None:
+            # Senders that turned out to be unknown are ignored for a while, so a chatty
+            # foreign device costs neither a settings scan nor a log line per packet
+            now = time.monotonic()
+            if now - self._unknown_senders.get(sender_ip, -UNKNOWN_SENDER_RETRY) < UNKNOWN_SENDER_RETRY:
+                return
+        if real_camid is None and fdb_values:
+            # If we can't find the IP in our map, try to parse the camid from the message
+            try:
+                parsed_camid = fdb_values[0]
+                if parsed_camid is None:
+                    raise ValueError("invalid CamID field")
+
+                # Check if this camid exists in our settings (rebuild once: APC-Rs may have been added)
+                if parsed_camid not in self._known_camids:
+                    self._refresh_known_camids()
+
+                if parsed_camid in self._known_camids:
+                    # Update our map with this IP-to-camid mapping
+                    self._learn_ip_camid(sender_ip, parsed_camid)
+                    real_camid = parsed_camid
+                    if _debug_mode:
+                        print(f"[DEBUG] Learned new IP-to-CamID mapping: {sender_ip} -> {real_camid}")
+                else:
+                    logging.warning(f"Received FDB message with unknown CamID {parsed_camid} from {sender_ip}")
+                    # Only a parsed camid that really is not configured backs the sender off;
+                    # malformed packets are not a reason to ignore it
+                    self._remember_unknown_sender(sender_ip, now)
+            except Exception as e:
+                logging.error(f"Failed to parse camid from FDB message: {e}")
+
+        if real_camid is not None:
+            # Parse the rest of the message
+            try:
+                if fdb_values:
+                    _, pan, tilt, roll, zoom = fdb_values
+                    pos = {
+                        'camid': real_camid,
+                        'pan': pan,
+                        'tilt': tilt,
+                        'roll': roll,
+                        'zoom': zoom
+                    }
+
+                    # Debug output for position data
+                    if _debug_mode:
+                        print(f"[DEBUG] CamID {real_camid} position from {sender_ip}: Pan: {pan:.2f}°, Tilt: {tilt:.2f}°, Roll: {roll:.2f}°, Zoom: {zoom}")
+
+                    # Update current_position directly. pos is never mutated after this point
+                    _publish_position(real_camid, pos, rx_time)
+
+                    # Update presets.py pan tracking
+                    try:
+                        # Calculate pan in degrees
+                        pan_degrees = pos['pan'] / 10.0
+                        # Update only the pan position in POC tracking
+                        presets.handle_feedback_pan(pan_degrees)
+                        if _debug_mode:
+                            print(f"[DEBUG] UDPListener: POC pan tracking updated: Pan={pan_degrees:.1f}°")
+                    except Exception as e:
+                        logging.error(f"Error updating POC pan tracking in UDPListener: {e}")
+                else:
+                    logging.warning(f"Invalid FDB message format from {sender_ip}: {data.decode(errors='ignore')}")
+            except Exception as e:
+                logging.error(f"Error processing FDB message: {e}")
+        else:
+            logging.warning(f"Received FDB message from unknown IP {sender_ip}, message: {data.decode(errors='ignore')}")
+
     def _listen_loop(self):
         """
         Main loop function for receiving UDP messages.
-        Now includes automatic settings update when device configuration changes.
+        Only drains the socket; received packets are handed to _process_loop.
         """
         consecutive_timeouts = 0
         max_timeouts_before_reset = 10
         
         while self.running and not self.stop_event.is_set():
             try:
-                # Try to receive a message
-                data, addr = self.socket.recvfrom(BUFFER_SIZE)
+                # Wait until at least one datagram is available (or the timeout expires)
+                sock = self.socket
+                readable, _, _ = select.select([sock], [], [], self.timeout)
+                if not readable:
+                    consecutive_timeouts += 1
+                    if consecutive_timeouts >= max_timeouts_before_reset:
+                        logging.warning(f"{consecutive_timeouts} consecutive timeouts. Resetting socket.")
+                        self._initialize_socket()
+                        consecutive_timeouts = 0
+                    continue
                 consecutive_timeouts = 0
+                # One clock read per burst; the datagrams in it arrived (nearly) together
+                rx_time = time.monotonic()
                 
-                # Debug output for received packets
-                if is_debug_mode():
-                    print(f"[DEBUG] Received packet from {addr}: {data.hex()}")
-                
-                # Check if this is potentially a status response (format: NAME|NAME|ETH|...)
-                if b'|' in data and addr[1] == 2390:  # Status responses come from port 2390
-                    # Try to process as device status response
-                    self._process_device_status_response(data, addr)
-                
-                # Process the message if it's a valid FDB message
-                message = data.decode(errors='ignore')
-                if message.startswith("FDB;"):
-                    # Make sure our IP-to-CamID map is up-to-date
-                    if not self.ip_to_camid_map:
-                        self._update_ip_camid_map()
-                        
-                    # Get the sender's IP address
-                    sender_ip = addr[0]
-                    
-                    # Look up the camid based on IP address
-                    real_camid = None
-                    if sender_ip in self.ip_to_camid_map:
-                        real_camid = self.ip_to_camid_map[sender_ip]
-                    else:
-                        # If we can't find the IP in our map, try to parse the camid from the message
-                        try:
-                            parts = message.strip().split(';')
-                            if len(parts) >= 2:
-                                parsed_camid = int(parts[1])
-                                
-                                # Check if this camid exists in our settings
-                                camid_exists = False
-                                for apcr in self.settings.get("apcrs", []):
-                                    if apcr.get("camid") == parsed_camid:
-                                        camid_exists = True
-                                        # Update our map with this IP-to-camid mapping
-                                        self.ip_to_camid_map[sender_ip] = parsed_camid
-                                        break
-                                
-                                if camid_exists:
-                                    real_camid = parsed_camid
-                                    if is_debug_mode():
-                                        print(f"[DEBUG] Learned new IP-to-CamID mapping: {sender_ip} -> {real_camid}")
-                                else:
-                                    logging.warning(f"Received FDB message with unknown CamID {parsed_camid} from {sender_ip}")
-                        except Exception as e:
-                            logging.error(f"Failed to parse camid from FDB message: {e}")
-                    
-                    if real_camid is not None:
-                        # Parse the rest of the message
-                        try:
-                            parts = message.strip().split(';')
-                            if len(parts) >= 6:
-                                pos = {
-                                    'camid': real_camid,
-                                    'pan': float(parts[2]),
-                                    'tilt': float(parts[3]),
-                                    'roll': float(parts[4]),
-                                    'zoom': float(parts[5])
-                                }
-                                
-                                # Put in queue for processing
-                                position_queue.put(pos)
-                                
-                                # Debug output for position data
-                                if is_debug_mode():
-                                    print(f"[DEBUG] CamID {pos['camid']} position from {sender_ip}: Pan: {pos['pan']:.2f}°, Tilt: {pos['tilt']:.2f}°, Roll: {pos['roll']:.2f}°, Zoom: {pos['zoom']}")
-                                
-                                # Update the current_position dictionary directly
-                                with position_lock:
-                                    current_position[real_camid] = {
-                                        'pan': pos['pan'],
-                                        'tilt': pos['tilt'],
-                                        'roll': pos['roll'],
-                                        'zoom': pos['zoom']
-                                    }
-                                    last_fdb_timestamp[real_camid] = time.time()
-                                    
-                                # Update presets.py pan tracking
-                                try:
-                                    # Calculate pan in degrees
-                                    pan_degrees = pos['pan'] / 10.0
-                                    # Update only the pan position in POC tracking
-                                    presets.handle_feedback_pan(pan_degrees)
-                                    if is_debug_mode():
-                                        print(f"[DEBUG] UDPListener: POC pan tracking updated: Pan={pan_degrees:.1f}°")
-                                except Exception as e:
-                                    logging.error(f"Error updating POC pan tracking in UDPListener: {e}")
-                            else:
-                                logging.warning(f"Invalid FDB message format from {sender_ip}: {message}")
-                        except Exception as e:
-                            logging.error(f"Error processing FDB message: {e}")
-                    else:
-                        logging.warning(f"Received FDB message from unknown IP {sender_ip}, message: {message}")
+                # Drain everything that is queued in the kernel (bounded), one wake-up per burst.
+                # Bound methods are looked up once per burst instead of once per packet.
+                recvfrom_into = sock.recvfrom_into
+                put = self.packet_queue.put
+                rxbuf = self._rxbuf
+                rxmv = self._rxmv
+                for _ in range(RECV_BATCH_SIZE):
+                    try:
+                        nbytes, addr = recvfrom_into(rxbuf)
+                    except BlockingIOError:
+                        break
+                    # The buffer is reused for the next datagram, so the processing thread gets
+                    # an exact-size copy; never block the socket drain
+                    put((bytes(rxmv[:nbytes]), addr, rx_time))
                 
                 # Reset error delay if we successfully receive messages
                 self.current_error_delay = self.error_delay
                 
-            except socket.timeout:
-                consecutive_timeouts += 1
-                if consecutive_timeouts >= max_timeouts_before_reset:
-                    logging.warning(f"{consecutive_timeouts} consecutive timeouts. Resetting socket.")
-                    self._initialize_socket()
-                    consecutive_timeouts = 0
-                continue
-                
             except Exception as e:
                 logging.error(f"Error in UDP listener: {e}")
                 time.sleep(self.current_error_delay)
@@ -1471,9 +1970,10 @@ class UDPListener(threading.Thread):
 
         logging.info("UDP listen_loop terminated")
 
-def init_udp_listener(settings):
+def init_udp_listener(settings, save_settings_func=None):
     """
     Initialize the global UDP listener instance.
+    save_settings_func is used to persist settings that the listener auto-updates.
     """
     global _udp_listener_instance
     
@@ -1485,7 +1985,7 @@ def init_udp_listener(settings):
     port = settings.get("listener_port", 11582)
     
     # Create a new UDPListener and pass the settings for camID lookup
-    _udp_listener_instance = UDPListener(ip, port, settings=settings)
+    _udp_listener_instance = UDPListener(ip, port, settings=settings, save_settings_func=save_settings_func)
     return _udp_listener_instance.start()
 
 def get_udp_listener_instance():
@@ -1498,11 +1998,11 @@ def get_udp_listener_instance():
 def wait_for_current_position(apcr=None, timeout=5):
     """
     Wait until a position update is available within 'timeout' seconds.
-    First, the queue is emptied so that old messages are not used.
+    Positions that were already known when the call started are not used at first.
     Returns a dictionary with the current position in degrees:
       {'camid': ..., 'pan': ..., 'tilt': ..., 'roll': ..., 'zoom': ...}
     If no new data arrives within the timeout, the most recent position
-    from the global 'current_position' dictionary is used (if available).
+    from the global 'current_position' list is used (if available).
     
     Args:
         apcr: Optional APC-R to specify which camera's position to wait for
@@ -1511,54 +2011,61 @@ def wait_for_current_position(apcr=None, timeout=5):
     Returns:
         dict: Position data or None if no data is available
     """
-    # First clear the queue
-    while not position_queue.empty():
-        try:
-            position_queue.get_nowait()
-        except queue.Empty:
-            break
+    global _position_waiters
 
     target_camid = None
     if apcr and 'camid' in apcr:
         target_camid = apcr.get('camid')
-        if is_debug_mode():
+        if _debug_mode:
             print(f"[DEBUG] wait_for_current_position looking for CamID {target_camid}")
 
-    start_time = time.time()
-    while time.time() - start_time < timeout:
+    # Published position objects are replaced on every update, so a changed object means new data
+    seen = list(current_position)
+    if target_camid is not None:
+        if type(target_camid) is not int or not 0 <= target_camid < MAX_CAMS:
+            target_camid = -1  # No position can ever arrive for this camid
+        def has_new_data():
+            return target_camid >= 0 and current_position[target_camid] is not seen[target_camid]
+    else:
+        def has_new_data():
+            return any(a is not b for a, b in zip(current_position, seen))
+
+    deadline = time.monotonic() + timeout
+    with _position_cond:
+        _position_waiters += 1
         try:
-            pos = position_queue.get(timeout=0.1)
-            # If apcr is specified, check if the camid matches
-            if target_camid is not None and pos['camid'] != target_camid:
-                if is_debug_mode():
-                    print(f"[DEBUG] Skipping position data for CamID {pos['camid']}, waiting for {target_camid}")
-                continue
-            return pos
-        except queue.Empty:
-            # If the queue is empty, try to get the most recent live position
-            with position_lock:
-                if target_camid is not None and target_camid in current_position:
-                    pos_data = current_position[target_camid]
-                    return {
-                        'camid': target_camid,
-                        'pan': pos_data['pan'],
-                        'tilt': pos_data['tilt'],
-                        'roll': pos_data['roll'],
-                        'zoom': pos_data['zoom']
-                    }
-                elif target_camid is None and current_position:
-                    # If no specific camid is requested, return the first available
-                    first_camid = next(iter(current_position))
-                    pos_data = current_position[first_camid]
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                # Wait (woken by _publish_position) for new data, at most 0.1 s per round
+                _position_cond.wait_for(has_new_data, min(0.1, remaining))
+
+                # New or not, use the most recent live position
+                if target_camid is not None:
+                    camid = target_camid
+                else:
+                    changed = [c for c, pos in enumerate(current_position) if pos is not seen[c]]
+                    if changed:
+                        camid = changed[0]
+                    else:
+                        # If no specific camid is requested, return the first available
+                        known_camids = get_known_camids()
+                        camid = known_camids[0] if known_camids else None
+                pos_data = get_known_position(camid)
+                if pos_data is not None:
+                    # Return a copy: published positions are shared and must stay unmodified
                     return {
-                        'camid': first_camid,
+                        'camid': camid,
                         'pan': pos_data['pan'],
                         'tilt': pos_data['tilt'],
                         'roll': pos_data['roll'],
                         'zoom': pos_data['zoom']
                     }
+        finally:
+            _position_waiters -= 1
    
-    if is_debug_mode():
+    if _debug_mode:
         if target_camid is not None:
             print(f"[DEBUG] Timeout ({timeout}s) expired without receiving position data for CamID {target_camid}")
         else:
@@ -1580,39 +2087,51 @@ def get_current_position(apcr):
         str: FDB-formatted position string or None if position is not available
     """
     if not apcr:
-        if is_debug_mode():
+        if _debug_mode:
             print("[DEBUG] get_current_position called with None apcr")
         return None
     
     cam_id = apcr.get('camid')
     if cam_id is None:
-        if is_debug_mode():
+        if _debug_mode:
             print("[DEBUG] get_current_position called with apcr that has no camid")
         return None
     
-    if is_debug_mode():
+    if _debug_mode:
         print(f"[DEBUG] get_current_position called for CamID {cam_id}")
         # Show all available camids in current_position
-        with position_lock:
-            available_camids = list(current_position.keys())
+        available_camids = get_known_camids()
         print(f"[DEBUG] Available CamIDs in current_position: {available_camids}")
     
-    with position_lock:
-        pos = current_position.get(cam_id)
+    pos = get_known_position(cam_id)
     
     if pos:
         result = f"FDB;{cam_id};{pos['pan']};{pos['tilt']};{pos['roll']};{pos['zoom']};"
         
-        if is_debug_mode():
+        if _debug_mode:
             print(f"[DEBUG] getCurrentPosition found: CamID {cam_id}: Pan: {pos['pan']}°, Tilt: {pos['tilt']}°, Roll: {pos['roll']}°, Zoom: {pos['zoom']}")
         
         return result
     else:
-        if is_debug_mode():
+        if _debug_mode:
             print(f"[DEBUG] getCurrentPosition: No position data available for CamID {cam_id}!")
         
         return None
 
+def get_current_position_dict(apcr):
+    """
+    Zoals get_current_position, maar geeft de positie direct als dict terug met keys
+    'pan', 'tilt', 'roll' en 'zoom' (ruwe FDB-waarden), of None. Voor interne callers:
+    geen FDB-string opbouwen die daarna meteen weer gesplitst en geparsed wordt.
+    Het resultaat is een nieuwe dict en mag door de caller gewijzigd worden.
+    """
+    if not apcr:
+        return None
+    pos = get_known_position(apcr.get('camid'))
+    if pos is None:
+        return None
+    return {'pan': pos['pan'], 'tilt': pos['tilt'], 'roll': pos['roll'], 'zoom': pos['zoom']}
+
 def norm360(x):
     """Normaliseer een hoek zodat deze tussen 0 en 360° ligt."""
     return x % 360.0
@@ -1622,28 +2141,33 @@ def inWall(x, w1, w2):
     Bepaalt of x (in graden) binnen de virtual wall–zone ligt,
     gedefinieerd door w1 en w2 (onder- en bovengrens).
     """
-    lower = min(norm360(w1), norm360(w2))
-    upper = max(norm360(w1), norm360(w2))
-    return lower <= x <= upper
+    n1 = w1 % 360.0
+    n2 = w2 % 360.0
+    if n1 <= n2:
+        return n1 <= x <= n2
+    return n2 <= x <= n1
 
 
-def send_idle_if_still_inactive(as_name, send_apcr_command, apcr):
+def send_idle_if_still_inactive(as_name, send_apcr_command, apcr, idle_generation=None):
     """
     Verzendt het idle-pakket als de beweging nog steeds inactief is.
     """
     st = movement_state[as_name]
-    if not st['active']:  # nog steeds inactief
-        idle_packet_hex = get_idle_packet(as_name, apcr['camid'])
-        if idle_packet_hex:
-            data = bytes.fromhex(idle_packet_hex)
-            logging.debug(f"[DEBUG] Sending idle packet after delay for {as_name}: {data.hex()}")
-            send_apcr_command(apcr, data)
+    # Intussen opnieuw gestart of gestopt: deze idle-tick is achterhaald
+    if idle_generation is not None and idle_generation != st.idle_generation:
+        return
+    if not st.active:  # nog steeds inactief
+        data = get_idle_packet_bytes(as_name, apcr['camid'])
+        if data:
+            if _debug_mode:
+                print(f"[DEBUG] Sending idle packet after delay for {as_name}: {data.hex()}")
+            queue_apcr_command(send_apcr_command, apcr, data, as_name)
             
             # We don't notify about zoom here anymore
             # The notification already happened in stop_movement
             # This prevents multiple notifications that could cause issues
         else:
-            logging.debug(f"[ERROR] No idle packet found for {as_name}")
+            logging.debug("[ERROR] No idle packet found for %s", as_name)
 
 
 def update_cumulative_delta(delta):
@@ -1657,57 +2181,40 @@ def reset_cumulative_delta():
         cumulative_delta = 0
 
 def get_cumulative_delta():
-    global cumulative_delta
-    with cumulative_delta_lock:
-        return cumulative_delta
+    # Het lezen van één global is atomair; de lock is alleen nodig voor de += in
+    # update_cumulative_delta (read-modify-write).
+    return cumulative_delta
 
 
 
-# Complete send_movement_packet function with zoom notification
+# (camid, as) waarvan de laatste beweging door de virtual wall werd geblokkeerd;
+# zo wordt een blokkade één keer gemeld in plaats van bij elke herhaling
+_wall_blocked_axes = set()
 
+def _note_wall_block(camid, as_name, blocked, msg=None, *args):
+    key = (camid, as_name)
+    if not blocked:
+        _wall_blocked_axes.discard(key)
+    elif key not in _wall_blocked_axes:
+        _wall_blocked_axes.add(key)
+        logging.warning(msg, *args)
+
+# Complete send_movement_packet function with zoom notification
 def send_movement_packet(as_name, direction, percentage, send_apcr_command, apcr, control_type='axis', settings=None):
     try:
-        logging.debug(f"[DEBUG] send_movement_packet(as_name='{as_name}', direction='{direction}', percentage={percentage}, control_type='{control_type}')")
+        logging.debug("[DEBUG] send_movement_packet(as_name='%s', direction='%s', percentage=%s, control_type='%s')", as_name, direction, percentage, control_type)
         camid = apcr.get('camid', 1)
 
-        if as_name in ['pan', 'tilt']:
-            # Bereken de snelheid (voorbeeldberekening)
-            if as_name == 'pan':
-                base_min, base_max = (20, 2024) if direction == 'positive' else (-20, -2024)
-            else:  # tilt
-                base_min, base_max = (-20, -2024) if direction == 'positive' else (20, 2024)
-            speed_val = int(base_min + (percentage - 1) * (base_max - base_min) / 99)
-            speed_bytes = struct.pack('<h', speed_val)
-            base_packet = get_base_packet(as_name, direction, camid)
-            if base_packet is None:
-                logging.error(f"[ERROR] No base packet found for: {as_name}, {direction}")
-                return
-            packet_prefix = base_packet[:-2]
-            new_packet = packet_prefix + speed_bytes
-            data = new_packet
-
         # Voeg roll toe aan de ondersteunde assen
         if as_name in ['pan', 'tilt', 'roll']:
-            # Bereken de snelheid (afhankelijk van as)
-            if as_name == 'pan':
-                base_min, base_max = (20, 2024) if direction == 'positive' else (-20, -2024)
-            elif as_name == 'tilt':
-                base_min, base_max = (-20, -2024) if direction == 'positive' else (20, 2024)
-            elif as_name == 'roll':
-                # Roll gebruikt dezelfde logica als pan
-                base_min, base_max = (20, 2024) if direction == 'positive' else (-20, -2024)
-                
-            speed_val = int(base_min + (percentage - 1) * (base_max - base_min) / 99)
-            speed_bytes = struct.pack('<h', speed_val)
+            # Bereken de snelheid (afhankelijk van as; roll gebruikt dezelfde logica als pan)
+            speed_val = _speed_value(as_name, direction, percentage)
             
-            base_packet = get_base_packet(as_name, direction, camid)
-            if base_packet is None:
+            # Base-pakket met de actuele speed-waarde in de laatste 2 bytes (gecachet)
+            data = get_movement_packet_bytes(as_name, direction, camid, speed_val)
+            if data is None:
                 logging.error(f"[ERROR] No base packet found for: {as_name}, {direction}")
                 return
-                
-            packet_prefix = base_packet[:-2]
-            new_packet = packet_prefix + speed_bytes
-            data = new_packet
 
 
             # --- Virtual Wall Integration ---
@@ -1721,33 +2228,24 @@ def send_movement_packet(as_name, direction, percentage, send_apcr_command, apcr
                     virtualwall_enabled = global_settings.get("virtualwall", False)
                     
                     if virtualwall_enabled:
-                        # Nu halen we de virtual wall grenzen op uit de camera-specifieke instellingen
-                        if as_name == "pan":
-                            wall_start = apcr.get("virtualwallstart_pan")
-                            wall_end = apcr.get("virtualwallend_pan")
-                        else:
-                            wall_start = apcr.get("virtualwallstart_tilt")
-                            wall_end = apcr.get("virtualwallend_tilt")
+                        # De virtual wall grenzen komen uit de camera-specifieke instellingen
+                        # (gecachet tot de settings opnieuw worden opgeslagen)
+                        wall_axis = "pan" if as_name == "pan" else "tilt"
+                        spec = _get_wall_spec(wall_axis, apcr)
                             
                         # Alleen de virtual wall check uitvoeren als er instellingen beschikbaar zijn voor deze camera
-                        if wall_start is not None and wall_end is not None:
-                            logging.debug(f"[VIRTUAL WALL] Check active for {as_name}: {wall_start}° to {wall_end}°")
+                        if spec is not None:
+                            wall_start, wall_end = spec.wall_start, spec.wall_end
+                            logging.debug("[VIRTUAL WALL] Check active for %s: %s° to %s°", as_name, wall_start, wall_end)
                             
-                            # Obtain the current position of the axis
-                            current_pos = None
-                            pos_str = get_current_position(apcr)
-                            if pos_str:
-                                try:
-                                    parts = pos_str.strip().split(';')
-                                    if len(parts) >= 6:
-                                        current_pos = float(parts[2]) if as_name=="pan" else float(parts[3])
-                                except Exception as e:
-                                    logging.error(f"[ERROR] Parsing current position: {e}")
+                            # Obtain the current position of the axis straight from the position slot
+                            position = get_known_position(apcr.get('camid'))
+                            current_pos = position[wall_axis] if position is not None else None
                             
                             if current_pos is not None:
                                 # Calculate the movement in degrees (approximation)
-                                command_delta = (speed_val / 2024.0) * 90.0  
-                                logging.debug(f"[VIRTUAL WALL] Current position: {current_pos}°, command_delta: {command_delta}°")
+                                command_delta = speed_val * _SPEED_TO_DEG
+                                logging.debug("[VIRTUAL WALL] Current position: %s°, command_delta: %s°", current_pos, command_delta)
                                 
                                 # Determine if the position is within the wall (absolute mode)
                                 wall_boundaries_flipped = wall_start > wall_end
@@ -1773,7 +2271,7 @@ def send_movement_packet(as_name, direction, percentage, send_apcr_command, apcr
                                 moving_direction = 1 if command_delta > 0 else -1 if command_delta < 0 else 0
                                 
                                 # Debug output
-                                logging.debug(f"[VIRTUAL WALL] current_in_wall={current_in_wall}, expected_in_wall={expected_in_wall}, moving_direction={moving_direction}")
+                                logging.debug("[VIRTUAL WALL] current_in_wall=%s, expected_in_wall=%s, moving_direction=%s", current_in_wall, expected_in_wall, moving_direction)
                                 
                                 # LOGIC FOR ALLOWING MOVEMENT
                                 if current_in_wall:
@@ -1789,7 +2287,7 @@ def send_movement_packet(as_name, direction, percentage, send_apcr_command, apcr
                                             exit_direction = 1
                                     else:
                                         # Normal case (wall_start < wall_end)
-                                        exit_middle = (wall_start + wall_end) / 2
+                                        exit_middle = spec.mid
                                         if current_pos < exit_middle:
                                             # We are closer to the lower boundary, exit = downward
                                             exit_direction = -1
@@ -1797,39 +2295,43 @@ def send_movement_packet(as_name, direction, percentage, send_apcr_command, apcr
                                             # We are closer to the upper boundary, exit = upward
                                             exit_direction = 1
                                     
-                                    logging.debug(f"[VIRTUAL WALL] exit_direction={exit_direction}")
+                                    logging.debug("[VIRTUAL WALL] exit_direction=%s", exit_direction)
                                     
                                     # If we are moving in the exit direction, it is allowed
                                     if moving_direction == exit_direction:
-                                        logging.debug(f"[VIRTUAL WALL] Movement in exit direction allowed!")
+                                        logging.debug("[VIRTUAL WALL] Movement in exit direction allowed!")
+                                        _note_wall_block(camid, as_name, False)
                                         # Allow the movement to continue (no return)
                                     else:
                                         # Attempting to move further into the virtual wall - blocking!
-                                        print(f"[VIRTUAL WALL] Movement of {as_name} further INTO virtual wall is blocked.")
+                                        _note_wall_block(camid, as_name, True,
+                                                         "[VIRTUAL WALL] Movement of %s further INTO virtual wall is blocked.", as_name)
                                         
                                         # Send an IDLE packet
-                                        idle_hex = get_idle_packet(as_name, camid)
-                                        if idle_hex:
-                                            send_apcr_command(apcr, bytes.fromhex(idle_hex))
-                                            logging.debug(f"[VIRTUAL WALL] IDLE packet sent for {as_name}")
+                                        idle_data = get_idle_packet_bytes(as_name, camid)
+                                        if idle_data:
+                                            queue_apcr_command(send_apcr_command, apcr, idle_data, as_name)
+                                            logging.debug("[VIRTUAL WALL] IDLE packet sent for %s", as_name)
                                         
                                         return  # Block the command
                                 
                                 elif not current_in_wall and expected_in_wall:
                                     # We are just about to enter the wall - blocking!
-                                    print(f"[VIRTUAL WALL] Attempt to move {as_name} INTO virtual wall is blocked.")
+                                    _note_wall_block(camid, as_name, True,
+                                                     "[VIRTUAL WALL] Attempt to move %s INTO virtual wall is blocked.", as_name)
                                     
                                     # Send an IDLE packet
-                                    idle_hex = get_idle_packet(as_name, camid)
-                                    if idle_hex:
-                                        send_apcr_command(apcr, bytes.fromhex(idle_hex))
-                                        logging.debug(f"[VIRTUAL WALL] IDLE packet sent for {as_name}")
+                                    idle_data = get_idle_packet_bytes(as_name, camid)
+                                    if idle_data:
+                                        queue_apcr_command(send_apcr_command, apcr, idle_data, as_name)
+                                        logging.debug("[VIRTUAL WALL] IDLE packet sent for %s", as_name)
                                     
                                     return  # Block the command
                                 
                                 else:
                                     # Normal movement outside the wall - no issues
-                                    logging.debug(f"[VIRTUAL WALL] Normal movement outside the wall allowed.")
+                                    logging.debug("[VIRTUAL WALL] Normal movement outside the wall allowed.")
+                                    _note_wall_block(camid, as_name, False)
                                     # Allow the movement to continue (no return)
                                     # Allow the movement to continue (no return)
 
@@ -1839,26 +2341,20 @@ def send_movement_packet(as_name, direction, percentage, send_apcr_command, apcr
                 logging.error("[ERROR] Failed to get zoom packet.")
                 return
             data = packet
-            logging.debug(f"[DEBUG] Sending zoom movement: direction={direction}, percentage={percentage}, control_type={control_type}")
-            logging.debug(f"[DEBUG] Zoom Packet to send: {data.hex()}")
+            logging.debug("[DEBUG] Sending zoom movement: direction=%s, percentage=%s, control_type=%s", direction, percentage, control_type)
+            if _debug_mode:
+                print(f"[DEBUG] Zoom Packet to send: {data.hex()}")
         else:
             logging.error(f"[ERROR] Unknown as_name '{as_name}'")
             return
 
-        send_apcr_command(apcr, data)
-        logging.debug(f"[DEBUG] Sent packet: {data.hex()}")
+        queue_apcr_command(send_apcr_command, apcr, data, as_name)
+        if _debug_mode:
+            print(f"[DEBUG] Sent packet: {data.hex()}")
         
         # Notify about zoom activity if this is a zoom operation
         if as_name == 'zoom':
-            try:
-                # Import the interpreter module dynamically to avoid circular imports
-                import importlib
-                interpreter = importlib.import_module('interpreter')
-                if hasattr(interpreter, 'notify_zoom_activity'):
-                    interpreter.notify_zoom_activity(True)
-                    logging.debug(f"[DEBUG] Notified interpreter that zoom is active")
-            except Exception as e:
-                logging.debug(f"Could not notify interpreter about zoom activity: {e}")
+            _get_zoom_notifier()(True)
 
     except Exception as e:
         logging.error(f"[ERROR] Failed to send movement packet: {e}")
@@ -1866,91 +2362,71 @@ def send_movement_packet(as_name, direction, percentage, send_apcr_command, apcr
 # Complete stop_movement function with zoom notification
 
 def stop_movement(as_name, send_apcr_command, apcr):
+    # Een nieuwe beweging tegen de virtual wall wordt weer gemeld
+    _wall_blocked_axes.discard((apcr.get('camid', 1), as_name))
     st = movement_state[as_name]
-    if st['active']:
+    if st.active:
         # Stuur idle-pakket voor deze as
-        idle_packet_hex = get_idle_packet(as_name, apcr['camid'])
-        if idle_packet_hex:
-            data = bytes.fromhex(idle_packet_hex)
-            logging.debug(f"[DEBUG] Sending idle packet for {as_name}: {data.hex()}")
-            send_apcr_command(apcr, data)
+        data = get_idle_packet_bytes(as_name, apcr['camid'])
+        if data:
+            if _debug_mode:
+                print(f"[DEBUG] Sending idle packet for {as_name}: {data.hex()}")
+            queue_apcr_command(send_apcr_command, apcr, data, as_name)
         else:
-            logging.debug(f"[ERROR] No idle packet found for {as_name}")
+            logging.debug("[ERROR] No idle packet found for %s", as_name)
 
-        st['active']    = False
-        st['direction'] = None
-        st['percentage'] = 0
-        st.pop('control_type', None)  # Verwijder control_type indien aanwezig
+        st.active = False
+        st.direction = None
+        st.percentage = 0
+        st.control_type = None  # Verwijder control_type
 
-        if st['timer']:
-            st['timer'].cancel()
-            st['timer'] = None
+        # Maak een eventueel geplande herhaling ongeldig
+        st.generation += 1
 
-        # Na het stoppen, start een idle-timer, zodat we nogmaals een idle-pakket kunnen sturen
+        # Na het stoppen, plan een idle-tick, zodat we nogmaals een idle-pakket kunnen sturen
         # als de as lang genoeg inactief blijft.
-        if st['idle_timer']:
-            st['idle_timer'].cancel()
-        st['idle_timer'] = threading.Timer(
-            IDLE_DELAY,
-            send_idle_if_still_inactive,
-            args=[as_name, send_apcr_command, apcr]
-        )
-        st['idle_timer'].start()
+        st.idle_generation += 1
+        schedule_tick(IDLE_DELAY, send_idle_if_still_inactive,
+                      as_name, send_apcr_command, apcr, st.idle_generation)
         
         # Notify about zoom idle status if this is a zoom operation
         if as_name == 'zoom':
-            try:
-                # Import the interpreter module dynamically to avoid circular imports
-                import importlib
-                interpreter = importlib.import_module('interpreter')
-                if hasattr(interpreter, 'notify_zoom_activity'):
-                    interpreter.notify_zoom_activity(False)
-                    logging.debug(f"[DEBUG] Notified interpreter that zoom is inactive")
-            except Exception as e:
-                logging.debug(f"Could not notify interpreter about zoom activity: {e}")
+            _get_zoom_notifier()(False)
+
+_AXIS_CMD_BYTE = {'pan': 0x06, 'tilt': 0x07, 'roll': 0x08}
 
 def build_relative_zoom_packet(camid, speed_int):
     """
-    Bouwt een relatieve zoom-pakket op basis van de gegeven speed_int.
+    Bouwt een relatieve zoom-pakket (bytes) op basis van de gegeven speed_int.
     speed_int wordt als 16-bit little-endian signed integer verpakt.
     """
     # Zorg ervoor dat speed_int binnen de limieten valt:
-    speed_int = max(-32768, min(speed_int, 32767))
-    import struct
-    lohi = struct.pack('<h', speed_int).hex()
+    speed_int = -32768 if speed_int < -32768 else 32767 if speed_int > 32767 else speed_int
     # Stel het pakket samen (voorbeeld, pas aan op basis van jouw protocol)
-    packet = f"0A{camid:02X}06000000098000" + lohi
-    return packet
+    return _zoom_prefix(camid) + _SPEED_STRUCT.pack(speed_int)
 
 
 
 def build_pan_tilt_roll_packet(camid, axis, delta, relative=True):
     """
-    Bouwt een hex-pakket voor een relatieve beweging op de gegeven as.
+    Bouwt een pakket (bytes) voor een relatieve beweging op de gegeven as.
     Dit voorbeeld gaat ervan uit dat het pakket het volgende bevat:
-      - Een header: "0A" gevolgd door de camid (2 hex cijfers)
-      - Een vast commando "06"
-      - Een 6-cijferige vaste waarde "00000E"
-      - Een as-specifieke code: "06" voor pan, "07" voor tilt, "08" voor roll
-      - Een indicator voor relatieve beweging: "80" voor relatieve commando's
-      - "00" als vaste waarde
+      - Een header: 0x0A gevolgd door de camid (1 byte)
+      - Een vast commando 0x06
+      - Een vaste waarde 00 00 0E
+      - Een as-specifieke code: 0x06 voor pan, 0x07 voor tilt, 0x08 voor roll
+      - Een indicator voor relatieve beweging: 0x80 voor relatieve commando's (anders 0x81)
+      - 0x00 als vaste waarde
       - De delta als een 16-bit little-endian signed integer (2 bytes)
-    Het resultaat is een hexstring.
+    Het resultaat wordt direct als bytes teruggegeven (geen hex-omweg).
     """
-    axis_cmd = {'pan': '06', 'tilt': '07', 'roll': '08'}
-    if axis not in axis_cmd:
+    cmd = _AXIS_CMD_BYTE.get(axis)
+    if cmd is None:
         raise ValueError(f"Onbekende as: {axis}")
-    header = "0A" + f"{camid:02X}"
-    fixed = "06" + "00000E"
-    cmd = axis_cmd[axis]
-    # Gebruik "80" voor relatieve beweging
-    rel = "80" if relative else "81"
-    # Zet delta om naar 16-bit little-endian hex
+    # Gebruik 0x80 voor relatieve beweging
+    rel = 0x80 if relative else 0x81
     delta_int = int(round(delta))
-    delta_bytes = struct.pack('<h', delta_int)
-    delta_hex = delta_bytes.hex()
-    packet = header + fixed + cmd + rel + "00" + delta_hex
-    return packet.upper()
+    return bytes((0x0A, camid, 0x06, 0x00, 0x00, 0x0E, cmd, rel, 0x00)) + _SPEED_STRUCT.pack(delta_int)
 
 def motor_autocalib(apcr, send_apcr_command_func):
     """
@@ -1961,10 +2437,9 @@ def motor_autocalib(apcr, send_apcr_command_func):
         send_apcr_command_func: Function to send commands to the device
     """
     try:
-        camid = int(apcr['camid'])
-        camid_hex = f"{camid:02x}"
+        camid = apcr['camid']  # int sinds load_settings
         # Use the correct command for motor calibration
-        data = bytes.fromhex("09" + camid_hex + "0400000e0f000000")
+        data = _camid_packet(_MOTOR_CALIB_TEMPLATE, camid)
         send_apcr_command_func(apcr, data)
         logging.info(f"Motor calibration command sent to {apcr['name']} (CamID: {camid})")
         print(f"Motor calibration command sent to {apcr['name']}")
@@ -1983,10 +2458,9 @@ def gimbal_autocalib(apcr, send_apcr_command_func):
         send_apcr_command_func: Function to send commands to the device
     """
     try:
-        camid = int(apcr['camid'])
-        camid_hex = f"{camid:02x}"
+        camid = apcr['camid']  # int sinds load_settings
         # Use the correct command for gimbal auto-tuning
-        data = bytes.fromhex("09" + camid_hex + "0400000e0e000000")
+        data = _camid_packet(_GIMBAL_CALIB_TEMPLATE, camid)
         send_apcr_command_func(apcr, data)
         logging.info(f"Gimbal auto-tune command sent to {apcr['name']} (CamID: {camid})")
         print(f"Gimbal auto-tune command sent to {apcr['name']}")
@@ -1996,6 +2470,12 @@ def gimbal_autocalib(apcr, send_apcr_command_func):
         print(f"[ERROR] Failed to send gimbal auto-tune command: {e}")
         return False
     
+# Per zoomrichting: (teken van speed_val, pack-functie). 'in' wordt unsigned verpakt, 'out' signed.
+_ZOOM_DIRECTIONS = {'in': (1, _USPEED_STRUCT.pack), 'out': (-1, _SPEED_STRUCT.pack)}
+# Schaal van het percentage per control_type; andere control types gebruiken het percentage zelf
+_ZOOM_CONTROL_SCALE = {'axis': 10, 'button': 10}
+_zoom_packet_cache = {}  # (camid, richting, speed_val) -> volledig zoom-pakket
+
 def get_zoom_packet(percentage, direction, control_type='axis', camid=1):
     """
     Genereer het zoom-UDP-pakket voor in-/uitzoomen, met dynamische camid.
@@ -2004,48 +2484,32 @@ def get_zoom_packet(percentage, direction, control_type='axis', camid=1):
     Let op: De speed-waarde (speed_val) eindigt in 2 bytes. 
     """
     try:
-        if direction not in ['in', 'out']:
+        zoom_dir = _ZOOM_DIRECTIONS.get(direction)
+        if zoom_dir is None:
             print(f"[ERROR] Unknown zoom direction '{direction}'")
             return None
+        sign, pack_speed = zoom_dir
 
-        # Bepaal speed_val
-        # Voor 'in' (positief) vs 'out' (negatief). Let op signed vs unsigned.
-        if direction == 'in':
-            if control_type == 'axis':
-                speed_val = 10 * percentage     # as-based
-            elif control_type == 'button':
-                speed_val = 10 * percentage     # button-based (je kunt dit evt. anders schalen)
-            else:
-                speed_val = percentage
-        else:  # direction == 'out'
-            if control_type == 'axis':
-                speed_val = -10 * percentage
-            elif control_type == 'button':
-                speed_val = -10 * percentage
-            else:
-                speed_val = -percentage
+        # Bepaal speed_val: 'in' is positief, 'out' negatief; axis/button schalen x10
+        speed_val = sign * _ZOOM_CONTROL_SCALE.get(control_type, 1) * percentage
 
         # Encode de speed_val
         # Zoom 'in' = unsigned short? De firmware van Middlethings kan hier wat eigen logica hebben.
         # In de bestaande code gebruikten we deels <H> (unsigned) en deels <h> (signed).
-        # Je kunt hier ook keizen om altijd signed short te gebruiken (struct.pack('<h', speed_val)).
-        # Ter illustratie houden we het onderscheid aan:
-        if direction == 'in':
-            speed_bytes = struct.pack('<H', speed_val)  # unsigned
-            logging.debug(f"[DEBUG] Zoom 'in': percentage={percentage}, speed_val={speed_val}, hex={speed_bytes.hex()}")
-        else:  # out
-            speed_bytes = struct.pack('<h', speed_val)  # signed
-            logging.debug(f"[DEBUG] Zoom 'out': percentage={percentage}, speed_val={speed_val}, hex={speed_bytes.hex()}")
-
+        # Ter illustratie houden we het onderscheid aan (zie _ZOOM_DIRECTIONS).
         # Packet prefix (2e byte is camid)
         #   0A <camid> 06 00 00 00 09 80 00 ...
-        # De laatste 2 bytes worden speed_bytes.
-        cam_hex = f"{camid:02x}"
-        packet_prefix = bytes.fromhex(f"0A{cam_hex}06000000098000")
-
-        packet = packet_prefix + speed_bytes
-
-        logging.debug(f"[DEBUG] Zoom packet built: {packet.hex()} for percentage: {percentage}, direction: {direction}, control_type: {control_type}")
+        # De laatste 2 bytes zijn de speed-bytes. Er zijn per camid en richting maar
+        # enkele honderden speed-waarden, dus elk volledig pakket wordt gecachet.
+        # (Alleen int speed-waarden: 25.0 == 25 als dict-key, maar struct weigert floats.)
+        key = (camid, direction, speed_val)
+        packet = _zoom_packet_cache.get(key) if type(speed_val) is int else None
+        if packet is None:
+            packet = _zoom_prefix(camid) + pack_speed(speed_val)
+            _zoom_packet_cache[key] = packet
+        if _debug_mode:
+            print(f"[DEBUG] Zoom '{direction}': percentage={percentage}, speed_val={speed_val}, hex={packet[-2:].hex()}")
+            print(f"[DEBUG] Zoom packet built: {packet.hex()} for percentage: {percentage}, direction: {direction}, control_type: {control_type}")
         return packet
 
     except Exception as e:
@@ -2055,14 +2519,45 @@ def get_zoom_packet(percentage, direction, control_type='axis', camid=1):
 
 # Predefined zoom levels with corresponding PTR speed values (NOT percentages of current speed)
 # These are the actual speed values to use at each zoom level
-ZOOM_SPEED_MAPPING = [
+ZOOM_SPEED_MAPPING = (
     (0, 50),     # At 0% zoom, use ptr_speed of 100%
 #    (10, 70),     # At 10% zoom, use ptr_speed of 90%
 #    (25, 55),     # At 25% zoom, use ptr_speed of 75%
 #    (50, 40),     # At 50% zoom, use ptr_speed of 50%
 #    (75, 25),     # At 75% zoom, use ptr_speed of 25%
-    (100, 3)     # At 100% zoom, use ptr_speed of 10%
-]
+    (100, 3),    # At 100% zoom, use ptr_speed of 10%
+)
+
+# Optional mapping points (zoom levels) and the APC-R settings keys that hold their speed
+_ADAPTIVE_ZOOM_LEVELS = (0, 10, 25, 50, 75, 100)
+_ADAPTIVE_MAP_KEYS = tuple(f"adaptive_speed_map_{zoom_level}" for zoom_level in _ADAPTIVE_ZOOM_LEVELS)
+
+# Default mapping points
+_ADAPTIVE_DEFAULT_MAPPING = {
+    0: 50,    # At 0% zoom, use ptr_speed of 50%
+    100: 3    # At 100% zoom, use ptr_speed of 3%
+}
+
+@functools.lru_cache(maxsize=64)
+def _build_zoom_speed_mapping(map_values):
+    """
+    Build the interpolation points from the adaptive_speed_map_* values of an
+    APC-R (None = not set), falling back to the defaults. Cached: the values only
+    change when settings change.
+    Returns two parallel tuples (zoom_levels, speeds); _ADAPTIVE_ZOOM_LEVELS is
+    already sorted, so zoom_levels can be bisected directly.
+    """
+    zoom_levels = []
+    speeds = []
+    for zoom_level, speed_value in zip(_ADAPTIVE_ZOOM_LEVELS, map_values):
+        if speed_value is None:
+            # Use the default value for this zoom level (if there is one)
+            speed_value = _ADAPTIVE_DEFAULT_MAPPING.get(zoom_level)
+            if speed_value is None:
+                continue
+        zoom_levels.append(zoom_level)
+        speeds.append(speed_value)
+    return tuple(zoom_levels), tuple(speeds)
 
 def calculate_adaptive_speed(zoom_percentage, base_speed, settings=None, apcr=None):
     """
@@ -2080,82 +2575,52 @@ def calculate_adaptive_speed(zoom_percentage, base_speed, settings=None, apcr=No
     Returns:
         int: Adjusted speed (1-100)
     """
-    # Check if adaptive speed is enabled (still using global setting for enabling/disabling)
-    if settings and "global_settings" in settings:
-        adaptive_speed_enabled = settings["global_settings"].get("adaptive_speed", False)
-        if not adaptive_speed_enabled:
-            return base_speed
-    else:
+    # Check if adaptive speed is enabled (still using global setting for enabling/disabling).
+    # This is the common case, so it is the very first check.
+    if not ((settings or {}).get("global_settings") or {}).get("adaptive_speed", False):
         return base_speed
     
     # Check if we have a valid APC-R configuration
     if not apcr:
-        if is_debug_mode():
+        if _debug_mode:
             print("[DEBUG] No APC-R configuration provided for adaptive speed, using base speed")
         return base_speed
     
     # Ensure zoom_percentage is within valid range (0-100)
     zoom_percentage = max(0, min(100, zoom_percentage))
     
-    # Build the mapping from APC-R specific settings or use defaults
-    zoom_speed_mapping = []
-    
-    # Default mapping points
-    default_mapping = {
-        0: 50,    # At 0% zoom, use ptr_speed of 50%
-        100: 3    # At 100% zoom, use ptr_speed of 3%
-    }
-    
-    # Optional mapping points
-    optional_zoom_levels = [0, 10, 25, 50, 75, 100]
-    
-    # Check for custom mapping values in APC-R settings
-    for zoom_level in optional_zoom_levels:
-        setting_key = f"adaptive_speed_map_{zoom_level}"
-        
-        if setting_key in apcr and apcr[setting_key] is not None:
-            # Use the custom value from APC-R settings
-            speed_value = apcr[setting_key]
-            zoom_speed_mapping.append((zoom_level, speed_value))
-        elif zoom_level in default_mapping:
-            # Use the default value for this zoom level
-            zoom_speed_mapping.append((zoom_level, default_mapping[zoom_level]))
-    
-    # Sort the mapping by zoom level
-    zoom_speed_mapping.sort(key=lambda x: x[0])
+    # Build the mapping from APC-R specific settings or use defaults (cached per set of values)
+    zoom_levels, speeds = _build_zoom_speed_mapping(tuple(map(apcr.get, _ADAPTIVE_MAP_KEYS)))
     
     # Make sure we have at least two points for interpolation
-    if len(zoom_speed_mapping) < 2:
-        if is_debug_mode():
-            print(f"[DEBUG] Invalid adaptive speed mapping: {zoom_speed_mapping}. Using base speed.")
+    if len(zoom_levels) < 2:
+        if _debug_mode:
+            print(f"[DEBUG] Invalid adaptive speed mapping: {list(zip(zoom_levels, speeds))}. Using base speed.")
         return base_speed
     
-    # Find the appropriate speed adjustment based on the current zoom level
-    # Linear interpolation between defined points
-    for i in range(len(zoom_speed_mapping) - 1):
-        lower_zoom, lower_speed = zoom_speed_mapping[i]
-        upper_zoom, upper_speed = zoom_speed_mapping[i + 1]
+    # Find the segment containing the current zoom level (the first one whose upper
+    # bound is >= zoom_percentage) and interpolate linearly between its points.
+    # The mapping always has points at 0 and 100 (custom or default) and
+    # zoom_percentage is clamped to 0-100, so there is no out-of-range case.
+    i = max(bisect.bisect_left(zoom_levels, zoom_percentage), 1) - 1
+    lower_zoom = zoom_levels[i]
+    upper_zoom = zoom_levels[i + 1]
+    lower_speed = speeds[i]
+    upper_speed = speeds[i + 1]
+    
+    # Linear interpolation to get absolute speed value (not a scaling factor).
+    # Speeds and zoom levels are whole percentages, so one multiply and a floor
+    # division suffice (pure int math when zoom_percentage is an int as well)
+    adjusted_speed = int(lower_speed + (zoom_percentage - lower_zoom) * (upper_speed - lower_speed)
+                         // (upper_zoom - lower_zoom))
+    # Ensure it's in valid range (1-100)
+    adjusted_speed = 1 if adjusted_speed < 1 else 100 if adjusted_speed > 100 else adjusted_speed
+    
+    if _debug_mode:
+        print(f"[DEBUG] Adaptive Speed for {apcr.get('name', 'Unknown')}: zoom={zoom_percentage}%, " +
+              f"calculated_speed={adjusted_speed}% (between {lower_speed}% at {lower_zoom}% and {upper_speed}% at {upper_zoom}%)")
         
-        if lower_zoom <= zoom_percentage <= upper_zoom:
-            # Calculate percentage within this range
-            range_percentage = (zoom_percentage - lower_zoom) / (upper_zoom - lower_zoom)
-            # Linear interpolation to get absolute speed value (not a scaling factor)
-            adjusted_speed = int(lower_speed + range_percentage * (upper_speed - lower_speed))
-            # Ensure it's in valid range (1-100)
-            adjusted_speed = max(1, min(100, adjusted_speed))
-            
-            if is_debug_mode():
-                print(f"[DEBUG] Adaptive Speed for {apcr.get('name', 'Unknown')}: zoom={zoom_percentage}%, " +
-                      f"calculated_speed={adjusted_speed}% (between {lower_speed}% at {lower_zoom}% and {upper_speed}% at {upper_zoom}%)")
-                
-            return adjusted_speed
-    
-    # If we get here, the zoom_percentage is outside the range of our mapping
-    # Use the nearest endpoint
-    if zoom_percentage < zoom_speed_mapping[0][0]:
-        return zoom_speed_mapping[0][1]
-    else:
-        return zoom_speed_mapping[-1][1]
+    return adjusted_speed
 
 
 
@@ -2169,17 +2634,10 @@ def get_current_zoom_percentage(apcr):
     Returns:
         float: Zoom percentage (0-100) or None if not available
     """
-    pos_str = get_current_position(apcr)
-    if pos_str:
-        try:
-            parts = pos_str.strip().split(';')
-            if len(parts) >= 6:
-                zoom_value = float(parts[5])
-                # Convert from absolute zoom value (1-4095) to percentage (0-100)
-                zoom_percentage = (zoom_value - 1) * 100 / 4094
-                return zoom_percentage
-        except Exception as e:
-            logging.error(f"[ERROR] Failed to parse zoom value: {e}")
+    position = get_known_position(apcr.get('camid')) if apcr else None
+    if position is not None:
+        # Convert from absolute zoom value (1-4095) to percentage (0-100)
+        return (position['zoom'] - 1) * ZOOM_PERCENT_SCALE
     
     return None
 
@@ -16,6 +16,35 @@ _global_position_cache = {}
 # Zorg dat PRESETS_FILE een string is
 PRESETS_FILE = "presets.json"
 
+# Companion commando's met parameters (PRESET1C2, SPRESET1C2, PRES_D50)
+_PRESET_RECALL_RE = re.compile(r'PRESET(\d+)C(\d+)')
+_PRESET_SAVE_RE = re.compile(r'SPRESET(\d+)C(\d+)')
+_TRANSITION_SPEED_RE = re.compile(r'PRES_D(\d+)')
+
+# _command_in_progress wordt gewist zodra er geen commando meer loopt en het laatste
+# commando zo lang (s) geleden is afgerond
+COMMAND_SETTLE_TIME = 0.2
+
+# Ongewijzigde periodieke statuspakketten worden overgeslagen, maar minstens
+# eens per STATUS_RESEND_INTERVAL seconden toch verstuurd
+STATUS_RESEND_INTERVAL = 10.0
+
+# Statuspakket zonder actieve APC-R
+STATUS_PACKET_NO_APCR = "{CAM0;PTS0;ZS0;SS0;ADAPT0;}"
+
+def _parse_preset_slots(presets_data):
+    """Gesorteerde slotnummers uit preset keys ("camid.slot")."""
+    slots = set()
+    for key in presets_data:
+        if "." in key:
+            slot_num = key.split(".", 1)[1]
+            if slot_num.isdigit():
+                try:
+                    slots.add(int(slot_num))
+                except ValueError:
+                    pass
+    return sorted(slots)
+
 # ObservableSettings: een wrapper rond een dictionary
 class ObservableSettings(dict):
     def __init__(self, *args, on_change=None, **kwargs):
@@ -33,41 +62,34 @@ def trigger_status_update():
     """
     Trigger a status update for all active handlers.
     This function is called when settings change or when we need to force an update.
+    Het pakket wordt verstuurd door de status-thread van elke handler, niet door de aanroeper.
     """
     for handler in active_handlers:
-        try:
-            handler.send_status_packet()
-        except Exception as e:
-            logging.error(f"Error triggering status update for a handler: {e}")
+        handler._status_wake.set()
 
 def get_position_values(apcr, use_cache=True):
     """
-    Haalt de huidige positie op van de camera via controls.get_current_position.
+    Haalt de huidige positie op van de camera via controls.get_known_position.
     Als use_cache=True en er is geen verse data, gebruik dan de cache.
     """
-    pos_str = controls.get_current_position(apcr)
-    if pos_str:
-        parts = pos_str.strip().split(';')
-        if len(parts) >= 6:
-            try:
-                pan = float(parts[2])
-                tilt = float(parts[3])
-                roll = float(parts[4])
-                zoom_val = float(parts[5])
-                # Bereken zoompercentage
-                zoom_percentage = (zoom_val - 1) * 100 / 4094
-                position_data = {
-                    'pan': pan,
-                    'tilt': tilt,
-                    'roll': roll,
-                    'zoom': int(round(zoom_percentage))
-                }
-                # Update de globale cache direct hier
-                if '_global_position_cache' in globals():
-                    _global_position_cache[apcr.get('camid')] = position_data.copy()
-                return position_data
-            except Exception as e:
-                logging.error(f"Error computing position values: {e}")
+    position = controls.get_known_position(apcr.get('camid'))
+    if position is not None:
+        try:
+            # Bereken zoompercentage
+            zoom_percentage = (position['zoom'] - 1) * controls.ZOOM_PERCENT_SCALE
+            position_data = {
+                'pan': position['pan'],
+                'tilt': position['tilt'],
+                'roll': position['roll'],
+                'zoom': int(round(zoom_percentage))
+            }
+            # Update de globale cache direct hier. position_data wordt na het
+            # aanmaken nergens meer gewijzigd, dus een kopie is niet nodig.
+            if '_global_position_cache' in globals():
+                _global_position_cache[apcr.get('camid')] = position_data
+            return position_data
+        except Exception as e:
+            logging.error(f"Error computing position values: {e}")
     
     # Als we geen data hebben maar use_cache is True, gebruik de cache
     if use_cache and '_global_position_cache' in globals():
@@ -98,23 +120,41 @@ def notify_zoom_activity(is_active):
 class PresetsCache:
     """
     Cache for presets data to avoid frequent disk reads.
+    Per camid wordt (presets_data, slot_ints) bewaard; de slotnummers worden
+    alleen opnieuw geparsed wanneer het presets bestand wijzigt.
     """
     def __init__(self):
         self.cache = {}
         self.last_mtime = None
+        # mtime van het presets bestand hooguit eens per _stat_interval controleren
+        self._next_stat_check = 0.0
+        self._stat_interval = 0.5
+
+    def _get_entry(self, camid):
+        now = time.monotonic()
+        if now < self._next_stat_check and camid in self.cache:
+            return self.cache[camid]
 
-    def get_presets(self, camid):
         mtime = os.path.getmtime(PRESETS_FILE)
+        self._next_stat_check = now + self._stat_interval
         if self.last_mtime == mtime and camid in self.cache:
             return self.cache[camid]
         
         # Herlaad presets
         presets_data = presets.list_presets(camid)
-        self.cache[camid] = presets_data
+        entry = (presets_data, _parse_preset_slots(presets_data))
+        self.cache[camid] = entry
         self.last_mtime = mtime
-        return presets_data
+        return entry
+
+    def get_presets(self, camid):
+        return self._get_entry(camid)[0]
+
+    def get_slot_ints(self, camid):
+        return self._get_entry(camid)[1]
     
     def invalidate(self, camid=None):
+        self._next_stat_check = 0.0
         if camid is None:
             self.cache = {}
         elif camid in self.cache:
@@ -135,9 +175,41 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
     save_settings_func = None
     write_lock = threading.Lock()
 
+    # Vaste Companion-commando's -> naam van de handler methode
+    COMPANION_MAPPING = {
+        "PAN_L": "handle_pan_left",
+        "PAN_R": "handle_pan_right",
+        "PAN_IDLE": "handle_pan_idle",
+        "TILT_U": "handle_tilt_up",
+        "TILT_D": "handle_tilt_down",
+        "TILT_IDLE": "handle_tilt_idle",
+        "ROLL_L": "handle_roll_left",
+        "ROLL_R": "handle_roll_right",
+        "ROLL_IDLE": "handle_roll_idle",
+        "ZOOM+": "handle_zoom_in",
+        "ZOOM-": "handle_zoom_out",
+        "Z0": "handle_zoom_idle",
+        "ZSPEED+": "handle_zspeed_plus",
+        "ZSPEED-": "handle_zspeed_minus",
+        "SPEED+": "handle_speed_plus",
+        "SPEED-": "handle_speed_minus",
+        "ACTIVETRACK": "handle_active_track",
+        "GIMBALAUTOCALIB": "handle_gimbal_autocalib",
+        "MOTORAUTOCALIB": "handle_motor_autocalib",
+        "RECENTER": "handle_recenter",
+        "ZSSHORTCUT": "handle_zs_shortcut",
+        "PTSSHORTCUT": "handle_pts_shortcut",
+        "ADAPTIVESPEED": "handle_adaptive_speed",
+    }
+
     def setup(self):
         super().setup()
         self.stop_event = threading.Event()
+        # Wekt send_status_loop voor een directe statusupdate
+        self._status_wake = threading.Event()
+        # Laatst verstuurde periodieke statuspakket (voor deduplicatie)
+        self._last_status_packet = None
+        self._last_status_time = 0.0
         self.connected = False
         active_handlers.append(self)
         
@@ -156,7 +228,10 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
         
         # Voor command throttling
         self._command_in_progress = threading.Event()
-        self._last_command_time = 0
+        self._last_command_time = 0.0
+        # Aantal commando's dat nog loopt (synchroon of in een eigen thread)
+        self._commands_in_flight = 0
+        self._command_lock = threading.Lock()
         self._last_known_positions = {}
 
     def finish(self):
@@ -165,122 +240,146 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
         super().finish()
 
 
+    def _build_status_packet(self, active_apcr, *, include_walls, include_presets):
+        """
+        Bouwt het statuspakket voor Companion.
+        include_walls: virtual wall velden toevoegen en terugvallen op de laatst bekende positie.
+        include_presets: PRES_D/PRES_C velden per preset slot achter het pakket plakken.
+        """
+        if not active_apcr:
+            return STATUS_PACKET_NO_APCR
+
+        camid = active_apcr.get('camid', 0)
+        gs_get = self.settings["global_settings"].get
+        adaptive = gs_get("adaptive_speed", False)
+
+        # Determine if we should show effective speed or base speed
+        if adaptive:
+            # Get the effective PTR speed when adaptive speed is enabled
+            ptr_speed = self.get_effective_ptr_speed(active_apcr)
+        else:
+            # Use the base PTR speed from settings
+            ptr_speed = gs_get("ptr_speed", 100)
+        zoom_speed = gs_get("zoom_speed", 100)
+        preset_speed = gs_get("preset_transition_speed", 100)
+        adaptive_speed = "1" if adaptive else "0"
+
+        # Haal positiegegevens op
+        pos = get_position_values(active_apcr)
+        if include_walls:
+            if pos:
+                # Update onze cache met de nieuwe waarden (verse dict, alleen gelezen)
+                self._last_known_positions[camid] = pos
+            else:
+                # Gebruik de laatst bekende waarden als beschikbaar
+                pos = self._last_known_positions.get(camid)
+
+        if not pos:
+            status_packet = f"{{CAM{camid};PTS{ptr_speed};ZS{zoom_speed};PRES_D{preset_speed};ADAPT{adaptive_speed};}}"
+        elif include_walls:
+            # Build packet with camera-specific virtual wall settings
+            apcr_get = active_apcr.get
+            virtualwall = "1" if gs_get("virtualwall", False) else "0"
+            virtualwallpreset = "1" if gs_get("virtualwallpreset", False) else "0"
+            has_pan_wall = (apcr_get("virtualwallstart_pan") is not None and
+                            apcr_get("virtualwallend_pan") is not None)
+            has_tilt_wall = (apcr_get("virtualwallstart_tilt") is not None and
+                             apcr_get("virtualwallend_tilt") is not None)
+            status_packet = (
+                f"{{CAM{camid};PTS{ptr_speed};ZS{zoom_speed};PRES_D{preset_speed};"
+                f"aPAN{pos['pan']};aTILT{pos['tilt']};aROLL{pos['roll']};"
+                f"aZOOM{pos['zoom']};ADAPT{adaptive_speed};"
+                f"VWALL{virtualwall};VWALLPRES{virtualwallpreset};"
+                f"HASVWPAN{1 if has_pan_wall else 0};"
+                f"HASVWTILT{1 if has_tilt_wall else 0};}}"
+            )
+        else:
+            status_packet = (
+                f"{{CAM{camid};PTS{ptr_speed};ZS{zoom_speed};PRES_D{preset_speed};"
+                f"aPAN{pos['pan']};aTILT{pos['tilt']};aROLL{pos['roll']};"
+                f"aZOOM{pos['zoom']};ADAPT{adaptive_speed};}}"
+            )
+
+        if include_presets:
+            # Indien er ook presets zijn, kun je die (zoals voorheen) toevoegen aan het pakket
+            status_packet += "".join([f"PRES_D{slot};PRES_C{slot};" for slot in presets_cache.get_slot_ints(camid)])
+        return status_packet
+
     def send_status_packet(self):
         try:
             active_apcr = MiddlethingsHandler.get_active_apcr_func(MiddlethingsHandler.settings)
-            if active_apcr:
-                camid = active_apcr.get('camid', 0)
-                gs = self.settings["global_settings"]
-                
-                # Determine if we should show effective speed or base speed
-                if gs.get("adaptive_speed", False):
-                    # Get the effective PTR speed when adaptive speed is enabled
-                    ptr_speed = self.get_effective_ptr_speed(active_apcr)
-                else:
-                    # Use the base PTR speed from settings
-                    ptr_speed = gs.get("ptr_speed", 100)
-                    
-                zoom_speed = gs.get("zoom_speed", 100)
-                preset_speed = gs.get("preset_transition_speed", 100)
-                adaptive_speed = "1" if gs.get("adaptive_speed", False) else "0"
-                
-                # Get virtual wall status
-                virtualwall = "1" if gs.get("virtualwall", False) else "0"
-                virtualwallpreset = "1" if gs.get("virtualwallpreset", False) else "0"
-
-                # Haal positiegegevens op
-                pos = get_position_values(active_apcr)
-                if pos:
-                    # Update onze cache met de nieuwe waarden
-                    self._last_known_positions[camid] = pos.copy()
-                else:
-                    # Gebruik de laatst bekende waarden als beschikbaar
-                    pos = self._last_known_positions.get(camid)
-                if pos:
-                    # Build packet with camera-specific virtual wall settings
-                    has_pan_wall = (active_apcr.get("virtualwallstart_pan") is not None and 
-                                    active_apcr.get("virtualwallend_pan") is not None)
-                    has_tilt_wall = (active_apcr.get("virtualwallstart_tilt") is not None and 
-                                    active_apcr.get("virtualwallend_tilt") is not None)
-                    
-                    status_packet = (
-                        f"{{CAM{camid};PTS{ptr_speed};ZS{zoom_speed};PRES_D{preset_speed};"
-                        f"aPAN{pos['pan']};aTILT{pos['tilt']};aROLL{pos['roll']};"
-                        f"aZOOM{pos['zoom']};ADAPT{adaptive_speed};"
-                        f"VWALL{virtualwall};VWALLPRES{virtualwallpreset};"
-                        f"HASVWPAN{1 if has_pan_wall else 0};"
-                        f"HASVWTILT{1 if has_tilt_wall else 0};}}"
-                    )
-                    self.safe_write(status_packet)
-                else:
-                    status_packet = f"{{CAM{camid};PTS{ptr_speed};ZS{zoom_speed};PRES_D{preset_speed};ADAPT{adaptive_speed};}}"
-            else:
-                status_packet = "{CAM0;PTS0;ZS0;SS0;ADAPT0;}"
-            self.safe_write(status_packet)
+            self.safe_write(self._build_status_packet(active_apcr, include_walls=True, include_presets=False))
         except Exception as e:
             logging.error(f"Immediate status update error: {e}")
 
 
 
 
+    def _begin_command(self):
+        with self._command_lock:
+            self._commands_in_flight += 1
+            self._command_in_progress.set()
+
+    def _end_command(self):
+        with self._command_lock:
+            self._commands_in_flight -= 1
+            self._last_command_time = time.monotonic()
+
+    def _command_watchdog(self):
+        """
+        Wist _command_in_progress zodra er geen commando meer loopt en het laatste
+        COMMAND_SETTLE_TIME geleden is afgerond. Vervangt een threading.Timer per commando.
+        """
+        while not self.stop_event.is_set():
+            if not self._command_in_progress.wait(timeout=1.0):
+                continue
+            with self._command_lock:
+                if self._commands_in_flight > 0:
+                    remaining = COMMAND_SETTLE_TIME
+                else:
+                    remaining = self._last_command_time + COMMAND_SETTLE_TIME - time.monotonic()
+                    if remaining <= 0:
+                        self._command_in_progress.clear()
+                        continue
+            self.stop_event.wait(remaining)
+
     def send_status_loop(self):
+        """
+        Verstuurt elke seconde een statuspakket, of direct wanneer _status_wake
+        gezet wordt (trigger_status_update).
+        """
+        woken = False
         while not self.stop_event.is_set():
             try:
-                # Nieuwe code: check of er een commando actief is
-                if self._command_in_progress.is_set():
-                    time.sleep(0.1)
+                if woken:
+                    # Expliciete update: volledig pakket inclusief virtual wall velden
+                    self.send_status_packet()
+                    # Volgende periodieke pakket altijd versturen
+                    self._last_status_packet = None
+                elif self._command_in_progress.is_set():
+                    # Periodieke update uitstellen zolang er een commando actief is
+                    woken = self._status_wake.wait(timeout=0.1)
+                    self._status_wake.clear()
                     continue
-                    
-                active_apcr = None
-                if MiddlethingsHandler.get_active_apcr_func:
-                    active_apcr = MiddlethingsHandler.get_active_apcr_func(MiddlethingsHandler.settings)
-                if not active_apcr:
-                    status_packet = "{CAM0;PTS0;ZS0;SS0;ADAPT0;}"
                 else:
-                    camid = active_apcr.get('camid', 0)
-                    gs = self.settings["global_settings"]
-                    
-                    # Determine if we should show effective speed or base speed
-                    if gs.get("adaptive_speed", False):
-                        # Get the effective PTR speed when adaptive speed is enabled
-                        ptr_speed = self.get_effective_ptr_speed(active_apcr)
-                    else:
-                        # Use the base PTR speed from settings
-                        ptr_speed = gs.get("ptr_speed", 100)
-                        
-                    zoom_speed = gs.get("zoom_speed", 100)
-                    preset_speed = gs.get("preset_transition_speed", 100)
-                    adaptive_speed = "1" if gs.get("adaptive_speed", False) else "0"
-                    pos = get_position_values(active_apcr)
-                    if pos:
-                        status_packet = (
-                            f"{{CAM{camid};PTS{ptr_speed};ZS{zoom_speed};PRES_D{preset_speed};"
-                            f"aPAN{pos['pan']};aTILT{pos['tilt']};aROLL{pos['roll']};"
-                            f"aZOOM{pos['zoom']};ADAPT{adaptive_speed};}}"
-                        )
-                    else:
-                        status_packet = f"{{CAM{camid};PTS{ptr_speed};ZS{zoom_speed};PRES_D{preset_speed};ADAPT{adaptive_speed};}}"
-                    # Indien er ook presets zijn, kun je die (zoals voorheen) toevoegen aan het pakket
-                    presets_list = presets_cache.get_presets(camid)
-                    for key in presets_list:
-                        if "." in key:
-                            _, slot_num = key.split(".")
-                            if slot_num.isdigit():
-                                try:
-                                    slot = int(slot_num)
-                                    status_packet = status_packet.rstrip() + f"PRES_D{slot};PRES_C{slot};"
-                                except ValueError:
-                                    pass
-                    #status_packet = status_packet.rstrip("\n") + "\n"
-                    
-                self.safe_write(status_packet)
-                if MiddlethingsHandler.settings and MiddlethingsHandler.settings.get("debug_mode", False):
-                    print(f"[DEBUG] Sent status packet: {status_packet.strip()}")
+                    active_apcr = None
+                    if MiddlethingsHandler.get_active_apcr_func:
+                        active_apcr = MiddlethingsHandler.get_active_apcr_func(MiddlethingsHandler.settings)
+                    status_packet = self._build_status_packet(active_apcr, include_walls=False, include_presets=True)
+                    now = time.monotonic()
+                    if (status_packet != self._last_status_packet
+                            or now - self._last_status_time >= STATUS_RESEND_INTERVAL):
+                        self.safe_write(status_packet)
+                        self._last_status_packet = status_packet
+                        self._last_status_time = now
+                        if MiddlethingsHandler.settings and MiddlethingsHandler.settings.get("debug_mode", False):
+                            print(f"[DEBUG] Sent status packet: {status_packet.strip()}")
             except Exception as e:
                 logging.error(f"Error sending status packet: {e}")
                 self.connected = False
                 break
-            time.sleep(1)
+            woken = self._status_wake.wait(timeout=1.0)
+            self._status_wake.clear()
 
     def send_chunked_status(self, status_packet):
         """Send large status packets in chunks to prevent buffer overflow."""
@@ -333,6 +432,7 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
                 target=self.send_status_loop, daemon=True
             )
             self.status_thread.start()
+            threading.Thread(target=self._command_watchdog, daemon=True).start()
 
             # ---------- command‑loop ----------
             while self.connected:
@@ -353,6 +453,7 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
 
         finally:
             self.stop_event.set()
+            self._status_wake.set()
             self.connected = False
             print(f"Connection with {client_ip} broken")
 
@@ -378,87 +479,64 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
         """
         Process incoming commands from Companion using a mapping dictionary.
         """
-        self._command_in_progress.set()
-        self._last_command_time = time.time()
-        
+        self._begin_command()
+        try:
+            return self._dispatch_command(command)
+        finally:
+            self._end_command()
+
+    def _dispatch_command(self, command):
         cmd = command.strip().upper()
 
+        # Standard command mapping: vaste commando's eerst, één dict lookup
+        handler_name = self.COMPANION_MAPPING.get(cmd)
+        if handler_name is not None:
+            handler = getattr(self, handler_name)
+            def execute_command():
+                try:
+                    result = handler()
+                    self.safe_write(result)
+                except Exception as e:
+                    logging.error(f"Error executing command {cmd}: {e}")
+                finally:
+                    # Watchdog wist de vlag COMMAND_SETTLE_TIME na afronding
+                    self._end_command()
+            
+            # Start commando in aparte thread; telt als lopend tot execute_command klaar is
+            self._begin_command()
+            threading.Thread(target=execute_command, daemon=True).start()
+            return "COMMAND: ACK"  # Direct bevestigen
+
         # Handle camera selection commands (CAM1, CAM2, etc.)
         if cmd.startswith("CAM"):
             num_part = cmd[3:]
             if num_part.isdigit():
-                result = self.handle_camera_selection(num_part)
-            
-                threading.Timer(0.2, self._command_in_progress.clear).start()
-                return result
+                return self.handle_camera_selection(num_part)
                     
         # Handle preset recall commands (PRESET1C2, PRESET5C1, etc.)
-        preset_recall_match = re.match(r'PRESET(\d+)C(\d+)', cmd)
-        if preset_recall_match:
-            slot_id = preset_recall_match.group(1)
-            cam_id = preset_recall_match.group(2)
-            return self.handle_preset_recall(cam_id, slot_id)
+        if cmd.startswith("PRESET"):
+            preset_recall_match = _PRESET_RECALL_RE.match(cmd)
+            if preset_recall_match:
+                slot_id = preset_recall_match.group(1)
+                cam_id = preset_recall_match.group(2)
+                return self.handle_preset_recall(cam_id, slot_id)
             
         # Handle preset save commands (SPRESET1C2, SPRESET5C1, etc.)
-        preset_save_match = re.match(r'SPRESET(\d+)C(\d+)', cmd)
-        if preset_save_match:
-            slot_id = preset_save_match.group(1)
-            cam_id = preset_save_match.group(2)
-            return self.handle_preset_save(cam_id, slot_id)
+        elif cmd.startswith("SPRESET"):
+            preset_save_match = _PRESET_SAVE_RE.match(cmd)
+            if preset_save_match:
+                slot_id = preset_save_match.group(1)
+                cam_id = preset_save_match.group(2)
+                return self.handle_preset_save(cam_id, slot_id)
         
         #Handle transition speed commands (PRES_D50, etc.)
-        transition_speed_match = re.match(r'PRES_D(\d+)', cmd)
-        if transition_speed_match:
-            speed_value = transition_speed_match.group(1)
-            return self.handle_transition_speed(speed_value)        
-
-        
-        # Standard command mapping for other functions
-        companion_mapping = {
-            "PAN_L": self.handle_pan_left,
-            "PAN_R": self.handle_pan_right,
-            "PAN_IDLE": self.handle_pan_idle,
-            "TILT_U": self.handle_tilt_up,
-            "TILT_D": self.handle_tilt_down,
-            "TILT_IDLE": self.handle_tilt_idle,
-            "ROLL_L": self.handle_roll_left,
-            "ROLL_R": self.handle_roll_right,
-            "ROLL_IDLE": self.handle_roll_idle,
-            "ZOOM+": self.handle_zoom_in,
-            "ZOOM-": self.handle_zoom_out,
-            "Z0": self.handle_zoom_idle,
-            "ZSPEED+": self.handle_zspeed_plus,
-            "ZSPEED-": self.handle_zspeed_minus,
-            "SPEED+": self.handle_speed_plus,
-            "SPEED-": self.handle_speed_minus,
-            "ACTIVETRACK": self.handle_active_track,
-            "GIMBALAUTOCALIB": self.handle_gimbal_autocalib,
-            "MOTORAUTOCALIB": self.handle_motor_autocalib,
-            "RECENTER": self.handle_recenter,
-            "ZSSHORTCUT": self.handle_zs_shortcut,
-            "PTSSHORTCUT": self.handle_pts_shortcut,
-            "ADAPTIVESPEED":self.handle_adaptive_speed,
-        }
-        if cmd in companion_mapping:
-            # WIJZIG DIT DEEL:
-            # Van: return companion_mapping[cmd]()
-            # Naar:
-            def execute_command():
-                try:
-                    result = companion_mapping[cmd]()
-                    self.safe_write(result)
-                except Exception as e:
-                    logging.error(f"Error executing command {cmd}: {e}")
-                finally:
-                    threading.Timer(0.2, self._command_in_progress.clear).start()
-            
-            # Start commando in aparte thread
-            threading.Thread(target=execute_command, daemon=True).start()
-            return "COMMAND: ACK"  # Direct bevestigen
-        else:
-            # NIEUWE CODE: Reset ook hier
-            threading.Timer(0.2, self._command_in_progress.clear).start()
-            return "ERROR: UNKNOWN_COMMAND"
+        elif cmd.startswith("PRES_D"):
+            transition_speed_match = _TRANSITION_SPEED_RE.match(cmd)
+            if transition_speed_match:
+                speed_value = transition_speed_match.group(1)
+                return self.handle_transition_speed(speed_value)        
+
+        return "ERROR: UNKNOWN_COMMAND"
 
     def get_effective_ptr_speed(self, apcr):
         """
@@ -479,14 +557,7 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
         
         # If adaptive speed is enabled, calculate the effective speed
         try:
-            zoom_percentage = None
-            pos_str = controls.get_current_position(apcr)
-            if pos_str:
-                parts = pos_str.strip().split(';')
-                if len(parts) >= 6:
-                    zoom_value = float(parts[5])
-                    # Convert from absolute zoom value (1-4095) to percentage (0-100)
-                    zoom_percentage = (zoom_value - 1) * 100 / 4094
+            zoom_percentage = controls.get_current_zoom_percentage(apcr)
                     
             if zoom_percentage is not None:
                 # Calculate the adaptive speed that's being applied
@@ -558,7 +629,7 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
             
             # Recall the preset
             presets.recall_preset(cam_id_int, slot_id_int, target_apcr, self.settings)
-            threading.Timer(0.05, self.send_status_packet).start()  
+            self._status_wake.set()
             return f"PRESET {slot_id}C{cam_id} RECALLED"
         except Exception as e:
             logging.error(f"Error recalling preset: {e}")
@@ -591,24 +662,11 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
             if not target_apcr:
                 return f"ERROR: CAMERA {cam_id} NOT FOUND"
             
-            # Get the current position
-            pos_str = controls.get_current_position(target_apcr)
-            if not pos_str:
+            # Get the current position (as a dict, no FDB string round trip)
+            position = controls.get_current_position_dict(target_apcr)
+            if not position:
                 return "ERROR: CURRENT_POSITION_NOT_AVAILABLE"
             
-            # Parse position data
-            parts = pos_str.strip().split(';')
-            if len(parts) < 6:
-                return "ERROR: INVALID_POSITION_DATA"
-            
-            # Create position dictionary
-            position = {
-                'pan': float(parts[2]),
-                'tilt': float(parts[3]),
-                'roll': float(parts[4]),
-                'zoom': float(parts[5])
-            }
-            
             # Save the preset
             success = presets.save_preset(cam_id_int, slot_id_int, position)
             if success:
@@ -667,7 +725,7 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
             control_type='button',
             settings=self.settings
         )
-        threading.Timer(0.05, self.send_status_packet).start()
+        self._status_wake.set()
         return f"PAN_L: CamID {active_apcr['camid']} ({active_apcr['name']})"
 
     def handle_pan_right(self):
@@ -685,14 +743,14 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
             control_type='button',
             settings=self.settings
         )
-        threading.Timer(0.05, self.send_status_packet).start()
+        self._status_wake.set()
         return f"PAN_R: CamID {active_apcr['camid']} ({active_apcr['name']})"
 
     def handle_pan_idle(self):
         active_apcr = MiddlethingsHandler.get_active_apcr_func(MiddlethingsHandler.settings)
         if active_apcr:
             controls.stop_movement("pan", MiddlethingsHandler.send_apcr_command_func, active_apcr)
-            threading.Timer(0.05, self.send_status_packet).start()
+            self._status_wake.set()
             return f"PAN_IDLE: CamID {active_apcr['camid']} ({active_apcr['name']})"
         else:
             return "ERROR: NO_ACTIVE_CAMERA"
@@ -712,7 +770,7 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
             control_type='button',
             settings=self.settings
         )
-        threading.Timer(0.05, self.send_status_packet).start()
+        self._status_wake.set()
         return "COMMAND: ACK"
 
     def handle_tilt_down(self):
@@ -730,13 +788,13 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
             control_type='button',
             settings=self.settings
         )
-        threading.Timer(0.05, self.send_status_packet).start()
+        self._status_wake.set()
         return "COMMAND: ACK"
 
     def handle_tilt_idle(self):
         active_apcr = MiddlethingsHandler.get_active_apcr_func(MiddlethingsHandler.settings)
         if active_apcr:
-            threading.Timer(0.05, self.send_status_packet).start()
+            self._status_wake.set()
             controls.stop_movement("tilt", MiddlethingsHandler.send_apcr_command_func, active_apcr)
             return "COMMAND: ACK"
         else:
@@ -761,7 +819,7 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
             control_type='button',
             settings=self.settings
         )
-        threading.Timer(0.05, self.send_status_packet).start()
+        self._status_wake.set()
         return f"ROLL_L: CamID {active_apcr['camid']} ({active_apcr['name']})"
 
     def handle_roll_right(self):
@@ -782,7 +840,7 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
             control_type='button',
             settings=self.settings
         )
-        threading.Timer(0.05, self.send_status_packet).start()
+        self._status_wake.set()
         return f"ROLL_R: CamID {active_apcr['camid']} ({active_apcr['name']})"
 
     def handle_roll_idle(self):
@@ -792,7 +850,7 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
         active_apcr = MiddlethingsHandler.get_active_apcr_func(MiddlethingsHandler.settings)
         if active_apcr:
             controls.stop_movement("roll", MiddlethingsHandler.send_apcr_command_func, active_apcr)
-            threading.Timer(0.05, self.send_status_packet).start()
+            self._status_wake.set()
             return f"ROLL_IDLE: CamID {active_apcr['camid']} ({active_apcr['name']})"
         else:
             return "ERROR: NO_ACTIVE_CAMERA"
@@ -825,7 +883,7 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
         threading.Timer(1.0, restore_frequency).start()
         
         # Stuur status update na korte vertraging
-        threading.Timer(0.05, self.send_status_packet).start()
+        self._status_wake.set()
         
         return f"{as_name.upper()}_{direction.upper()}: CamID {active_apcr['camid']}"
         
@@ -853,7 +911,7 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
         
         # Start een korte timer voor een tweede update vlak na het begin van de zoom
         # Dit verbetert de responsiviteit van de Companion interface
-        threading.Timer(0.05, self.send_status_packet).start()
+        self._status_wake.set()
         return "COMMAND: ACK"
 
     def handle_zoom_out(self):
@@ -880,7 +938,7 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
         
         # Start een korte timer voor een tweede update vlak na het begin van de zoom
         # Dit verbetert de responsiviteit van de Companion interface
-        threading.Timer(0.05, self.send_status_packet).start()
+        self._status_wake.set()
         return "COMMAND: ACK"
 
     def handle_zoom_idle(self):
@@ -895,7 +953,7 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
             
             # Start een korte timer voor een tweede update vlak na het stoppen van de zoom
             # Dit verbetert de responsiviteit van de Companion interface
-            threading.Timer(0.05, self.send_status_packet).start()
+            self._status_wake.set()
             return "COMMAND: ACK"
         else:
             return "ERROR: NO_ACTIVE_CAMERA"
@@ -1005,6 +1063,7 @@ class MiddlethingsHandler(socketserver.StreamRequestHandler):
         
         # Toggle de active_track status in de apcr settings
         active_apcr['active_track'] = not active_apcr.get('active_track', False)
+        controls.refresh_active_track_camids(self.settings)
         
         # Print de nieuwe status naar de console
         if active_apcr['active_track']:
@@ -1,4 +1,5 @@
 # main.py
+import atexit
 import json
 import os
 import pygame
@@ -144,9 +145,8 @@ def initialize_apcr_if_new(apcr):
         
         # Send idle commands for pan, tilt, roll and zoom
         for axis in ['pan', 'tilt', 'roll', 'zoom']:
-            idle_packet = controls.get_idle_packet(axis, apcr['camid'])
-            if idle_packet:
-                data = bytes.fromhex(idle_packet)
+            data = controls.get_idle_packet_bytes(axis, apcr['camid'])
+            if data:
                 send_apcr_command(apcr, data)
                 if debug_mode:
                     print(f"[DEBUG] Sent idle packet for {axis} to {apcr['name']} (CamID {apcr['camid']})")
@@ -160,8 +160,7 @@ def check_for_new_apcrs(settings):
     global _last_init_started                 # ← toevoegen
     while True:
         try:
-            with controls.position_lock:
-                camids_with_position = set(controls.current_position.keys())
+            camids_with_position = set(controls.get_known_camids())
 
             for apcr in settings.get("apcrs", []):
                 if 'camid' not in apcr:
@@ -351,6 +350,12 @@ def load_settings():
         for apcr in s["apcrs"]:
             if "camid" not in apcr:
                 apcr["camid"] = None
+            elif apcr["camid"] is not None and not isinstance(apcr["camid"], int):
+                # camid eenmalig naar int, zodat de pakket-builders niet per aanroep hoeven te converteren
+                try:
+                    apcr["camid"] = int(apcr["camid"])
+                except (TypeError, ValueError):
+                    print(f"[WARNING] Invalid CamID {apcr['camid']!r} for APC-R {apcr.get('name')}")
             apcr["active_track"] = False
             
             # Zorg dat elke camera alle benodigde instellingen heeft, met default waarden
@@ -396,25 +401,14 @@ def wait_for_current_position(apcr, timeout=1):
     """
     Wacht tot er een huidige positie beschikbaar is (maximaal 'timeout' seconden)
     en retourneer de positie als een dictionary met keys 'pan', 'tilt', 'roll' en 'zoom'.
-    De functie gebruikt controls.get_current_position() om een FDB-string op te halen
-    en parsed deze vervolgens.
+    De functie gebruikt controls.get_current_position_dict(), dus zonder FDB-string
+    die eerst opgebouwd en daarna weer geparsed moet worden.
     """
     start = time.time()
     while time.time() - start < timeout:
-        pos_str = controls.get_current_position(apcr)
-        if pos_str:
-            try:
-                # Verwacht een string in het formaat: FDB;camid;pan;tilt;roll;zoom;
-                parts = pos_str.strip().split(';')
-                if len(parts) >= 6:
-                    return {
-                        'pan': float(parts[2]),
-                        'tilt': float(parts[3]),
-                        'roll': float(parts[4]),
-                        'zoom': float(parts[5])
-                    }
-            except Exception as e:
-                print("[ERROR] Failed to parse current position:", e)
+        position = controls.get_current_position_dict(apcr)
+        if position:
+            return position
         time.sleep(0.1)
     return None
 
@@ -456,16 +450,21 @@ def save_settings(settings):
         # Write the settings to the file with proper indentation
         with open(SETTINGS_FILE, 'w') as f:
             json.dump(settings_copy, f, indent=4)
+        
+        # Virtual wall grenzen kunnen gewijzigd zijn; gooi de voorberekende grenzen weg
+        controls.invalidate_wall_spec_cache()
+        controls.refresh_active_track_camids(settings)
+        # Nieuwe of gewijzigde APC-Rs: eerder genegeerde afzenders opnieuw proberen
+        listener = controls.get_udp_listener_instance()
+        if listener is not None:
+            listener.forget_unknown_senders()
             
         if debug_mode:
             print(f"[DEBUG] Settings saved to {SETTINGS_FILE}")
             
         # Trigger a direct status update for Companion when critical settings are changed
         try:
-            import interpreter
             interpreter.trigger_status_update()
-        except ImportError:
-            pass  # Ignore if interpreter module isn't loaded
         except Exception as e:
             print(f"[WARNING] Could not trigger status update: {e}")
             
@@ -494,6 +493,11 @@ def init_global_socket(settings):
         # Maak een nieuwe socket die alleen wordt gebruikt voor het verzenden
         new_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         new_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            # Grotere send buffer zodat bursts van bewegingspakketten niet blokkeren
+            new_sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, controls.SEND_BUFFER_SIZE)
+        except OSError as e:
+            print(f"[WARN] Could not set SO_SNDBUF: {e}")
         new_sock.settimeout(1)
 
         global_socket = new_sock
@@ -763,7 +767,7 @@ def add_apcr_connection(settings):
         # Restart the UDP listener
         if udp_listener:
             print("Restarting UDP listener...")
-            controls.init_udp_listener(settings)
+            controls.init_udp_listener(settings, save_settings)
             print("UDP listener restarted.")
 
 def discover_apcrs(settings):
@@ -1002,7 +1006,7 @@ def discover_apcrs(settings):
         # Restart the UDP listener
         if udp_listener:
             print("Restarting UDP listener...")
-            controls.init_udp_listener(settings)
+            controls.init_udp_listener(settings, save_settings)
             print("UDP listener restarted.")
 
 
@@ -1087,7 +1091,7 @@ def set_listener_ip(settings):
         if udp_listener:
             print("Restarting UDP listener with new settings...")
             udp_listener.stop()
-        if controls.init_udp_listener(settings):
+        if controls.init_udp_listener(settings, save_settings):
             print(f"UDP listener restarted on {ip or '0.0.0.0'}:{port}")
         else:
             print("[ERROR] Failed to restart UDP listener with new settings")
@@ -1608,19 +1612,11 @@ def event_loop(settings):
                     print("No active APC-R found.")
                     continue
                 
-                curr_pos_str = controls.get_current_position(active_apcr)
+                curr_pos = controls.get_current_position_dict(active_apcr)
                 success = False
                 
-                if curr_pos_str:
-                    # Parse the FDB string to a dictionary
+                if curr_pos:
                     try:
-                        parts = curr_pos_str.strip().split(';')
-                        curr_pos = {
-                            'pan': float(parts[2]),
-                            'tilt': float(parts[3]),
-                            'roll': float(parts[4]),
-                            'zoom': float(parts[5])
-                        }
                         if debug_mode:
                             print(f"[DEBUG] Position from get_current_position: {curr_pos}")
                         
@@ -1732,8 +1728,7 @@ def event_loop(settings):
                     if parts[1] == "on":
                         settings["global_settings"]["virtualwall"] = True
                         # Reset the virtual wall tracker so no old blockages remain
-                        controls.virtual_wall_tracker["pan"] = None
-                        controls.virtual_wall_tracker["tilt"] = None
+                        controls.reset_virtual_wall_tracker()
                         save_settings(settings)
                         print("Virtual wall for manual control ENABLED.")
                         print("Movement will be blocked if it enters the virtual wall boundaries.")
@@ -1761,8 +1756,7 @@ def event_loop(settings):
                     elif parts[1] == "off":
                         settings["global_settings"]["virtualwall"] = False
                         # Reset tracker
-                        controls.virtual_wall_tracker["pan"] = None
-                        controls.virtual_wall_tracker["tilt"] = None
+                        controls.reset_virtual_wall_tracker()
                         save_settings(settings)
                         print("Virtual wall for manual control DISABLED.")
                         print("Movement will NOT be blocked by virtual wall boundaries.")
@@ -2596,9 +2590,8 @@ def handle_absolute_setting(key, percentage, apcr, settings):
             
             # Stuur status update naar Companion clients
             try:
-                import interpreter
                 interpreter.trigger_status_update()
-            except (ImportError, AttributeError):
+            except AttributeError:
                 pass  # Ignore if not available
 
 def build_absolute_zoom_packet(camid, zoom_val):
@@ -3067,8 +3060,7 @@ def send_position_requests(settings):
 
 
 def _send_single_position_request(apcr):
-    camid_hex = f"{apcr['camid']:02x}"
-    data = bytes.fromhex("08" + camid_hex + "0400000e140000")
+    data = controls.get_position_request_packet(apcr['camid'])
     send_apcr_command(apcr, data)
     if debug_mode:
         print(f"[DEBUG] Position request sent to {apcr['name']} (CamID {apcr['camid']})")
@@ -3079,6 +3071,8 @@ def main():
     if settings is None:
         print("[ERROR] Failed to load settings. Exiting.")
         return
+    # Uitgestelde settings-saves (speed hotkeys) bij afsluiten alsnog wegschrijven
+    atexit.register(controls.flush_settings_save)
 
     # Initialize pygame for joystick handling
     init_pygame()
@@ -3089,7 +3083,7 @@ def main():
         return
     
     # Start the central UDP listener
-    if not controls.init_udp_listener(settings):
+    if not controls.init_udp_listener(settings, save_settings):
         print("[ERROR] Could not start UDP listener. Application will exit.")
         return
     
@@ -3113,7 +3107,6 @@ def main():
     tcp_thread = None
     if settings.get("enable_tcp_connection", False):
         try:
-            import interpreter
             tcp_server, tcp_thread = interpreter.init_tcp_server(
                 settings, 
                 send_apcr_command=send_apcr_command, 
@@ -3167,7 +3160,6 @@ def main():
     # Stop the TCP server when exiting
     if tcp_server:
         try:
-            import interpreter
             interpreter.stop_tcp_server(tcp_server, tcp_thread)
         except Exception as e:
             print(f"[ERROR] Error stopping TCP server: {e}")
@@ -3272,7 +3264,7 @@ def map_preset_to_button(settings, apcr):
                     if slot_key in presets_list:
                         print("Preset slot already exists.")
                     else:
-                        current_position = controls.get_current_position(apcr)
+                        current_position = controls.get_current_position_dict(apcr)
                         if current_position:
                             presets.save_preset(cam_id, slot_number, current_position)
                             print(f"Preset {slot_key} saved.")
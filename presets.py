@@ -37,7 +37,8 @@ def _send_command(apcr, data):
         ip = apcr['ip']
         port = 2390  # Standard port for APC-R
         _udp_socket.sendto(data, (ip, port))
-        logging.debug(f"Sent packet to {ip}:{port}: {data.hex()}")
+        if controls.is_debug_mode():
+            print(f"[DEBUG] Sent packet to {ip}:{port}: {data.hex()}")
         return True
     except Exception as e:
         logging.error(f"Failed to send command: {e}")
@@ -123,46 +124,6 @@ def normalized_to_native(angle):
         
     return native
 
-def inWall(angle, w1, w2):
-    """
-    Determine if an angle is inside the virtual wall in normalized 0-360 space.
-    
-    Args:
-        angle: Angle to check (native scale, degrees or tenths)
-        w1, w2: Wall boundaries (native scale, degrees or tenths)
-        
-    Returns:
-        bool: True if angle is inside wall
-    """
-    if w1 is None or w2 is None:
-        return False
-    
-    # Convert everything to the normalized 0-360 space
-    angle_norm = native_to_normalized(angle)
-    w1_norm = native_to_normalized(w1)
-    w2_norm = native_to_normalized(w2)
-    
-    # Get the wall boundaries in the correct order
-    if w1_norm <= w2_norm:
-        wall_start = w1_norm
-        wall_end = w2_norm
-    else:
-        wall_start = w2_norm
-        wall_end = w1_norm
-    
-    # Check if angle is inside wall
-    result = False
-    
-    # Handle wall that doesn't cross the 0/360 boundary
-    if wall_start <= wall_end:
-        result = wall_start <= angle_norm <= wall_end
-    # Handle wall that crosses the 0/360 boundary
-    else:
-        result = angle_norm >= wall_start or angle_norm <= wall_end
-    
-    logging.debug(f"inWall: native={angle} (norm={angle_norm}°), wall=[{wall_start}°, {wall_end}°] => {'IN WALL' if result else 'OUTSIDE WALL'}")
-    return result
-
 def sample_arc_normalized(start_norm, end_norm, direction, step=5.0):
     """
     Generate a list of points along the arc in normalized 0-360 space.
@@ -494,34 +455,33 @@ def shortest_rotation(a, b, apcr=None, settings=None):
 # Command Building Functions (from POC)
 # =============================================================================
 
+# De builders geven het pakket direct als bytes terug (geen hex-string die de caller
+# meteen weer met bytes.fromhex omzet). _send_command logt de verstuurde bytes al.
+_PTR_CMD_IDS = {'pan': 0x06, 'tilt': 0x07, 'roll': 0x08}
+_PTR_SCALES = {'pan': 13.48, 'tilt': 13.365, 'roll': 13.365}
+
 def build_pan_tilt_roll_packet(camid, axis, degrees, relative=True):
-    CMD_IDS = {'pan': '06', 'tilt': '07', 'roll': '08'}
-    SCALES  = {'pan': 13.48, 'tilt': 13.365, 'roll': 13.365}
-    if axis not in CMD_IDS:
+    if axis not in _PTR_CMD_IDS:
         logging.error(f"Unknown axis {axis}")
         return None
 
-    sval = int(round(degrees * SCALES[axis]))
-    sval = clamp(sval, -32768, 32767)
-    lehex = sval.to_bytes(2, byteorder='little', signed=True).hex()
-    ctrl = '80' if relative else '81'
-    packet = f"0A{camid:02X}06{'0'*5}E{CMD_IDS[axis]}{ctrl}00{lehex}"
-    logging.debug(f"build_pan_tilt_roll_packet: {axis}={degrees}°, Packet={packet}")
+    sval = int(round(degrees * _PTR_SCALES[axis]))
+    sval = -32768 if sval < -32768 else 32767 if sval > 32767 else sval
+    ctrl = 0x80 if relative else 0x81
+    packet = bytes((0x0A, camid, 0x06, 0x00, 0x00, 0x0E, _PTR_CMD_IDS[axis], ctrl, 0x00)) + to_little_endian_signed(sval)
+    logging.debug("build_pan_tilt_roll_packet: %s=%s°", axis, degrees)
     return packet
 
 def build_relative_zoom_packet(camid, speed_int):
-    speed_int = clamp(speed_int, -32768, 32767)
-    lohi = to_little_endian_signed(speed_int).hex()
-    packet = f"0A{camid:02X}06{'0'*6}098000{lohi}"
-    logging.debug(f"build_relative_zoom_packet: speed_int={speed_int}, Packet={packet}")
+    speed_int = -32768 if speed_int < -32768 else 32767 if speed_int > 32767 else speed_int
+    packet = bytes((0x0A, camid, 0x06, 0x00, 0x00, 0x00, 0x09, 0x80, 0x00)) + to_little_endian_signed(speed_int)
+    logging.debug("build_relative_zoom_packet: speed_int=%s", speed_int)
     return packet
 
 def build_absolute_zoom_packet(camid, zoom_val):
     z = clamp(int(round(zoom_val)), 0, 4095)
-    lo = z & 0xFF
-    hi = (z >> 8) & 0xFF
-    packet = f"0A{camid:02X}0600000E0A80" + f"00{lo:02X}{hi:02X}"
-    logging.debug(f"build_absolute_zoom_packet: zoom_val={zoom_val}, Packet={packet}")
+    packet = bytes((0x0A, camid, 0x06, 0x00, 0x00, 0x0E, 0x0A, 0x80, 0x00, z & 0xFF, (z >> 8) & 0xFF))
+    logging.debug("build_absolute_zoom_packet: zoom_val=%s", zoom_val)
     return packet
 
 # =============================================================================
@@ -562,7 +522,7 @@ def handle_feedback_pan(pan_degrees):
     """
     global _localPan
     _localPan = pan_degrees
-    logging.debug(f"handle_feedback_pan: New localPan set to {_localPan:.1f}°")
+    logging.debug("handle_feedback_pan: New localPan set to %.1f°", pan_degrees)
 
 def save_preset(camid, slot_num, position, mapped_button=None, device_id=None):
     """
@@ -798,7 +758,8 @@ def inWall(angle, w1, w2):
     w1_norm = native_to_normalized(w1)
     w2_norm = native_to_normalized(w2)
     
-    # Get the wall boundaries in the correct order
+    # Get the wall boundaries in the correct order (after sorting, the wall
+    # never crosses the 0/360 boundary, so one range check suffices)
     if w1_norm <= w2_norm:
         wall_start = w1_norm
         wall_end = w2_norm
@@ -806,17 +767,10 @@ def inWall(angle, w1, w2):
         wall_start = w2_norm
         wall_end = w1_norm
     
-    # Check if angle is inside wall
-    result = False
+    result = wall_start <= angle_norm <= wall_end
     
-    # Handle wall that doesn't cross the 0/360 boundary
-    if wall_start <= wall_end:
-        result = wall_start <= angle_norm <= wall_end
-    # Handle wall that crosses the 0/360 boundary
-    else:
-        result = angle_norm >= wall_start or angle_norm <= wall_end
-    
-    logging.debug(f"inWall: native={angle} (norm={angle_norm}°), wall=[{wall_start}°, {wall_end}°] => {'IN WALL' if result else 'OUTSIDE WALL'}")
+    logging.debug("inWall: native=%s (norm=%s°), wall=[%s°, %s°] => %s",
+                  angle, angle_norm, wall_start, wall_end, 'IN WALL' if result else 'OUTSIDE WALL')
     return result
 
 
@@ -854,9 +808,8 @@ def recall_preset(camid, slot_num, apcr, settings):
     try:
         # Reset virtual wall tracker at the start of each recall
         # This ensures each movement starts with a clean slate
-        if hasattr(controls, 'virtual_wall_tracker'):
-            controls.virtual_wall_tracker["pan"] = None
-            controls.virtual_wall_tracker["tilt"] = None
+        if hasattr(controls, 'reset_virtual_wall_tracker'):
+            controls.reset_virtual_wall_tracker()
             logging.debug("Reset virtual wall tracker at start of recall")
         
         # Now we're ready for initialization, set the active flag to True
@@ -916,15 +869,13 @@ def recall_preset(camid, slot_num, apcr, settings):
         
         # Send a few position requests directly to be up-to-date
         for _ in range(3):
-            camid_hex = f"{apcr['camid']:02x}"
-            data_hex = "08" + camid_hex + "0400000e140000"
-            data = bytes.fromhex(data_hex)
+            data = controls.get_position_request_packet(apcr['camid'])
             _send_command(apcr, data)  # Use _send_command for internal communication
             time.sleep(0.04)  # Small wait time between requests
         
         # Get current position
-        cpos_str = controls.get_current_position(apcr)
-        if not cpos_str:
+        cpos = controls.get_known_position(apcr.get('camid'))
+        if cpos is None:
             logging.error(f"No current position available for {apcr['name']} (CamID {camid}) => can't recall.")
             print(f"[ERROR] No current position available for {apcr['name']} => can't recall preset.")
             with _recall_lock:
@@ -932,20 +883,11 @@ def recall_preset(camid, slot_num, apcr, settings):
             settings["global_settings"]["position_request_frequency"] = original_freq
             return
         
-        parts = cpos_str.strip().split(';')
-        if len(parts) < 6:
-            logging.error(f"Invalid position data: {cpos_str}")
-            print(f"[ERROR] Invalid position data received: {cpos_str}")
-            with _recall_lock:
-                _recall_active = False
-            settings["global_settings"]["position_request_frequency"] = original_freq
-            return
-        
         # Update localPan from tracked value (which gets updated by handle_feedback_pan)
         cPan = _localPan
-        cTilt = float(parts[3]) / 10.0  # Convert to degrees if in tenths
-        cRoll = float(parts[4]) / 10.0  # Convert to degrees if in tenths
-        cZoom = float(parts[5])
+        cTilt = cpos['tilt'] / 10.0  # Convert to degrees if in tenths
+        cRoll = cpos['roll'] / 10.0  # Convert to degrees if in tenths
+        cZoom = cpos['zoom']
         
         # Current position logging (show both raw and normalized angles)
         cPan_norm = norm360(cPan)
@@ -1118,9 +1060,8 @@ def do_move_segment(apcr, cPan, cTilt, cRoll, cZoom,
         if doneP and doneT and doneR and doneZ:
             logging.debug("Segment done => zoom idle + absolute jump if needed.")
             # Send idle command for zoom
-            idle_packet_hex = controls.get_idle_packet('zoom', apcr['camid'])
-            if idle_packet_hex:
-                data = bytes.fromhex(idle_packet_hex)
+            data = controls.get_idle_packet_bytes('zoom', apcr['camid'])
+            if data:
                 _send_command(apcr, data)
             
             time.sleep(0.2)
@@ -1128,7 +1069,7 @@ def do_move_segment(apcr, cPan, cTilt, cRoll, cZoom,
             # Send absolute zoom if needed
             if abs(dz) > 0.1:
                 absZ = build_absolute_zoom_packet(apcr['camid'], tgtZoom)
-                _send_command(apcr, bytes.fromhex(absZ))
+                _send_command(apcr, absZ)
                 time.sleep(0.3)
             
             break
@@ -1201,15 +1142,14 @@ def do_move_segment(apcr, cPan, cTilt, cRoll, cZoom,
                 logging.info("All axes stable for too long, forcing absolute zoom.")
                 if abs(dz) <= ABS_ZOOM_THRESHOLD:
                     # Send zoom idle
-                    idle_packet_hex = controls.get_idle_packet('zoom', apcr['camid'])
-                    if idle_packet_hex:
-                        data = bytes.fromhex(idle_packet_hex)
+                    data = controls.get_idle_packet_bytes('zoom', apcr['camid'])
+                    if data:
                         _send_command(apcr, data)
                     time.sleep(0.3)
                     
                     # Send absolute zoom
                     absZ = build_absolute_zoom_packet(apcr['camid'], tgtZoom)
-                    _send_command(apcr, bytes.fromhex(absZ))
+                    _send_command(apcr, absZ)
                     time.sleep(0.3)
                 break
         else:
@@ -1219,15 +1159,14 @@ def do_move_segment(apcr, cPan, cTilt, cRoll, cZoom,
         if (dz > 0 and mv_z < 0) or (dz < 0 and mv_z > 0):
             logging.warning("Zoom overshoot detected! Forcing absolute zoom correction.")
             # Send zoom idle
-            idle_packet_hex = controls.get_idle_packet('zoom', apcr['camid'])
-            if idle_packet_hex:
-                data = bytes.fromhex(idle_packet_hex)
+            data = controls.get_idle_packet_bytes('zoom', apcr['camid'])
+            if data:
                 _send_command(apcr, data)
             time.sleep(0.3)
             
             # Send absolute zoom
             absZ = build_absolute_zoom_packet(apcr['camid'], tgtZoom)
-            _send_command(apcr, bytes.fromhex(absZ))
+            _send_command(apcr, absZ)
             time.sleep(0.3)
             break
         
@@ -1235,34 +1174,33 @@ def do_move_segment(apcr, cPan, cTilt, cRoll, cZoom,
         if abs(mv_p) > 0.001:
             phex = build_pan_tilt_roll_packet(apcr['camid'], 'pan', mv_p, True)
             if phex:
-                _send_command(apcr, bytes.fromhex(phex))
-                logging.debug(f"Sent Pan Command: {phex}")
+                _send_command(apcr, phex)
+                logging.debug("Sent Pan Command")
             time.sleep(0.02)
         
         if abs(mv_t) > 0.001:
             thex = build_pan_tilt_roll_packet(apcr['camid'], 'tilt', mv_t, True)
             if thex:
-                _send_command(apcr, bytes.fromhex(thex))
-                logging.debug(f"Sent Tilt Command: {thex}")
+                _send_command(apcr, thex)
+                logging.debug("Sent Tilt Command")
             time.sleep(0.02)
         
         if abs(mv_r) > 0.001:
             rhex = build_pan_tilt_roll_packet(apcr['camid'], 'roll', mv_r, True)
             if rhex:
-                _send_command(apcr, bytes.fromhex(rhex))
-                logging.debug(f"Sent Roll Command: {rhex}")
+                _send_command(apcr, rhex)
+                logging.debug("Sent Roll Command")
             time.sleep(0.02)
         
         if abs(mv_z) > 0.001:
             zpack = build_relative_zoom_packet(apcr['camid'], int(zspeed))
-            _send_command(apcr, bytes.fromhex(zpack))
-            logging.debug(f"Sent Zoom Command: {zpack}")
+            _send_command(apcr, zpack)
+            logging.debug("Sent Zoom Command")
             time.sleep(0.02)
         else:
             # Send zoom idle if not sending a zoom command
-            idle_packet_hex = controls.get_idle_packet('zoom', apcr['camid'])
-            if idle_packet_hex:
-                data = bytes.fromhex(idle_packet_hex)
+            data = controls.get_idle_packet_bytes('zoom', apcr['camid'])
+            if data:
                 _send_command(apcr, data)
                 logging.debug(f"Sent Zoom Idle Command")
             time.sleep(0.02)
@@ -1275,37 +1213,30 @@ def do_move_segment(apcr, cPan, cTilt, cRoll, cZoom,
         if time.time() - last_movement_time > TIMEOUT_THRESHOLD:
             logging.warning("No movement detected for too long, stopping all movement.")
             for ax in ['pan', 'tilt', 'roll', 'zoom']:
-                idle_packet_hex = controls.get_idle_packet(ax, apcr['camid'])
-                if idle_packet_hex:
-                    data = bytes.fromhex(idle_packet_hex)
+                data = controls.get_idle_packet_bytes(ax, apcr['camid'])
+                if data:
                     _send_command(apcr, data)
                     logging.debug(f"Sent Idle Command for {ax}")
             break
         
         # Get updated position
-        p2_str = controls.get_current_position(apcr)
-        if not p2_str:
+        p2 = controls.get_known_position(apcr.get('camid'))
+        if p2 is None:
             logging.error("No new position data received => ending do_move_segment.")
             break
         
-        # Parse updated position
-        parts = p2_str.strip().split(';')
-        if len(parts) >= 6:
-            # localPan is updated by handle_feedback_pan, but we get other values here
-            cTilt = float(parts[3]) / 10.0
-            cRoll = float(parts[4]) / 10.0
-            cZoom = float(parts[5])
-            
-            logging.debug(f"Updated position: Pan={_localPan:.1f}°, Tilt={cTilt:.1f}°, Roll={cRoll:.1f}°, Zoom={cZoom}")
-        else:
-            logging.warning(f"Invalid position data: {p2_str}")
+        # localPan is updated by handle_feedback_pan, but we get other values here
+        cTilt = p2['tilt'] / 10.0
+        cRoll = p2['roll'] / 10.0
+        cZoom = p2['zoom']
+        
+        logging.debug("Updated position: Pan=%.1f°, Tilt=%.1f°, Roll=%.1f°, Zoom=%s", _localPan, cTilt, cRoll, cZoom)
     
     # Final idle commands to ensure movement stops
     for _ in range(3):
         for ax in ['pan', 'tilt', 'roll', 'zoom']:
-            idle_packet_hex = controls.get_idle_packet(ax, apcr['camid'])
-            if idle_packet_hex:
-                data = bytes.fromhex(idle_packet_hex)
+            data = controls.get_idle_packet_bytes(ax, apcr['camid'])
+            if data:
                 _send_command(apcr, data)
                 logging.debug(f"Sent final Idle Command for {ax}")
         time.sleep(0.05)